@@ -0,0 +1,90 @@
+"""
+Mide el tiempo de arranque de simnav: la importación de simnav.simulacion y la latencia de
+la primera simulación de una torre (preparación del paquete termodinamico incluida). Cada
+medición se realiza en un proceso nuevo para no reutilizar modulos ya importados.
+
+Uso:
+
+    python benchmarks/arranque.py [--repeticiones 5] [--sin-presupuesto]
+
+Termina con codigo 1 si la mediana de alguna medición supera su presupuesto o si la
+importación carga alguno de los modulos que deben cargarse bajo demanda.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Presupuesto de tiempo de cada medición (s)
+PRESUPUESTO = {
+    'importacion': 0.5,
+    'primera_simulacion': 1.0,
+}
+
+# Modulos costosos que no deben importarse al importar simnav.simulacion
+MODULOS_DIFERIDOS = ('sqlalchemy', 'scipy.integrate', 'yaml', 'PyQt5')
+
+PROGRAMA = f'''
+import json, sys, time
+inicio = time.perf_counter()
+import simnav.simulacion
+importacion = time.perf_counter() - inicio
+cargados = [modulo for modulo in {MODULOS_DIFERIDOS!r} if modulo in sys.modules]
+
+from simnav.termodinamica import GestorPaquetes
+from simnav.corrientes import CorrienteMateria
+from simnav.opus import DestilacionSemiRigurosa
+
+inicio = time.perf_counter()
+compuestos = ['Benzene', 'Toluene']
+paquete = GestorPaquetes(compuestos)
+paquete.preparar()
+alimentacion = CorrienteMateria('alimentacion', compuestos, paquete, flujo=100,
+                                temperatura=350.15, composicion=[0.5, 0.5], presion=101325)
+torre = DestilacionSemiRigurosa(numero_platos=10, destilado=50, reflujo=1.5,
+                                alimentaciones=[[5, alimentacion]],
+                                paquete_termodinamico=paquete)
+torre.simular()
+primera_simulacion = time.perf_counter() - inicio
+print(json.dumps({{'importacion': importacion, 'primera_simulacion': primera_simulacion,
+                  'cargados': cargados}}))
+'''
+
+
+def medir():
+    """Ejecuta una medición en un proceso nuevo"""
+    salida = subprocess.run([sys.executable, '-c', PROGRAMA], check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(salida)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--sin-presupuesto', action='store_true',
+                        help='solo reporta los tiempos sin verificar el presupuesto')
+    argumentos = parser.parse_args()
+
+    mediciones = [medir() for _ in range(argumentos.repeticiones)]
+    exito = True
+    for nombre, presupuesto in PRESUPUESTO.items():
+        tiempos = [medicion[nombre] for medicion in mediciones]
+        mediana = statistics.median(tiempos)
+        estado = 'ok' if mediana <= presupuesto else 'EXCEDIDO'
+        print(f'{nombre:20s} mediana {mediana * 1000:8.1f} ms  minimo {min(tiempos) * 1000:8.1f} '
+              f'ms  presupuesto {presupuesto * 1000:6.0f} ms  {estado}')
+        exito &= mediana <= presupuesto
+
+    cargados = sorted({modulo for medicion in mediciones for modulo in medicion['cargados']})
+    if cargados:
+        print(f'Modulos importados antes de ser necesarios: {", ".join(cargados)}')
+        exito = False
+
+    if not (exito or argumentos.sin_presupuesto):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
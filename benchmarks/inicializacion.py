@@ -0,0 +1,92 @@
+"""
+Compara las iteraciones del metodo del punto de burbuja partiendo del perfil simple
+(flujo molar constante y temperaturas lineales fijas) y del perfil estimado de
+simnav.opus.inicializacion en un conjunto de mezclas.
+
+Uso:
+
+    python benchmarks/inicializacion.py [--metodo punto_burbuja]
+
+Termina con codigo 1 si el perfil estimado no converge en algun caso que converge con el
+perfil simple o si no reduce el total de iteraciones de los casos que convergen con ambos.
+"""
+
+import argparse
+import sys
+import time
+
+from simnav.corrientes import CorrienteMateria
+from simnav.opus import DestilacionSemiRigurosa
+from simnav.termodinamica import GestorPaquetes
+
+# compuestos, composición, temperatura de la alimentación (K), platos, plato de
+# alimentación, destilado (kmol/h), reflujo. La alimentación es de 100 kmol/h a 1 atm
+CASOS = [
+    (['Benzene', 'Toluene'], [0.5, 0.5], 350.15, 10, 5, 50, 1.5),
+    (['Benzene', 'Toluene'], [0.5, 0.5], 300, 30, 15, 50, 5),
+    (['Benzene', 'Toluene', 'Heptane'], [0.3, 0.4, 0.3], 360, 15, 7, 30, 2),
+    (['Benzene', 'Toluene', 'Heptane'], [0.3, 0.4, 0.3], 360, 20, 10, 60, 3),
+    (['Benzene', 'Toluene', 'Heptane'], [0.3, 0.4, 0.3], 360, 8, 3, 40, 1),
+    (['Pentane', 'Hexane', 'Decane'], [0.3, 0.3, 0.4], 300, 12, 6, 30, 2),
+    (['Hexane', 'Octane', 'Dodecane'], [0.3, 0.3, 0.4], 300, 12, 6, 30, 2),
+    (['Hexane', 'Heptane', 'Octane', 'Nonane'], [0.25, 0.25, 0.25, 0.25], 330, 16, 8, 45, 2),
+]
+
+INICIALIZACIONES = ('simple', 'estimado')
+
+
+def simular(caso, metodo, inicializacion):
+    """Resuelve un caso y retorna (iteraciones exteriores, interiores, tiempo) o None si
+    no converge"""
+    compuestos, composicion, temperatura, platos, plato, destilado, reflujo = caso
+    paquete = GestorPaquetes(compuestos)
+    paquete.preparar()
+    alimentacion = CorrienteMateria('alimentacion', compuestos, paquete, flujo=100,
+                                    temperatura=temperatura, composicion=composicion,
+                                    presion=101325)
+    torre = DestilacionSemiRigurosa(numero_platos=platos, destilado=destilado,
+                                    reflujo=reflujo, alimentaciones=[[plato, alimentacion]],
+                                    paquete_termodinamico=paquete, metodo=metodo)
+    torre.inicializacion = inicializacion
+    inicio = time.perf_counter()
+    try:
+        resultado = torre.simular()
+    except (RuntimeError, FloatingPointError):
+        return None
+    return (resultado['contador_ciclo_vapor'], resultado['contador_ciclo_temperatura'],
+            time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--metodo', default='punto_burbuja')
+    argumentos = parser.parse_args()
+
+    print(f'{"caso":42s}' + ''.join(f'{nombre:>26s}' for nombre in INICIALIZACIONES))
+    totales = dict.fromkeys(INICIALIZACIONES, 0)
+    exito = True
+    for caso in CASOS:
+        mediciones = {inicializacion: simular(caso, argumentos.metodo, inicializacion)
+                      for inicializacion in INICIALIZACIONES}
+        columnas = ''.join(
+            f'{"no converge":>26s}' if medicion is None else
+            f'{medicion[0]:>6d} {medicion[1]:>6d} {medicion[2] * 1000:>8.1f} ms  '
+            for medicion in mediciones.values())
+        nombre = f'{"/".join(caso[0])} N={caso[3]}'
+        print(f'{nombre:42s}{columnas}')
+
+        simple, estimado = mediciones['simple'], mediciones['estimado']
+        if simple is not None and estimado is None:
+            exito = False
+        if simple is not None and estimado is not None:
+            for inicializacion, medicion in mediciones.items():
+                totales[inicializacion] += medicion[0] + medicion[1]
+
+    print('Iteraciones totales (exteriores + interiores) de los casos que convergen con '
+          'ambos: ' + ', '.join(f'{nombre} {total}' for nombre, total in totales.items()))
+    if not exito or totales['estimado'] >= totales['simple']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
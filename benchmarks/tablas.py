@@ -0,0 +1,58 @@
+"""
+Compara el tiempo de la temperatura de saturacion Tsat(P) del modo tabulado (series de
+Chebyshev) con el del modo analitico (Newton sobre la ecuación de antoine) y reporta el
+grado y el error maximo de la serie de cada compuesto.
+
+Uso:
+
+    python benchmarks/tablas.py [--puntos 10] [--repeticiones 200]
+
+Termina con codigo 1 si el modo tabulado no es mas rapido que el analitico para Tsat(P). El
+modo tabulado solo cambia Tsat(P), las torres y los flash se calculan igual en ambos modos.
+"""
+
+import argparse
+import sys
+import timeit
+
+import numpy as np
+
+from simnav.termodinamica.paquetes import PaqueteIdeal
+
+COMPUESTOS = ['Benzene', 'Toluene', 'Heptane', 'Propane', 'Hexane', 'Octane', 'Methanol',
+              'Ethanol']
+
+
+def medir(funcion, repeticiones):
+    """Tiempo minimo de una llamada en µs"""
+    return min(timeit.repeat(funcion, number=repeticiones, repeat=5)) / repeticiones * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--puntos', type=int, default=10,
+                        help='numero de temperaturas o presiones por llamada')
+    parser.add_argument('--repeticiones', type=int, default=200)
+    argumentos = parser.parse_args()
+
+    analitico = PaqueteIdeal(list(COMPUESTOS))
+    tabulado = PaqueteIdeal(list(COMPUESTOS), modo_calculo='tabulado')
+    analitico.preparar()
+    tabulado.preparar()
+
+    presiones = np.linspace(5e4, 3e5, argumentos.puntos)
+    tiempos = [medir(lambda: paquete.temperatura_saturacion(presiones), argumentos.repeticiones)
+               for paquete in (analitico, tabulado)]
+    tabla = tabulado.tablas().tabla_temperatura_saturacion
+    print(f'{len(COMPUESTOS)} compuestos, {argumentos.puntos} puntos por llamada')
+    print(f'{"temperatura_saturacion":24s} analitico {tiempos[0]:8.1f} µs  tabulado '
+          f'{tiempos[1]:8.1f} µs  aceleración {tiempos[0] / tiempos[1]:5.2f}x')
+    print(f'{"":24s} grados {tabla.grado.tolist()}  error maximo '
+          f'{np.max(tabla.error_maximo):.1e}')
+
+    if tiempos[1] >= tiempos[0]:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+"""
+Barridos parametricos de la torre de destilación. Una malla de parametros (reflujo,
+destilado, numero de platos, plato de alimentación, presion, ...) se expande en todas sus
+combinaciones y cada caso se resuelve en un proceso de un ProcessPoolExecutor. Los
+resultados se reunen en arrays por columna en el orden de los casos; los casos que no
+convergen se registran con su error y no detienen el barrido.
+
+El archivo de un barrido es un archivo de simulación (ver simnav/ejemplo.yaml) con una
+sección adicional:
+
+    barrido:
+        reflujo: [1.2, 1.5, 2.0]
+        destilado: {inicio: 40, fin: 60, pasos: 5}
+        plato_alimentacion: [4, 5, 6]
+
+Uso:
+
+    python -m simnav.barrido caso.yaml [--salida barrido.csv] [--procesos 4]
+        [--tamano-lote 8] [--conjunto]
+"""
+
+import argparse
+import csv
+import itertools
+import logging
+import os
+
+import numpy as np
+
+# Parametros de la malla que no son atributos de DestilacionSemiRigurosa
+PARAMETROS_ESPECIALES = ('plato_alimentacion',)
+
+# Parametros de la torre que deben ser enteros
+PARAMETROS_ENTEROS = ('numero_platos', 'plato_alimentacion')
+
+# Plantilla del caso base de cada proceso (ver _iniciar_proceso)
+_plantilla = None
+
+logger = logging.getLogger(__name__)
+
+
+def valores_parametro(valores):
+    """
+    Valores de un parametro de la malla: una lista, un escalar o un diccionario
+    {inicio, fin, pasos} que se expande con np.linspace
+    """
+    if isinstance(valores, dict):
+        return list(np.linspace(valores['inicio'], valores['fin'], valores['pasos']))
+    if np.isscalar(valores):
+        return [valores]
+    return list(valores)
+
+
+def expandir_malla(malla):
+    """
+    Todas las combinaciones de los parametros de la malla. El orden es deterministico: el
+    primer parametro es el que cambia mas lento
+    :param malla: diccionario {parametro: valores} (ver valores_parametro)
+    :return: lista de diccionarios {parametro: valor}
+    """
+    nombres = list(malla)
+    return [dict(zip(nombres, combinacion)) for combinacion in
+            itertools.product(*(valores_parametro(malla[nombre]) for nombre in nombres))]
+
+
+def cargar_barrido(direccion_archivo):
+    """
+    Carga un archivo de barrido
+    :return: una tupla (simulacion, malla)
+    """
+    import yaml
+    from simnav.simulacion import Simulacion
+    with open(direccion_archivo, 'r') as datos_yaml:
+        malla = yaml.safe_load(datos_yaml).get('barrido', {})
+    return Simulacion(direccion_archivo), malla
+
+
+def plantilla_simulacion(simulacion):
+    """Plantilla (ver plantilla_torre) de la torre de una simulación"""
+    simulacion.paquete_propiedades.preparar()
+    return plantilla_torre(simulacion.destilacion)
+
+
+def plantilla_torre(torre):
+    """
+    Datos serializables de una torre y sus alimentaciones. El paquete termodinamico se
+    compila (ver PaqueteIdeal.compilar) para que cada proceso lo reciba una sola vez
+    """
+    corrientes = [corriente for _, corriente in torre.alimentaciones]
+    return {
+        'compuestos': list(torre.propiedades.compuestos),
+        'paquete': torre.propiedades.compilar(),
+        'corrientes': [dict(nombre=corriente.nombre, flujo=corriente.flujo,
+                            temperatura=corriente.temperatura,
+                            composicion=list(corriente.composicion),
+                            presion=corriente.presion)
+                       for corriente in corrientes],
+        'alimentaciones': [(plato, indice)
+                           for indice, (plato, _) in enumerate(torre.alimentaciones)],
+        'destilacion': {parametro: getattr(torre, parametro) for parametro in
+                        ('numero_platos', 'destilado', 'reflujo', 'presion', 'condensador',
+                         'metodo', 'especificacion')},
+    }
+
+
+def crear_torre(plantilla, caso):
+    """Crea la torre de un caso a partir de la plantilla del caso base"""
+    from simnav.corrientes import CorrienteMateria
+    from simnav.opus import DestilacionSemiRigurosa
+
+    paquete = plantilla['paquete']
+    corrientes = [CorrienteMateria(compuestos=plantilla['compuestos'],
+                                   paquete_termodinamico=paquete, **datos)
+                  for datos in plantilla['corrientes']]
+    datos = dict(plantilla['destilacion'])
+    condensador = datos.pop('condensador')
+    torre = DestilacionSemiRigurosa(
+        alimentaciones=[[plato, corrientes[indice]]
+                        for plato, indice in plantilla['alimentaciones']],
+        paquete_termodinamico=paquete, **datos)
+    torre.condensador = condensador
+
+    for parametro, valor in caso.items():
+        if parametro in PARAMETROS_ENTEROS:
+            valor = int(valor)
+        if parametro == 'plato_alimentacion':
+            torre.alimentaciones[0][0] = valor
+        else:
+            setattr(torre, parametro, valor)
+
+    for plato, _ in torre.alimentaciones:
+        if not 1 <= plato <= torre.numero_platos:
+            raise ValueError(f'El plato de alimentación {plato} esta fuera de la torre de '
+                             f'{torre.numero_platos} platos')
+    return torre
+
+
+def _iniciar_proceso(plantilla):
+    global _plantilla
+    _plantilla = plantilla
+
+
+def simular_caso(caso, plantilla=None):
+    """
+    Resuelve un caso del barrido
+    :return: una tupla (resultado, error). resultado es None si el caso no convergio
+    """
+    try:
+        torre = crear_torre(plantilla or _plantilla, caso)
+        return torre.simular(), ''
+    except (RuntimeError, ValueError, ArithmeticError, IndexError,
+            np.linalg.LinAlgError) as error:
+        return None, f'{type(error).__name__}: {error}'
+
+
+def simular_conjunto(casos, plantilla):
+    """
+    Resuelve todos los casos a la vez en el proceso actual con DestilacionConjunto
+    :return: lista de tuplas (resultado, error) como simular_caso
+    """
+    from simnav.opus.conjunto import DestilacionConjunto
+
+    salidas = [(None, '')] * len(casos)
+    torres, indices = [], []
+    for indice, caso in enumerate(casos):
+        try:
+            torre = crear_torre(plantilla, caso)
+        except ValueError as error:
+            salidas[indice] = (None, f'{type(error).__name__}: {error}')
+            continue
+        # DestilacionConjunto no usa estos atributos, sus resultados no los cumplirian
+        if torre.especificacion is not None or torre.metodo != 'punto_burbuja':
+            raise ValueError('El barrido en conjunto solo admite el metodo punto_burbuja sin '
+                             'especificación de diseño')
+        torres.append(torre)
+        indices.append(indice)
+
+    resultados = DestilacionConjunto(torres).simular()
+    for indice, resultado in zip(indices, resultados):
+        salidas[indice] = (resultado, '' if resultado is not None else 'No convergio')
+    return salidas
+
+
+def ejecutar_barrido(simulacion, malla, procesos=None, tamano_lote=None, conjunto=False):
+    """
+    Resuelve todos los casos de la malla
+    :param simulacion: instancia de Simulacion con el caso base
+    :param malla: diccionario {parametro: valores} (ver expandir_malla)
+    :param procesos: numero de procesos. Con 1 los casos se resuelven en el proceso actual
+    :param tamano_lote: numero de casos que se envian juntos a cada proceso. Por defecto se
+    reparten unos cuatro lotes por proceso
+    :param conjunto: si es verdadero todos los casos se resuelven a la vez en el proceso
+    actual con DestilacionConjunto (metodo del punto de burbuja sin aceleración), mas
+    rapido que un grupo de procesos para torres pequeñas. procesos y tamano_lote no se usan.
+    No admite especificaciones de diseño ni otros metodos de solución (ValueError)
+    :return: diccionario de arrays con una fila por caso: los parametros de la malla,
+    convergido, error, temperatura_tope, temperatura_fondo, calor_condensador,
+    calor_rehervidor, contador_ciclo_vapor, contador_ciclo_temperatura, fraccion_destilado
+    y fraccion_fondo (estas dos de forma (casos, NC)). Los casos que no convergen tienen
+    NaN en los resultados
+    """
+    invalidos = [parametro for parametro in malla if parametro not in PARAMETROS_ESPECIALES
+                 and not hasattr(simulacion.destilacion, parametro)]
+    if invalidos:
+        raise ValueError(f'Parametros de barrido desconocidos: {invalidos}')
+
+    casos = expandir_malla(malla)
+    plantilla = plantilla_simulacion(simulacion)
+    if conjunto:
+        salidas = simular_conjunto(casos, plantilla)
+    elif procesos == 1:
+        salidas = [simular_caso(caso, plantilla) for caso in casos]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(procesos, initializer=_iniciar_proceso,
+                                 initargs=(plantilla,)) as ejecutor:
+            if tamano_lote is None:
+                tamano_lote = max(1, len(casos) // (4 * (procesos or os.cpu_count() or 1)))
+            # map conserva el orden de los casos
+            salidas = list(ejecutor.map(simular_caso, casos, chunksize=tamano_lote))
+
+    resultados = columnas_resultados(casos, salidas, len(plantilla['compuestos']))
+    logger.info(f'Barrido de {len(casos)} casos: '
+                f'{int((~resultados["convergido"]).sum())} no convergieron')
+    return resultados
+
+
+def columnas_resultados(casos, salidas, numero_compuestos):
+    """Reune los parametros y resultados de cada caso en arrays por columna"""
+    numero_casos = len(casos)
+    resultados = {parametro: np.array([caso[parametro] for caso in casos])
+                  for parametro in (casos[0] if casos else {})}
+    resultados['convergido'] = np.array([resultado is not None for resultado, _ in salidas],
+                                        dtype=bool)
+    resultados['error'] = np.array([error for _, error in salidas], dtype=object)
+
+    escalares = {
+        'temperatura_tope': lambda r: r['temperatura'][0],
+        'temperatura_fondo': lambda r: r['temperatura'][-1],
+        'calor_condensador': lambda r: r['calor'][0],
+        'calor_rehervidor': lambda r: r['calor'][-1],
+        'contador_ciclo_vapor': lambda r: r['contador_ciclo_vapor'],
+        'contador_ciclo_temperatura': lambda r: r['contador_ciclo_temperatura'],
+    }
+    for nombre in escalares:
+        resultados[nombre] = np.full(numero_casos, np.nan)
+    for nombre in ('fraccion_destilado', 'fraccion_fondo'):
+        resultados[nombre] = np.full((numero_casos, numero_compuestos), np.nan)
+
+    for fila, (resultado, _) in enumerate(salidas):
+        if resultado is None:
+            continue
+        for nombre, extraer in escalares.items():
+            resultados[nombre][fila] = extraer(resultado)
+        resultados['fraccion_destilado'][fila] = resultado['fraccion_vapor'][0]
+        resultados['fraccion_fondo'][fila] = resultado['fraccion_liquido'][-1]
+    return resultados
+
+
+def exportar_resultados(resultados, compuestos, direccion_archivo):
+    """Escribe los resultados de un barrido en un archivo csv, una fila por caso"""
+    encabezado = []
+    for nombre, columna in resultados.items():
+        if columna.ndim == 2:
+            prefijo = 'xD' if nombre == 'fraccion_destilado' else 'xB'
+            encabezado.extend(f'{prefijo} - {compuesto}' for compuesto in compuestos)
+        else:
+            encabezado.append(nombre)
+
+    with open(direccion_archivo, 'w', newline='') as f:
+        escribidor = csv.writer(f)
+        escribidor.writerow(encabezado)
+        for fila in range(len(resultados['convergido'])):
+            valores = []
+            for columna in resultados.values():
+                if columna.ndim == 2:
+                    valores.extend(columna[fila])
+                else:
+                    valores.append(columna[fila])
+            escribidor.writerow(valores)
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('archivo', help='archivo de simulación con la sección barrido')
+    parser.add_argument('--salida', default='barrido.csv')
+    parser.add_argument('--procesos', type=int, default=None)
+    parser.add_argument('--tamano-lote', type=int, default=None)
+    parser.add_argument('--conjunto', action='store_true',
+                        help='resuelve todos los casos a la vez en un solo proceso')
+    argumentos = parser.parse_args(argumentos)
+
+    simulacion, malla = cargar_barrido(argumentos.archivo)
+    resultados = ejecutar_barrido(simulacion, malla, argumentos.procesos,
+                                  argumentos.tamano_lote, argumentos.conjunto)
+    exportar_resultados(resultados, simulacion.compuestos, argumentos.salida)
+    convergidos = int(resultados['convergido'].sum())
+    print(f'{convergidos} de {len(resultados["convergido"])} casos convergieron. '
+          f'Resultados en {argumentos.salida}')
+
+
+if __name__ == '__main__':
+    main()
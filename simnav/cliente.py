@@ -7,7 +7,6 @@ from pathlib import Path
 from PyQt5 import QtWidgets
 
 from simnav import Simulacion
-from simnav.gui.vistas import VistaPrincipal
 
 carpeta_actual = Path(__file__).parent
 
@@ -22,6 +21,9 @@ class Aplicacion(QtWidgets.QApplication):
         logger = logging.getLogger(__name__)
         logger.info('Inciando Aplicación')
 
+        # Las vistas (generadas con Qt Designer) se importan una vez creada la aplicación
+        from simnav.gui.vistas import VistaPrincipal
+
         self.simulacion = Simulacion(carpeta_actual / 'ejemplo.yaml')
         self.main_view = VistaPrincipal(self.simulacion)
         self.main_view.show()
@@ -66,7 +66,6 @@ class CorrienteMateria:
     @property
     def entalpia_especifica(self):
         """Retorna la entalpia especifica de la corriente"""
-        print(self.composicion, self.temperatura, self.presion)
         return self.paquete_termodinamico.entalpia(self.composicion,
                                                    self.temperatura,
                                                    self.presion)
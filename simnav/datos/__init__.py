@@ -1,2 +1,12 @@
-from .db import *
-from .propiedades import *
\ No newline at end of file
+from importlib import import_module
+
+from .propiedades import *
+
+
+def __getattr__(nombre):
+    # Las clases del ORM solo se crean (reflejando la base de datos) cuando se solicitan, de
+    # forma que usar la instantanea binaria no requiera SQLAlchemy
+    try:
+        return getattr(import_module('.db', __name__), nombre)
+    except AttributeError:
+        raise AttributeError(f'module {__name__!r} has no attribute {nombre!r}') from None
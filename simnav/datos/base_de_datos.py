@@ -6,25 +6,68 @@ Dynamic reflecting of an existing db using SQLalchemy
 
 """
 
+import sqlite3
+
 from sqlalchemy.ext.automap import automap_base
-from sqlalchemy.orm import Session
-from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool
+from sqlalchemy import create_engine, event
+
+from .instantanea import uri_solo_lectura
 
 
-def db_reflection(connection_string):
+def read_only_engine(path, mmap_size=256 * 2 ** 20, pool_size=5, max_overflow=10):
+    """
+    Creates an engine that opens the SQLite file in read-only URI mode. The database is never
+    written through these connections, so they can be used from any thread. The file is not
+    opened as immutable: SQLite keeps its shared locks and sees changes made by other
+    programs. Pages are read through mmap, which lets every process share the operating
+    system page cache instead of copying the database into its own buffers.
+    :param path: path of the SQLite file
+    :param mmap_size: maximum number of bytes of the database to memory map
+    :param pool_size: number of connections kept open by the pool
+    :param max_overflow: extra connections allowed when the pool is exhausted
+    :return: a SQLAlchemy engine
+    """
+    uri = uri_solo_lectura(path)
+
+    def connect():
+        return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+    engine = create_engine('sqlite://', creator=connect, poolclass=QueuePool,
+                           pool_size=pool_size, max_overflow=max_overflow, echo=False)
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f'PRAGMA mmap_size={int(mmap_size)}')
+        cursor.execute('PRAGMA query_only=ON')
+        cursor.close()
+
+    return engine
+
+
+def db_reflection(connection_string, scoped=False):
     """
     Reflects an existing db to use his data.
-    :param connection_string:
+    :param connection_string: connection string or an already created engine
+    :param scoped: if true the session is a scoped_session, which gives every thread its
+    own session
     :return: A dict containing all the tables in the given db and a session.
     """
     # Creating the engine
-    engine = create_engine(connection_string, echo=False)
+    if isinstance(connection_string, str):
+        engine = create_engine(connection_string, echo=False)
+    else:
+        engine = connection_string
 
     # Reflecting the db
     Base = automap_base()
     Base.prepare(engine, reflect=True)
 
     # Session
-    session = Session(engine)
+    if scoped:
+        session = scoped_session(sessionmaker(bind=engine))
+    else:
+        session = Session(engine)
     return Base, session
-
@@ -1,18 +1,75 @@
-from .base_de_datos import db_reflection
-
 """
 Accesa a la base de datos sqlite para obtener las tablas de propiedades de los componentes como objetos.
+
+La reflexión de la base de datos se realiza la primera vez que se solicita alguno de los
+nombres del modulo (Base, session o alguna de las clases del ORM) y no al importarlo.
+
+La base de datos se abre en modo de solo lectura con un pool de conexiones. session es un
+scoped_session, por lo que cada hilo usa su propia sesión, y al detectar que el proceso
+cambio (fork) se descartan las conexiones heredadas del proceso padre.
 """
 
-Base, session = db_reflection('sqlite:///propiedades.sqlite')
+import os
+
+from .instantanea import RUTA_BASE_DATOS
+
+# Relación entre los nombres de las clases y las tablas reflejadas por SQLalchemy
+CLASES = {
+    'CapacidadesCalorificasLiquido': 'capacidades_calorificas_liquido',
+    'CapacidadesCalorificasGasPolinomial': 'Capacidades_calorificas_gas_polinomial',
+    'Componentes': 'componentes',
+    'ConstantesCriticasFactoresAcentricos': 'Constantes_criticas_y_factores_acentricos',
+    'CpGasHiperbolico': 'Cp_para_gas_de_forma_hiperbolica',
+    'Antoine': 'Parametros_ecuacion_de_antoine',
+    'CalorVaporizacionLiquidos': 'Calor_de_vaporizacion_de_liquidos',
+}
+
+__all__ = ['Base', 'session', *CLASES]
+
+_conexion = None
+_motor = None
+_pid = None
+
+
+def conectar():
+    """Refleja la base de datos y crea la sesión si aun no se ha hecho
+    :return: una tupla (Base, session)
+    """
+    global _conexion, _motor, _pid
+    if _conexion is None:
+        from .base_de_datos import db_reflection, read_only_engine
+        _motor = read_only_engine(RUTA_BASE_DATOS)
+        _conexion = db_reflection(_motor, scoped=True)
+        _pid = os.getpid()
+    elif _pid != os.getpid():
+        _reiniciar_conexiones()
+    return _conexion
+
+
+def _reiniciar_conexiones():
+    """Descarta, sin cerrarlas, las conexiones y sesiones heredadas de otro proceso. Las
+    clases reflejadas se conservan ya que no dependen de la conexión"""
+    global _pid
+    _motor.pool = _motor.pool.recreate()  # Equivalente a dispose(close=False)
+    _conexion[1].registry.clear()
+    _pid = os.getpid()
+
+
+def _despues_de_fork():
+    if _conexion is not None:
+        _reiniciar_conexiones()
+
 
-# Asignando clases generadas por SQLalchemy
-CapacidadesCalorificasLiquido = Base.classes.capacidades_calorificas_liquido
-CapacidadesCalorificasGasPolinomial = Base.classes.Capacidades_calorificas_gas_polinomial
-Componentes = Base.classes.componentes
-ConstantesCriticasFactoresAcentricos = Base.classes.Constantes_criticas_y_factores_acentricos
-CpGasHiperbolico = Base.classes.Cp_para_gas_de_forma_hiperbolica
-Antoine = Base.classes.Parametros_ecuacion_de_antoine
-CalorVaporizacionLiquidos = Base.classes.Calor_de_vaporizacion_de_liquidos
+# Las sesiones obtenidas antes de un fork tambien deben dejar de usar las conexiones del padre
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_despues_de_fork)
 
 
+def __getattr__(nombre):
+    if nombre == 'Base':
+        return conectar()[0]
+    if nombre == 'session':
+        return conectar()[1]
+    if nombre in CLASES:
+        return getattr(conectar()[0].classes, CLASES[nombre])
+    raise AttributeError(f'module {__name__!r} has no attribute {nombre!r}')
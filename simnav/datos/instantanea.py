@@ -0,0 +1,236 @@
+"""
+Instantanea binaria de la base de datos de propiedades.
+
+Cada tabla de propiedades.sqlite se guarda como un array estructurado de numpy (.npy) que
+se carga con mmap, junto con un indice (indice.json) que contiene los nombres de los
+compuestos y el hash sha256 de la base de datos a partir de la cual se genero. Cargar la
+instantanea evita crear el motor de SQLAlchemy y reflejar la base de datos. Si el hash de
+la base de datos cambia la instantanea se considera vieja y se regenera.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def buscar_base_datos(nombre='propiedades.sqlite'):
+    """
+    Retorna la ruta absoluta de la base de datos de propiedades para que no dependa de la
+    carpeta de trabajo. Se busca junto al paquete simnav (instalado con package_data) y en la
+    carpeta que lo contiene (copia del repositorio). Los archivos vacios se ignoran. Si no
+    se encuentra se usa la carpeta de trabajo
+    """
+    paquete = Path(__file__).resolve().parents[1]
+    for carpeta in (paquete, paquete.parent):
+        ruta = carpeta / nombre
+        if ruta.is_file() and ruta.stat().st_size > 0:
+            return ruta
+    return Path(nombre).resolve()
+
+
+# Ruta usada tambien por db.py
+RUTA_BASE_DATOS = buscar_base_datos()
+
+
+def uri_solo_lectura(ruta):
+    """
+    Retorna la URI de sqlite para abrir la base de datos en modo de solo lectura. as_uri
+    escapa los caracteres con significado en una URI, como espacios, ?, # y %
+    """
+    return f'{Path(ruta).resolve().as_uri()}?mode=ro'
+
+TABLAS = ('componentes',
+          'Parametros_ecuacion_de_antoine',
+          'Capacidades_calorificas_gas_polinomial',
+          'capacidades_calorificas_liquido',
+          'Constantes_criticas_y_factores_acentricos',
+          'Cp_para_gas_de_forma_hiperbolica',
+          'Calor_de_vaporizacion_de_liquidos')
+
+ARCHIVO_INDICE = 'indice.json'
+VERSION = 1
+
+
+def tipo_registro(columnas):
+    """
+    Retorna el dtype estructurado de una tabla. Las columnas de texto se guardan como
+    cadenas, el id como entero y el resto como float (los valores faltantes son NaN). El campo
+    adicional disponible indica si el compuesto posee una fila en la tabla.
+    :param columnas: pares (nombre, tipo declarado en la base de datos) de cada columna
+    """
+    campos = [('disponible', bool)]
+    for nombre, tipo in columnas:
+        if nombre == 'id':
+            campos.append((nombre, np.int64))
+        elif tipo.upper() in ('TEXT', 'VARCHAR'):
+            campos.append((nombre, 'U32'))
+        else:
+            campos.append((nombre, np.float64))
+    return np.dtype(campos)
+
+
+def convertir_fila(fila, compuesto_id, tipo):
+    """
+    Convierte una fila de la base de datos en una tupla del tipo dado
+    :param fila: valores de la fila en el orden de las columnas o None si no existe. Los
+    valores nulos o vacios se convierten en NaN (o cadenas vacias para columnas de texto)
+    :param compuesto_id: id del compuesto al que corresponde la fila
+    :param tipo: dtype de la tabla (tipo_registro)
+    """
+    nombres = tipo.names[1:]
+    disponible = fila is not None
+    if fila is None:
+        fila = [None] * len(nombres)
+    valores = [disponible]
+    for nombre, valor in zip(nombres, fila):
+        if nombre == 'id':
+            valor = compuesto_id
+        elif valor is None or valor == '':
+            # Algunas columnas numericas de la base de datos contienen cadenas vacias
+            valor = '' if tipo[nombre].kind == 'U' else np.nan
+        valores.append(valor)
+    return tuple(valores)
+
+
+def hash_archivo(ruta):
+    """Retorna el hash sha256 del archivo"""
+    sha256 = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 20), b''):
+            sha256.update(bloque)
+    return sha256.hexdigest()
+
+
+def directorio_instantanea(ruta_base_datos=RUTA_BASE_DATOS):
+    """Retorna el directorio donde se guarda la instantanea de la base de datos"""
+    ruta_base_datos = Path(ruta_base_datos)
+    return ruta_base_datos.with_name(ruta_base_datos.name + '.instantanea')
+
+
+def _guardar(ruta, escribir):
+    """Escribe un archivo de forma atomica para que otros procesos no lean archivos a medias"""
+    temporal = ruta.with_name(f'{ruta.name}.{os.getpid()}.tmp')
+    with open(temporal, 'wb') as archivo:
+        escribir(archivo)
+    os.replace(temporal, ruta)
+
+
+def generar_instantanea(ruta_base_datos=RUTA_BASE_DATOS, directorio=None):
+    """
+    Genera la instantanea de todas las tablas de la base de datos
+    :param ruta_base_datos: ruta del archivo sqlite
+    :param directorio: directorio destino, por defecto junto a la base de datos
+    :return: la ruta del directorio de la instantanea
+    """
+    directorio = Path(directorio or directorio_instantanea(ruta_base_datos))
+    directorio.mkdir(parents=True, exist_ok=True)
+
+    conexion = sqlite3.connect(uri_solo_lectura(ruta_base_datos), uri=True)
+    try:
+        for tabla in TABLAS:
+            columnas = [(columna[1], columna[2]) for columna in
+                        conexion.execute(f'PRAGMA table_info("{tabla}")')]
+            tipo = tipo_registro(columnas)
+            filas = [convertir_fila(fila, int(fila[0]), tipo) for fila in
+                     conexion.execute(f'SELECT * FROM "{tabla}" ORDER BY id')]
+            registros = np.array(filas, dtype=tipo)
+            _guardar(directorio / f'{tabla}.npy',
+                     lambda archivo: np.save(archivo, registros, allow_pickle=False))
+
+        compuestos = {nombre: int(compuesto_id) for compuesto_id, nombre in
+                      conexion.execute('SELECT id, NAME FROM componentes')}
+    finally:
+        conexion.close()
+
+    # El indice se escribe al final, una instantanea sin indice no se considera valida
+    indice = {
+        'version': VERSION,
+        'sha256': hash_archivo(ruta_base_datos),
+        'tablas': list(TABLAS),
+        'compuestos': compuestos,
+    }
+    _guardar(directorio / ARCHIVO_INDICE,
+             lambda archivo: archivo.write(json.dumps(indice, indent=1).encode()))
+    logger.info(f'Instantanea de {ruta_base_datos} generada en {directorio}')
+    return directorio
+
+
+class Instantanea:
+    """Tablas de la base de datos cargadas desde una instantanea mediante mmap"""
+
+    def __init__(self, directorio):
+        self.directorio = Path(directorio)
+        with open(self.directorio / ARCHIVO_INDICE) as archivo:
+            self.indice = json.load(archivo)
+        if self.indice.get('version') != VERSION:
+            raise ValueError(f'Version de la instantanea {self.indice.get("version")} no '
+                             f'soportada')
+        self.compuestos = self.indice['compuestos']
+        self._tablas = {}
+        self._posiciones = {}
+
+    @property
+    def sha256(self):
+        return self.indice['sha256']
+
+    def tabla(self, nombre):
+        """Retorna el array estructurado (de solo lectura) de la tabla"""
+        if nombre not in self._tablas:
+            self._tablas[nombre] = np.load(self.directorio / f'{nombre}.npy', mmap_mode='r')
+            self._posiciones[nombre] = {compuesto_id: posicion for posicion, compuesto_id in
+                                        enumerate(self._tablas[nombre]['id'].tolist())}
+        return self._tablas[nombre]
+
+    def tipo(self, nombre):
+        """Retorna el dtype de la tabla"""
+        return self.tabla(nombre).dtype
+
+    def buscar_ids(self, nombres):
+        """Retorna un diccionario nombre -> id para los nombres que existen"""
+        return {nombre: self.compuestos[nombre] for nombre in nombres
+                if nombre in self.compuestos}
+
+    def filas(self, nombre, compuestos_id):
+        """Retorna un diccionario id -> fila (tupla) para los compuestos que poseen fila"""
+        registros = self.tabla(nombre)
+        posiciones = self._posiciones[nombre]
+        return {compuesto_id: registros[posiciones[compuesto_id]].item()
+                for compuesto_id in compuestos_id if compuesto_id in posiciones}
+
+
+def cargar_instantanea(ruta_base_datos=RUTA_BASE_DATOS, regenerar=True):
+    """
+    Carga la instantanea de la base de datos. Si no existe o fue generada a partir de otra
+    versión de la base de datos se regenera.
+    :param ruta_base_datos: ruta del archivo sqlite
+    :param regenerar: si es falso y la instantanea no es valida se retorna None
+    :return: la instantanea o None si no es posible usarla
+    """
+    ruta_base_datos = Path(ruta_base_datos)
+    directorio = directorio_instantanea(ruta_base_datos)
+    instantanea = None
+    try:
+        instantanea = Instantanea(directorio)
+    except (OSError, ValueError) as error:
+        logger.debug(f'No se pudo cargar la instantanea de {ruta_base_datos}: {error}')
+
+    if not ruta_base_datos.exists():
+        # Sin la base de datos la instantanea es la unica fuente de datos
+        return instantanea
+    if instantanea is not None and instantanea.sha256 == hash_archivo(ruta_base_datos):
+        return instantanea
+    if not regenerar:
+        return None
+
+    try:
+        return Instantanea(generar_instantanea(ruta_base_datos, directorio))
+    except (OSError, sqlite3.Error) as error:
+        logger.warning(f'No se pudo generar la instantanea de {ruta_base_datos}: {error}')
+        return None
@@ -2,114 +2,221 @@
 Classes, funciones y utilidades para el manejo de propiedades
 """
 
+import os
+
+import numpy as np
+
 from simnav.errores import CompuestoNoEncontrado
-from .db import (Componentes,
-                 CapacidadesCalorificasGasPolinomial,
-                 CapacidadesCalorificasLiquido,
-                 ConstantesCriticasFactoresAcentricos,
-                 CpGasHiperbolico,
-                 CalorVaporizacionLiquidos,
-                 Antoine,
-                 session,
-                 )
+from .instantanea import cargar_instantanea, convertir_fila, tipo_registro
+
+# La instantanea binaria de la base de datos (ver instantanea.py) se usa en lugar de
+# SQLAlchemy a menos que se desactive con la variable de entorno SIMNAV_INSTANTANEA=0
+USAR_INSTANTANEA = os.environ.get('SIMNAV_INSTANTANEA', '1') != '0'
+_instantanea = None
+
+# Cache de todo el proceso. Los datos de la base de datos no cambian durante la ejecución,
+# por lo que cada compuesto se busca una sola vez sin importar cuantos gestores se creen.
+_ids_compuestos = {}  # nombre del compuesto -> id
+_registros = {}  # (nombre de la tabla, id) -> tupla con la fila (según tipo_registro)
+_tipos = {}  # nombre de la tabla -> dtype
+
+
+def usar_instantanea(activa=True):
+    """Activa o desactiva el uso de la instantanea binaria como origen de los datos"""
+    global USAR_INSTANTANEA, _instantanea
+    USAR_INSTANTANEA = activa
+    _instantanea = None
+    limpiar_cache_parametros()
+
+
+def obtener_instantanea():
+    """Retorna la instantanea de la base de datos o None si no esta en uso"""
+    global _instantanea
+    if USAR_INSTANTANEA and _instantanea is None:
+        _instantanea = cargar_instantanea()
+    return _instantanea if USAR_INSTANTANEA else None
+
+
+def _tabla_orm(nombre_tabla):
+    """Retorna la tabla de SQLAlchemy reflejada. Solo se importa db cuando no se puede usar
+    la instantanea"""
+    from .db import Base
+    return Base.metadata.tables[nombre_tabla]
+
+
+def _tipo(nombre_tabla):
+    """Retorna el dtype de la tabla"""
+    if nombre_tabla not in _tipos:
+        instantanea = obtener_instantanea()
+        if instantanea is not None:
+            _tipos[nombre_tabla] = instantanea.tipo(nombre_tabla)
+        else:
+            _tipos[nombre_tabla] = tipo_registro(
+                (columna.name, str(columna.type)) for columna in _tabla_orm(nombre_tabla).columns)
+    return _tipos[nombre_tabla]
+
+
+def buscar_ids(compuestos):
+    """
+    Retorna los ids de los compuestos con una sola consulta para los nombres que no se han
+    buscado antes
+    :param compuestos: nombres de los compuestos (en ingles, sin importar mayusculas)
+    """
+    nombres = [compuesto.upper() for compuesto in compuestos]
+    faltantes = {nombre for nombre in nombres if nombre not in _ids_compuestos}
+    if faltantes:
+        instantanea = obtener_instantanea()
+        if instantanea is not None:
+            _ids_compuestos.update(instantanea.buscar_ids(faltantes))
+        else:
+            from .db import Componentes, session
+            consulta = session.query(Componentes.id, Componentes.NAME).filter(
+                Componentes.NAME.in_(faltantes))
+            for compuesto_id, nombre in consulta:
+                _ids_compuestos[nombre] = int(compuesto_id)
+
+    for nombre in nombres:
+        if nombre not in _ids_compuestos:
+            raise CompuestoNoEncontrado(
+                f'El compuesto {nombre} no existe en nuestra base de datos')
+    return [_ids_compuestos[nombre] for nombre in nombres]
+
+
+def cargar_registros(nombre_tabla, compuestos_id):
+    """
+    Retorna las filas de la tabla para los compuestos dados como un array estructurado
+    (np.recarray) en el mismo orden de los ids. Las filas que no estan en el cache se
+    obtienen con una sola consulta.
+    :param nombre_tabla: nombre de la tabla en la base de datos
+    :param compuestos_id: ids de los compuestos
+    """
+    tipo = _tipo(nombre_tabla)
+    faltantes = {compuesto_id for compuesto_id in compuestos_id
+                 if (nombre_tabla, compuesto_id) not in _registros}
+    if faltantes:
+        instantanea = obtener_instantanea()
+        if instantanea is not None:
+            encontradas = instantanea.filas(nombre_tabla, faltantes)
+        else:
+            from .db import session
+            tabla = _tabla_orm(nombre_tabla)
+            encontradas = {int(fila.id): convertir_fila(fila, int(fila.id), tipo)
+                           for fila in session.query(*tabla.columns).filter(
+                               tabla.c.id.in_(faltantes))}
+        for compuesto_id in faltantes:
+            _registros[nombre_tabla, compuesto_id] = encontradas.get(
+                compuesto_id, convertir_fila(None, compuesto_id, tipo))
+
+    return np.rec.fromrecords([_registros[nombre_tabla, compuesto_id]
+                               for compuesto_id in compuestos_id], dtype=tipo)
+
+
+def compuestos_disponibles():
+    """Retorna la tabla de componentes (np.recarray con id, NAME y FORMULA) de todos los
+    compuestos de la base de datos"""
+    instantanea = obtener_instantanea()
+    if instantanea is not None:
+        compuestos_id = instantanea.tabla('componentes')['id'].tolist()
+    else:
+        from .db import Componentes, session
+        compuestos_id = [int(compuesto_id) for compuesto_id, in session.query(Componentes.id)]
+    return cargar_registros('componentes', compuestos_id)
+
+
+def limpiar_cache_parametros():
+    """Elimina los datos guardados en el cache del proceso"""
+    _ids_compuestos.clear()
+    _registros.clear()
+    _tipos.clear()
 
 
 class GestorParametros:
     """Manejador de parametros de ecuaciones para el calculo de
     propiedades fisicoquimicas de simnav"""
 
-    # Relacion instancia orm con variable de almacenamiento local (o nombre de parametros)
-    #  para almacenamiento de resultados de solicitudes a base de datos
-    ORM_parametros = {
-        Antoine: '_antoine',
-        CapacidadesCalorificasGasPolinomial: '_cp_gas_polinomial',
-        CapacidadesCalorificasLiquido: '_cp_liquido',
-        ConstantesCriticasFactoresAcentricos: '_constantes_criticas',
-        CpGasHiperbolico: '_cp_gas_hiperbolico',
-        CalorVaporizacionLiquidos: '_calor_vaporizacion'
+    # Relacion tabla de la base de datos con variable de almacenamiento local (o nombre de
+    # parametros) para almacenamiento de resultados de solicitudes a base de datos
+    tablas_parametros = {
+        'Parametros_ecuacion_de_antoine': '_antoine',
+        'Capacidades_calorificas_gas_polinomial': '_cp_gas_polinomial',
+        'capacidades_calorificas_liquido': '_cp_liquido',
+        'Constantes_criticas_y_factores_acentricos': '_constantes_criticas',
+        'Cp_para_gas_de_forma_hiperbolica': '_cp_gas_hiperbolico',
+        'Calor_de_vaporizacion_de_liquidos': '_calor_vaporizacion'
     }
 
     def __init__(self, compuestos):
         """El manejador se inicializa con los componentes a simular"""
         self.compuestos = compuestos
-        self.compuestos_id = []
 
         # Los componentes en la base de datos estan en ingles
-        compuestos_upper = [compuesto.upper() for compuesto in self.compuestos]
-
-        for compuesto in compuestos_upper:
-            compuesto_id = session.query(Componentes.id).filter_by(NAME=compuesto).scalar()
-            if compuesto_id is None:
-                raise CompuestoNoEncontrado(
-                    f'El compuesto {compuesto} no existe en nuestra base de datos')
-            self.compuestos_id.append(compuesto_id)
+        self.compuestos_id = buscar_ids(self.compuestos)
 
-    def _solicitar_datos(self, clase):
+    def _solicitar_datos(self, tabla):
         """
         Realiza la solicitud a la base de datos para obtener los datos necesarios
-        :param clase: instancia de orm para solicitud a base de datos
-        :return: Una lista de objetos que contienen los parametros solicitados
+        :param tabla: nombre de la tabla en la base de datos
+        :return: Un array estructurado (np.recarray) con una fila por compuesto. Los campos
+        se acceden como atributos de cada fila (fila.C1) o como columnas (array['C1'])
         """
-        nombre_parametros = self.ORM_parametros[clase]
+        nombre_parametros = self.tablas_parametros[tabla]
         if hasattr(self, nombre_parametros):
             return getattr(self, nombre_parametros)
         else:
-            resultado = [session.query(clase).get(compuesto_id)
-                         for compuesto_id in self.compuestos_id]
+            resultado = cargar_registros(tabla, self.compuestos_id)
             setattr(self, nombre_parametros, resultado)
             return resultado
 
+    def cargar(self):
+        """Obtiene los parametros de todas las tablas de una vez"""
+        for tabla in self.tablas_parametros:
+            self._solicitar_datos(tabla)
+
     def antoine(self):
         """Retorna los parametros de la ecuación de antoine"""
-        return self._solicitar_datos(Antoine)
+        return self._solicitar_datos('Parametros_ecuacion_de_antoine')
 
     def cp_gas_polinomial(self):
         """Retorna los parametros a utilizar en la ecuación para calculo de capacidades
         calorificas de gas en forma polinomial encontrada en el Perry"""
-        return self._solicitar_datos(CapacidadesCalorificasGasPolinomial)
+        return self._solicitar_datos('Capacidades_calorificas_gas_polinomial')
 
     def cp_liquido(self):
         """Retorna los parametros a utilizar en la ecuación para calculo de capacidades
         calorificas de liquido encontrada en el Perry"""
-        return self._solicitar_datos(CapacidadesCalorificasLiquido)
+        return self._solicitar_datos('capacidades_calorificas_liquido')
 
     def constantes_criticas(self):
         """Retorna las constantes criticas de los componentes"""
-        return self._solicitar_datos(ConstantesCriticasFactoresAcentricos)
+        return self._solicitar_datos('Constantes_criticas_y_factores_acentricos')
 
     def cp_gas_hiperbolico(self):
         """Retorna los parametros a utilizar en la ecuación para calculo de capacidades
         calorificas de gas en forma hiperbolica encontrada en el Perry"""
-        return self._solicitar_datos(CpGasHiperbolico)
+        return self._solicitar_datos('Cp_para_gas_de_forma_hiperbolica')
 
     def calor_vaporizacion(self):
         """Retorna los parametros a utilizar en la ecuación para el calculo de calor de
         vaporización de liquidos encontrada en el Perry"""
-        return self._solicitar_datos(CalorVaporizacionLiquidos)
+        return self._solicitar_datos('Calor_de_vaporizacion_de_liquidos')
 
     def temperaturas_criticas(self):
         """Retorna las temperaturas criticas de los componentes simulados"""
-        return [parametros_criticos.Tc for parametros_criticos in self.constantes_criticas()]
+        return self.constantes_criticas().Tc
 
 
 class Parametros(GestorParametros):
     """Gestor de parametros propio de cada componente"""
 
     def __init__(self, nombre_compuesto):
+        super().__init__([nombre_compuesto])
         self.compuesto = nombre_compuesto.upper()
-        self.compuesto_id = session.query(Componentes.id). \
-            filter_by(NAME=self.compuesto).scalar()
+        self.compuesto_id = self.compuestos_id[0]
 
-    def _solicitar_datos(self, clase):
+    def _solicitar_datos(self, tabla):
         """
         Realiza la solicitud a la base de datos para obtener los datos necesarios del componente
-        :param clase: instancia de orm para solicitud a base de datos
-        :return: Una lista con objetos que representan las filas
+        :param tabla: nombre de la tabla en la base de datos
+        :return: La fila (np.record) con los parametros del componente
         """
-        nombre_parametros = self.ORM_parametros[clase]
-        if hasattr(self, nombre_parametros):
-            return getattr(self, nombre_parametros)
-        else:
-            resultado = session.query(clase).get(self.compuesto_id)
-            setattr(self, nombre_parametros, resultado)
-            return resultado
+        return super()._solicitar_datos(tabla)[0]
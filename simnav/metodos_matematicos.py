@@ -21,4 +21,347 @@ def metodo_tomas(a, b, c, d):
 
     for i in range(N - 2, -1, -1):
         x[i] = d[i] - c[i] * x[i + 1]
-    return x
\ No newline at end of file
+    return x
+
+
+def metodo_tomas_lote(a, b, c, d, metodo='tomas'):
+    """
+    Resuelve varios sistemas tridiagonales a la vez. Cada fila corresponde a una ecuación
+    (por ejemplo un plato) y cada columna a un sistema independiente (por ejemplo un
+    compuesto): a[i]·x[i-1] + b[i]·x[i] + c[i]·x[i+1] = d[i]. Los barridos hacia adelante y
+    hacia atras operan sobre todas las columnas a la vez. Los argumentos no se modifican.
+
+    :param a: diagonal inferior (a[0] no se usa)
+    :param b: diagonal principal
+    :param c: diagonal superior (c[-1] no se usa)
+    :param d: lado derecho
+        Los cuatro arrays pueden ser de forma (N,) o (N, M). Los de una dimension se usan
+        para todas las columnas
+    :param metodo: 'tomas' para el algoritmo de Thomas vectorizado o 'scipy' para usar
+        scipy.linalg.solve_banded (una sola factorización si a, b y c son de una dimension)
+    :return: la solución con la forma combinada de los argumentos
+    """
+    a, b, c, d = (np.asarray(v, dtype=float) for v in (a, b, c, d))
+    if metodo == 'scipy':
+        return _tomas_solve_banded(a, b, c, d)
+    if metodo != 'tomas':
+        raise ValueError(f'Metodo {metodo} no disponible. Opciones: tomas, scipy')
+
+    a, b, c, d, forma = _combinar_columnas(a, b, c, d)
+    N = forma[0]
+    c_prima = np.empty(forma)
+    d_prima = np.empty(forma)
+    c_prima[0] = c[0] / b[0]
+    d_prima[0] = d[0] / b[0]
+    for i in range(1, N):
+        temp = b[i] - a[i] * c_prima[i - 1]
+        c_prima[i] = c[i] / temp
+        d_prima[i] = (d[i] - a[i] * d_prima[i - 1]) / temp
+
+    # Sustitucion hacia atras
+    x = np.empty(forma)
+    x[N - 1] = d_prima[N - 1]
+    for i in range(N - 2, -1, -1):
+        x[i] = d_prima[i] - c_prima[i] * x[i + 1]
+    return x
+
+
+def metodo_tomas_bloques(a, b, c, d):
+    """
+    Resuelve un sistema tridiagonal por bloques con la generalización del algoritmo de
+    Thomas: a[i]·x[i-1] + b[i]·x[i] + c[i]·x[i+1] = d[i], donde a, b y c son matrices
+    cuadradas y x, d vectores. Cada bloque diagonal se factoriza una sola vez por barrido.
+    Los argumentos no se modifican.
+
+    :param a: bloques de la diagonal inferior, forma (N, ..., n, n) (a[0] no se usa)
+    :param b: bloques de la diagonal principal, forma (N, ..., n, n)
+    :param c: bloques de la diagonal superior, forma (N, ..., n, n) (c[-1] no se usa)
+    :param d: lado derecho, forma (N, ..., n). Las dimensiones intermedias permiten resolver
+        varios sistemas independientes a la vez
+    :return: la solución con la forma de d
+    """
+    a, b, c, d = (np.asarray(v, dtype=float) for v in (a, b, c, d))
+    N = d.shape[0]
+    c_prima = np.empty(c.shape)
+    d_prima = np.empty(d.shape)
+
+    # Se resuelven c[i] y d[i] con la misma factorización del bloque diagonal
+    temp, d_anterior = b[0], d[0]
+    for i in range(N):
+        if i > 0:
+            temp = b[i] - a[i] @ c_prima[i - 1]
+            d_anterior = d[i] - (a[i] @ d_prima[i - 1][..., np.newaxis])[..., 0]
+        solucion = np.linalg.solve(temp, np.concatenate(
+            (c[i], d_anterior[..., np.newaxis]), axis=-1))
+        c_prima[i] = solucion[..., :-1]
+        d_prima[i] = solucion[..., -1]
+
+    # Sustitucion hacia atras
+    x = np.empty(d.shape)
+    x[N - 1] = d_prima[N - 1]
+    for i in range(N - 2, -1, -1):
+        x[i] = d_prima[i] - (c_prima[i] @ x[i + 1][..., np.newaxis])[..., 0]
+    return x
+
+
+def _combinar_columnas(*arrays):
+    """Combina arrays de forma (N,) o (N, M). Los arrays de una dimension se toman como una
+    columna que se repite para cada sistema"""
+    if any(array.ndim == 2 for array in arrays):
+        arrays = [array[:, np.newaxis] if array.ndim == 1 else array for array in arrays]
+    forma = np.broadcast_shapes(*(array.shape for array in arrays))
+    return (*(np.broadcast_to(array, forma) for array in arrays), forma)
+
+
+def _tomas_solve_banded(a, b, c, d):
+    """Resuelve los sistemas tridiagonales con scipy.linalg.solve_banded"""
+    from scipy.linalg import solve_banded
+
+    def matriz_banda(a, b, c):
+        banda = np.zeros((3, b.size))
+        banda[0, 1:] = c[:-1]
+        banda[1] = b
+        banda[2, :-1] = a[1:]
+        return banda
+
+    if a.ndim == b.ndim == c.ndim == 1:
+        # Todos los sistemas comparten la matriz, cada columna de d es un lado derecho
+        return solve_banded((1, 1), matriz_banda(*np.broadcast_arrays(a, b, c)), d)
+
+    a, b, c, d, forma = _combinar_columnas(a, b, c, d)
+    x = np.empty(forma)
+    for j in range(forma[1]):
+        x[:, j] = solve_banded((1, 1), matriz_banda(a[:, j], b[:, j], c[:, j]), d[:, j])
+    return x
+
+
+class AceleradorPuntoFijo:
+    """
+    Acelera una iteración de punto fijo x = g(x). En cada iteración recibe el valor actual x
+    y la evaluación g(x) y retorna el siguiente valor de x:
+
+        acelerador = AceleradorPuntoFijo('anderson')
+        while error >= tolerancia:
+            g = funcion(x)
+            error = np.abs(g - x).max()
+            x = acelerador.siguiente(x, g)
+
+    Metodos disponibles, todos sobre el residuo f = g(x) - x:
+        sustitucion: x + amortiguamiento·f
+        anderson: mezcla de Anderson con las ultimas `memoria` iteraciones
+        broyden: segundo metodo de Broyden para la inversa del jacobiano de f, partiendo de
+            -amortiguamiento·I
+        wegstein: extrapolación de Wegstein de cada componente por separado, con el factor q
+            limitado a limites_wegstein
+
+    Salvaguardas: el paso se escala para que ningun componente cambie mas de paso_maximo y,
+    si el valor acelerado no es finito, no supera el limite inferior o el residuo crece mas
+    de crecimiento_maximo veces, se descarta el historial y se usa la sustitución amortiguada.
+    """
+
+    metodos = ('sustitucion', 'anderson', 'broyden', 'wegstein')
+
+    def __init__(self, metodo='anderson', memoria=10, amortiguamiento=1.0, paso_maximo=None,
+                 inferior=None, crecimiento_maximo=10.0, limites_wegstein=(-5.0, 0.0)):
+        """
+        :param metodo: uno de AceleradorPuntoFijo.metodos
+        :param memoria: numero de iteraciones anteriores usadas por el metodo de Anderson
+        :param amortiguamiento: factor del residuo en la sustitución (0, 1]
+        :param paso_maximo: cambio maximo de cualquier componente en una iteración
+        :param inferior: los valores deben ser mayores a este limite (por ejemplo 0 para
+            flujos y temperaturas)
+        :param crecimiento_maximo: aumento maximo de la norma del residuo entre iteraciones
+            antes de reiniciar el historial
+        :param limites_wegstein: limites del factor q de Wegstein
+        """
+        if metodo not in self.metodos:
+            raise ValueError(f'Metodo {metodo} no disponible. Opciones: {self.metodos}')
+        self.metodo = metodo
+        self.memoria = memoria
+        self.amortiguamiento = amortiguamiento
+        self.paso_maximo = paso_maximo
+        self.inferior = inferior
+        self.crecimiento_maximo = crecimiento_maximo
+        self.limites_wegstein = limites_wegstein
+        self.iteraciones = 0
+        self.reinicios = 0
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descarta el historial, por ejemplo cuando cambia la función g"""
+        self._x = self._f = None
+        self._delta_x, self._delta_f = [], []
+        self._jacobiano_inverso = None
+
+    def siguiente(self, x, g):
+        """
+        :param x: valor actual
+        :param g: valor de g(x), con la misma forma de x
+        :return: el siguiente valor de x con la forma de x
+        """
+        forma = np.shape(x)
+        x = np.array(x, dtype=float).ravel()
+        f = np.asarray(g, dtype=float).ravel() - x
+        sustitucion = x + self.amortiguamiento * f
+
+        propuesta = sustitucion
+        if self._x is not None and self.metodo != 'sustitucion':
+            if np.linalg.norm(f) > self.crecimiento_maximo * np.linalg.norm(self._f):
+                self._descartar()
+            else:
+                propuesta = getattr(self, f'_{self.metodo}')(x, f, x - self._x, f - self._f)
+        self._x, self._f = x, f
+
+        if not self._valido(propuesta):
+            self._descartar()
+            propuesta = sustitucion
+        if self.paso_maximo is not None:
+            paso = propuesta - x
+            cambio = np.abs(paso).max()
+            if cambio > self.paso_maximo:
+                propuesta = x + paso * (self.paso_maximo / cambio)
+
+        self.iteraciones += 1
+        return propuesta.reshape(forma)
+
+    def _descartar(self):
+        self._delta_x, self._delta_f = [], []
+        self._jacobiano_inverso = None
+        self.reinicios += 1
+
+    def _valido(self, propuesta):
+        if not np.isfinite(propuesta).all():
+            return False
+        return self.inferior is None or (propuesta > self.inferior).all()
+
+    def _anderson(self, x, f, delta_x, delta_f):
+        self._delta_x = (self._delta_x + [delta_x])[-self.memoria:]
+        self._delta_f = (self._delta_f + [delta_f])[-self.memoria:]
+        delta_X = np.column_stack(self._delta_x)
+        delta_F = np.column_stack(self._delta_f)
+        gamma = np.linalg.lstsq(delta_F, f, rcond=None)[0]
+        return x + self.amortiguamiento * f - (delta_X + self.amortiguamiento * delta_F) @ gamma
+
+    def _broyden(self, x, f, delta_x, delta_f):
+        if self._jacobiano_inverso is None:
+            self._jacobiano_inverso = -self.amortiguamiento * np.eye(x.size)
+        H = self._jacobiano_inverso
+        norma = delta_f @ delta_f
+        if norma > 0:
+            H += np.outer(delta_x - H @ delta_f, delta_f) / norma
+        return x - H @ f
+
+    def _wegstein(self, x, f, delta_x, delta_f):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pendiente = (delta_f + delta_x) / delta_x  # Derivada de g por componente
+            q = pendiente / (pendiente - 1)
+        q = np.where(np.isfinite(q), np.clip(q, *self.limites_wegstein), 0)
+        return x + (1 - q) * f
+
+
+def punto_fijo(funcion, x0, tolerancia=1e-8, max_iteraciones=100, **opciones):
+    """
+    Resuelve x = funcion(x) con AceleradorPuntoFijo
+    :param funcion: función g(x)
+    :param x0: valor inicial
+    :param tolerancia: valor maximo de |g(x) - x| para la convergencia
+    :param max_iteraciones: numero maximo de evaluaciones de la función
+    :param opciones: argumentos de AceleradorPuntoFijo
+    :return: una tupla (x, iteraciones)
+    """
+    acelerador = AceleradorPuntoFijo(**opciones)
+    x = np.array(x0, dtype=float)
+    for iteracion in range(1, max_iteraciones + 1):
+        g = funcion(x)
+        if np.abs(g - x).max() < tolerancia:
+            return g, iteracion
+        x = acelerador.siguiente(x, g)
+    raise RuntimeError(f'Punto fijo no converge luego de {max_iteraciones} iteraciones')
+
+
+def newton_vectorizado(funcion, x0, tolerancia=1.48e-8, max_iteraciones=50, paso_maximo=None):
+    """
+    Metodo de Newton aplicado a un sistema de ecuaciones escalares independientes, una por
+    fila. Todas las filas se iteran de forma simultanea y cada fila deja de iterarse cuando
+    converge (mascara de filas activas).
+
+    :param funcion: funcion(x, activos) que retorna el valor de la funcion y de su derivada
+        para las filas activas. x contiene solo los valores de las filas activas y activos es
+        el array de indices de dichas filas
+    :param x0: array con los valores iniciales de cada fila
+    :param tolerancia: tamaño de paso por debajo del cual se considera convergida una fila
+    :param max_iteraciones: numero maximo de iteraciones
+    :param paso_maximo: limite opcional para el valor absoluto del paso de cada iteración
+    :return: una tupla (x, iteraciones) con la solución y las iteraciones usadas por fila
+    """
+    x = np.array(x0, dtype=float)
+    iteraciones = np.zeros(x.shape, dtype=int)
+    activos = np.arange(x.size)
+
+    for _ in range(max_iteraciones):
+        valor, derivada = funcion(x[activos], activos)
+        paso = valor / derivada
+        if paso_maximo is not None:
+            paso = np.clip(paso, -paso_maximo, paso_maximo)
+        x[activos] -= paso
+        iteraciones[activos] += 1
+
+        activos = activos[~(np.abs(paso) < tolerancia)]
+        if not activos.size:
+            return x, iteraciones
+
+    raise RuntimeError(f'Newton no converge luego de {max_iteraciones} iteraciones en las '
+                       f'filas {activos}')
+
+
+def newton_acotado_vectorizado(funcion, inferior, superior, x0=None, tolerancia=1e-10,
+                               max_iteraciones=100):
+    """
+    Hibrido Newton-biseccion para sistemas de ecuaciones escalares independientes, una por
+    fila, cuya raiz esta acotada en [inferior, superior]. Cada iteración reduce el intervalo
+    de cada fila segun el signo de la funcion. Si el paso de Newton sale del intervalo (o la
+    derivada no es valida) se usa el punto medio, por lo que la convergencia esta garantizada.
+
+    :param funcion: funcion(x, activos) que retorna el valor de la funcion y de su derivada
+        para las filas activas (ver newton_vectorizado)
+    :param inferior: array con el limite inferior del intervalo de cada fila
+    :param superior: array con el limite superior del intervalo de cada fila
+    :param x0: valores iniciales. Por defecto el punto medio del intervalo
+    :param tolerancia: tamaño de paso o de intervalo por debajo del cual converge una fila
+    :param max_iteraciones: numero maximo de iteraciones
+    :return: una tupla (x, iteraciones) con la solución y las iteraciones usadas por fila
+    """
+    inferior = np.array(inferior, dtype=float)
+    superior = np.array(superior, dtype=float)
+    x = (inferior + superior) / 2 if x0 is None else np.array(x0, dtype=float)
+    iteraciones = np.zeros(x.shape, dtype=int)
+    activos = np.arange(x.size)
+
+    # Signo de la funcion en el limite inferior de cada fila
+    signo_inferior = np.sign(funcion(inferior, activos)[0])
+
+    for _ in range(max_iteraciones):
+        valor, derivada = funcion(x[activos], activos)
+        x_activos = x[activos]
+
+        # Actualizacion del intervalo
+        mismo_signo = np.sign(valor) == signo_inferior[activos]
+        inferior[activos] = np.where(mismo_signo, x_activos, inferior[activos])
+        superior[activos] = np.where(mismo_signo, superior[activos], x_activos)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_nuevo = x_activos - valor / derivada
+        fuera = ~((x_nuevo > inferior[activos]) & (x_nuevo < superior[activos]))
+        x_nuevo[fuera] = (inferior[activos][fuera] + superior[activos][fuera]) / 2
+
+        x[activos] = x_nuevo
+        iteraciones[activos] += 1
+        convergidos = ((np.abs(x_nuevo - x_activos) < tolerancia)
+                       | (superior[activos] - inferior[activos] < tolerancia) | (valor == 0))
+        x[activos[valor == 0]] = x_activos[valor == 0]
+        activos = activos[~convergidos]
+        if not activos.size:
+            return x, iteraciones
+
+    raise RuntimeError(f'Newton-biseccion no converge luego de {max_iteraciones} iteraciones '
+                       f'en las filas {activos}')
@@ -1 +1,6 @@
-from .destilacion import DestilacionSemiRigurosa
+from .destilacion import DestilacionSemiRigurosa, METODOS_SOLUCION
+from .conjunto import DestilacionConjunto
+from .continuacion import continuacion
+from .metodo_corto import metodo_corto
+from .optimizacion import optimizar_torre
+from . import naphtali_sandholm, inside_out, suma_flujos
@@ -0,0 +1,194 @@
+"""
+Solución simultanea de muchas torres de destilación independientes con el metodo del punto
+de burbuja. Las torres con el mismo numero de platos se apilan en arrays con una dimensión
+adicional al inicio, de forma (torres, N) y (torres, N, NC): los sistemas tridiagonales de
+todas las torres y compuestos se resuelven en una sola llamada a metodo_tomas_lote y los
+puntos de burbuja y las entalpias de todos los platos de todas las torres en una sola
+evaluación del paquete termodinamico. Cada torre tiene su propio criterio de convergencia y
+sale del conjunto activo cuando converge o cuando falla, sin detener a las demas.
+"""
+
+import logging
+
+import numpy as np
+
+from .destilacion import balance_materia, calores, balance_energia
+
+
+class DestilacionConjunto:
+    """
+    Conjunto de torres (instancias de DestilacionSemiRigurosa) que comparten el paquete
+    termodinamico. Pueden diferir en platos, reflujo, destilado, presión, alimentaciones,
+    condensador y estado inicial. Los ciclos de temperatura y flujo de vapor usan
+    sustitución sucesiva, igual que DestilacionSemiRigurosa con aceleracion = 'sustitucion',
+    por lo que cada torre converge al mismo perfil que al resolverla sola con ese metodo. Los
+    balances de energia son las funciones calores y balance_energia de destilacion. Con
+    condensador total la sustitución sucesiva suele no converger sin un estado inicial. Los
+    atributos metodo y especificacion de las torres no se usan.
+    """
+
+    tolerancia_temperatura = 1e-4
+    tolerancia_vapor = 1e-4
+    max_iteraciones_temperatura = 200
+    max_iteraciones_vapor = 100
+
+    def __init__(self, torres):
+        """
+        :param torres: secuencia de instancias de DestilacionSemiRigurosa
+        """
+        self.torres = list(torres)
+        if any(torre.propiedades is not self.torres[0].propiedades for torre in self.torres):
+            raise ValueError('Las torres del conjunto deben compartir el paquete termodinamico')
+
+        # Logging
+        self.logger = logging.getLogger(__name__)
+
+    def simular(self):
+        """
+        Resuelve todas las torres. Las torres se agrupan por numero de platos y cada grupo se
+        resuelve en un solo conjunto de arrays
+        :return: lista con el diccionario de resultados de cada torre (ver
+        DestilacionSemiRigurosa.simular) en el orden de las torres, o None para las torres
+        que no convergen
+        """
+        grupos = {}
+        for indice, torre in enumerate(self.torres):
+            grupos.setdefault(torre.numero_platos, []).append(indice)
+
+        resultados = [None] * len(self.torres)
+        for indices in grupos.values():
+            grupo = self._simular_grupo([self.torres[indice] for indice in indices])
+            for indice, resultado in zip(indices, grupo):
+                resultados[indice] = resultado
+
+        fallidas = resultados.count(None)
+        if fallidas:
+            self.logger.warning(f'{fallidas} de {len(resultados)} torres no convergieron')
+        return resultados
+
+    def _simular_grupo(self, torres):
+        """Metodo del punto de burbuja para torres con el mismo numero de platos"""
+        propiedades = torres[0].propiedades
+        M, N, NC = len(torres), torres[0].numero_platos, len(propiedades.compuestos)
+        D = np.array([torre.destilado for torre in torres], dtype=float)
+        presion = np.array([torre.presion for torre in torres], dtype=float)
+
+        F, zF, hF = (np.array(valores, dtype=float)
+                     for valores in zip(*(torre.alimentacion() for torre in torres)))
+        sum_materia = np.cumsum(F, axis=1)  # Materia alimentada hasta cada plato
+        V, T, con_perfil = (np.array(valores) for valores in
+                            zip(*(torre.valores_iniciales() for torre in torres)))
+        V, T = V.astype(float), T.astype(float)
+
+        # Con condensador parcial el vapor de los dos primeros platos esta fijo por el
+        # destilado y el reflujo
+        primer_plato = np.array([2 if torre.condensador == 'Parcial' else 1
+                                 for torre in torres])
+        corregir = np.arange(N) >= primer_plato[:, np.newaxis]
+
+        K = np.zeros((M, N, NC))
+        x = np.zeros((M, N, NC))
+        contador_V = np.zeros(M, dtype=int)
+        contador_T_total = np.zeros(M, dtype=int)
+        resultados = [None] * M
+        metodo_tridiagonal = torres[0].metodo_tridiagonal
+
+        activas = np.arange(M)
+        while activas.size:
+            # Ciclo interior: temperaturas de las torres activas hasta que cada una converge
+            interiores = activas
+            contador_T = 0
+            while interiores.size:
+                K[interiores] = propiedades.coeficiente_reparto(
+                    T[interiores].ravel(), np.repeat(presion[interiores], N)).reshape(-1, N, NC)
+                x_nuevo = balance_materia(V[interiores], K[interiores], F[interiores],
+                                          zF[interiores], D[interiores], metodo=metodo_tridiagonal)
+                x[interiores] = x_nuevo / x_nuevo.sum(axis=2, keepdims=True)
+
+                # Sin perfil inicial el primer punto de burbuja parte de las temperaturas de
+                # referencia de los compuestos, igual que DestilacionSemiRigurosa
+                temperatura_inicial = T[interiores].copy()
+                if contador_T == 0:
+                    sin_partida = (contador_V[interiores] == 0) & ~con_perfil[interiores]
+                    temperatura_inicial[sin_partida] = (x[interiores[sin_partida]]
+                                                        @ propiedades.temperaturas_ref)
+                temp_burbuja = self._puntos_burbuja(propiedades, x[interiores],
+                                                    presion[interiores], temperatura_inicial)
+
+                errorT = np.sum((temp_burbuja - T[interiores]) ** 2, axis=1)
+                T[interiores] = temp_burbuja
+                contador_T += 1
+                contador_T_total[interiores] += 1
+
+                # Las torres cuyo punto de burbuja falla quedan con error NaN
+                fallidas = interiores[np.isnan(errorT)]
+                if contador_T >= self.max_iteraciones_temperatura:
+                    fallidas = interiores[~(errorT < self.tolerancia_temperatura)]
+                activas = np.setdiff1d(activas, fallidas)
+                interiores = interiores[errorT >= self.tolerancia_temperatura]
+                interiores = np.setdiff1d(interiores, fallidas)
+
+            if not activas.size:
+                break
+
+            # Ciclo exterior: flujos de vapor con los balances de energia
+            Va, Ta, xa, Fa, hFa = V[activas], T[activas], x[activas], F[activas], hF[activas]
+            ya = K[activas] * xa
+            La = np.append(Va[:, 1:], np.zeros((activas.size, 1)), axis=1) + (
+                sum_materia[activas] - D[activas, np.newaxis])
+            hV = propiedades.entalpia_vapor(ya.reshape(-1, NC), Ta.ravel()).reshape(-1, N)
+            hL = propiedades.entalpia_liquido(xa.reshape(-1, NC), Ta.ravel()).reshape(-1, N)
+
+            # Mismos balances de energia que DestilacionSemiRigurosa
+            Q = calores(Va, La, hV, hL, Fa, hFa)
+            V_nuevo = balance_energia(Va, La, hV, hL, Fa, hFa, Q)
+
+            correccion = corregir[activas]
+            errorV = np.sum(np.where(correccion, V_nuevo - Va, 0) ** 2, axis=1)
+            V[activas] = np.where(correccion, V_nuevo, Va)
+            contador_V[activas] += 1
+
+            # Los calores reportados usan los flujos de vapor corregidos, igual que
+            # DestilacionSemiRigurosa.resultado
+            convergidas = np.flatnonzero(errorV < self.tolerancia_vapor)
+            Q = calores(V[activas[convergidas]], La[convergidas], hV[convergidas],
+                        hL[convergidas], Fa[convergidas], hFa[convergidas])
+            for calor, fila in zip(Q, convergidas):
+                torre = activas[fila]
+                resultados[torre] = {
+                    'vapor': V[torre].copy(),
+                    'liquido': La[fila],
+                    'temperatura': T[torre].copy(),
+                    'fraccion_liquido': x[torre].copy(),
+                    'fraccion_vapor': ya[fila],
+                    'calor': calor,
+                    'contador_ciclo_vapor': int(contador_V[torre]),
+                    'contador_ciclo_temperatura': int(contador_T_total[torre]),
+                }
+            continuar = (errorV >= self.tolerancia_vapor) & np.isfinite(V[activas]).all(axis=1)
+            continuar &= contador_V[activas] < self.max_iteraciones_vapor
+            activas = activas[continuar]
+        return resultados
+
+    def _puntos_burbuja(self, propiedades, x, presion, temperatura_inicial):
+        """
+        Puntos de burbuja de todos los platos de las torres dadas (M, N). Si el calculo
+        conjunto no converge se repite torre por torre y las torres que fallan tienen NaN
+        """
+        M, N, NC = x.shape
+        # Las composiciones de una torre que diverge pueden no ser validas
+        with np.errstate(invalid='ignore', divide='ignore'):
+            try:
+                return propiedades.temperatura_burbuja(
+                    x.reshape(-1, NC), np.repeat(presion, N),
+                    temperatura_inicial=temperatura_inicial.ravel()).reshape(M, N)
+            except RuntimeError:
+                temperaturas = np.full((M, N), np.nan)
+                for fila in range(M):
+                    try:
+                        temperaturas[fila] = propiedades.temperatura_burbuja(
+                            x[fila], presion[fila],
+                            temperatura_inicial=temperatura_inicial[fila])
+                    except RuntimeError:
+                        self.logger.debug(f'El punto de burbuja de la torre {fila} no converge')
+                return temperaturas
@@ -0,0 +1,56 @@
+"""
+Continuación de soluciones de la torre de destilación. Un parametro de la torre se lleva
+desde una solución convergida hasta el valor objetivo en varios pasos, cada uno partiendo
+del perfil del paso anterior (ver DestilacionSemiRigurosa.estado_inicial).
+"""
+
+import numpy as np
+
+
+def continuacion(torre, parametro, objetivo, pasos=4, reducciones=4):
+    """
+    Lleva un parametro numerico de la torre (reflujo, destilado, presion, ...) desde su valor
+    actual hasta el objetivo en pasos iguales. Si un paso no converge se divide a la mitad,
+    hasta reducciones veces. Al terminar la torre queda con el valor objetivo y con el
+    ultimo resultado como estado inicial.
+    :param torre: instancia de DestilacionSemiRigurosa. Si no tiene estado inicial primero se
+    resuelve con el valor actual del parametro
+    :param parametro: nombre del atributo de la torre
+    :param objetivo: valor final del parametro
+    :param pasos: numero de pasos entre el valor actual y el objetivo
+    :param reducciones: numero maximo de veces que se divide a la mitad un paso que no
+    converge
+    :return: una lista de tuplas (valor, resultado) con cada paso convergido
+    """
+    valor = getattr(torre, parametro)
+    if torre.estado_inicial is None:
+        torre.estado_inicial = torre.simular()
+    camino = [(valor, torre.estado_inicial)]
+
+    paso_normal = (objetivo - valor) / pasos
+    paso = paso_normal
+    divisiones = 0
+    while not np.isclose(valor, objetivo, rtol=1e-12, atol=0):
+        # El ultimo paso no sobrepasa el objetivo
+        nuevo_valor = objetivo if abs(paso) >= abs(objetivo - valor) else valor + paso
+        setattr(torre, parametro, nuevo_valor)
+        try:
+            resultado = torre.simular()
+        except RuntimeError as error:
+            if divisiones >= reducciones:
+                setattr(torre, parametro, valor)
+                raise RuntimeError(f'La continuación de {parametro} se detuvo en {valor}: '
+                                   f'{error}') from error
+            torre.logger.debug(f'El paso a {parametro} = {nuevo_valor} no convergio')
+            paso /= 2
+            divisiones += 1
+            continue
+
+        valor = nuevo_valor
+        torre.estado_inicial = resultado
+        camino.append((valor, resultado))
+        # Tras un paso exitoso se recupera gradualmente el tamaño de paso normal
+        if divisiones:
+            paso = min(2 * paso, paso_normal, key=abs)
+            divisiones -= 1
+    return camino
@@ -3,17 +3,158 @@ import logging
 
 import numpy as np
 
-from simnav.metodos_matematicos import metodo_tomas
+from simnav.metodos_matematicos import metodo_tomas_lote, AceleradorPuntoFijo
+from .especificacion import resolver_especificacion
+from .inicializacion import perfil_estimado
+
+
+# Metodos de solución de la torre. Cada uno es una función que recibe la torre y retorna el
+# diccionario de resultados de DestilacionSemiRigurosa.simular
+METODOS_SOLUCION = {}
+
+
+def registrar_metodo(nombre):
+    """Decorador que registra una función como metodo de solución de la torre con el nombre
+    dado"""
+
+    def registrar(funcion):
+        METODOS_SOLUCION[nombre] = funcion
+        return funcion
+
+    return registrar
+
+
+def interpolar_platos(valores, numero_platos):
+    """
+    Interpola linealmente un perfil de la torre a otro numero de platos. Los platos de ambos
+    perfiles se ubican de forma uniforme entre el condensador y el rehervidor
+    :param valores: array de forma (N,) o (N, NC)
+    :param numero_platos: numero de platos del nuevo perfil
+    :return: array de forma (numero_platos,) o (numero_platos, NC)
+    """
+    valores = np.asarray(valores, dtype=float)
+    if len(valores) == numero_platos:
+        return valores.copy()
+    origen = np.linspace(0, 1, len(valores))
+    destino = np.linspace(0, 1, numero_platos)
+    if valores.ndim == 1:
+        return np.interp(destino, origen, valores)
+    return np.column_stack([np.interp(destino, origen, columna) for columna in valores.T])
+
+
+def balance_materia(V, K, F, zF, D, SL=0, SV=0, metodo='tomas'):
+    """
+    Resuelve los balances de materia de todos los compuestos (un sistema tridiagonal por
+    compuesto) con los flujos de vapor y coeficientes de reparto dados. El flujo de liquido
+    de cada plato se obtiene del balance global de materia hasta ese plato. Los arrays
+    pueden tener una dimensión adicional al inicio, de forma (torres, N) y (torres, N, NC),
+    para resolver varias torres a la vez (ver DestilacionConjunto)
+    :param V: flujos de vapor (N,)
+    :param K: coeficientes de reparto (N, NC)
+    :param F: flujos de alimentación (N,)
+    :param zF: composiciones de la alimentación (N, NC)
+    :param D: flujo de destilado (escalar o uno por torre)
+    :param SL: retiros de liquido (N,)
+    :param SV: retiros de vapor (N,)
+    :param metodo: metodo de metodo_tomas_lote
+    :return: las fracciones molares del liquido (N, NC) sin normalizar
+    """
+    V = np.asarray(V, dtype=float)
+    SL, SV = np.broadcast_to(SL, V.shape), np.broadcast_to(SV, V.shape)
+    D = np.asarray(D, dtype=float)[..., np.newaxis]
+    # Materia alimentada y extraida hasta cada plato
+    sum_materia = np.cumsum(F - SV - SL, axis=-1)
+    A = np.zeros(V.shape)  # A[0] siempre es cero
+    A[..., 1:] = V[..., 1:] + sum_materia[..., :-1] - D
+    vapor_inferior = np.zeros(V.shape)
+    vapor_inferior[..., :-1] = V[..., 1:]
+
+    # B y C dependen del compuesto (una columna por compuesto)
+    B = -((vapor_inferior + sum_materia - D + SL)[..., np.newaxis]
+          + (V + SV)[..., np.newaxis] * K)
+    C = np.zeros(K.shape)
+    C[..., :-1, :] = V[..., 1:, np.newaxis] * K[..., 1:, :]  # La ultima fila es cero
+    d = -F[..., np.newaxis] * zF
+    if V.ndim == 1:
+        return metodo_tomas_lote(A, B, C, d, metodo=metodo)
+
+    # Cada torre y compuesto es una columna independiente de metodo_tomas_lote
+    forma = K.shape
+
+    def columnas(array):
+        return np.moveaxis(np.broadcast_to(array, forma), -2, 0).reshape(forma[-2], -1)
+
+    x = metodo_tomas_lote(columnas(A[..., np.newaxis]), columnas(B), columnas(C), columnas(d),
+                          metodo=metodo)
+    return np.moveaxis(x.reshape((forma[-2],) + forma[:-2] + forma[-1:]), 0, -2)
+
+
+def calores(V, L, hV, hL, F, hF, SL=0, SV=0):
+    """
+    Calores del condensador y del rehervidor con los balances de energia del primer plato
+    y de la torre completa. Los demas platos son adiabaticos. Los arrays pueden tener una
+    dimensión adicional al inicio, de forma (torres, N), para calcular varias torres a la vez
+    (ver DestilacionConjunto)
+    :param V: flujos de vapor (N,)
+    :param L: flujos de liquido (N,)
+    :param hV: entalpias del vapor de cada plato (N,)
+    :param hL: entalpias del liquido de cada plato (N,)
+    :param F: flujos de alimentación (N,)
+    :param hF: entalpias de la alimentación de cada plato (N,)
+    :param SL: retiros de liquido (N,)
+    :param SV: retiros de vapor (N,)
+    :return: los calores de cada plato (N,). Solo el primero (condensador) y el ultimo
+    (rehervidor) son distintos de cero
+    """
+    Q = np.zeros(np.shape(V))
+    SL, SV = np.broadcast_to(SL, Q.shape), np.broadcast_to(SV, Q.shape)
+    Q[..., 0] = (-V[..., 0] * hV[..., 0] - (L[..., 0] + SL[..., 0]) * hL[..., 0]
+                 - SV[..., 0] * hV[..., 0] + V[..., 1] * hV[..., 1]
+                 + F[..., 0] * hF[..., 0])  # Condensador
+    Q[..., -1] = (Q[..., 0] + V[..., 0] * hV[..., 0] + L[..., -1] * hL[..., -1]
+                  - np.sum(F * hF - SV * hV - SL * hL, axis=-1))  # Rehervidor
+    return Q
+
+
+def balance_energia(V, L, hV, hL, F, hF, Q, SL=0, SV=0):
+    """
+    Flujos de vapor de los platos 1 a N - 1 con el balance de energia de cada plato y el
+    vapor del plato inferior. Acepta las mismas formas que calores
+    :param Q: calores de cada plato (N,)
+    :return: los nuevos flujos de vapor (N,). El del plato 0 no cambia
+    """
+    SL, SV = np.broadcast_to(SL, np.shape(V)), np.broadcast_to(SV, np.shape(V))
+    vapor_inferior = np.zeros(np.shape(V)[:-1] + (np.shape(V)[-1] - 1,))
+    vapor_inferior[..., :-1] = V[..., 2:] * hV[..., 2:]
+    V_nuevo = np.array(V, dtype=float)
+    V_nuevo[..., 1:] = ((L[..., :-1] * hL[..., :-1] - (L[..., 1:] + SL[..., 1:]) * hL[..., 1:]
+                         + vapor_inferior + F[..., 1:] * hF[..., 1:] + Q[..., 1:])
+                        / hV[..., 1:] - SV[..., 1:])
+    return V_nuevo
 
 
 class DestilacionSemiRigurosa:
     """
     Modelo matematico estacionario de una torre de destilacion de platos para sistemas
-    multicomponentes con un condensador parcial resuelto con una matriz tridiagonal
+    multicomponentes con un condensador parcial. Por defecto se resuelve con el metodo del
+    punto de burbuja (matriz tridiagonal), el atributo metodo permite escoger cualquier otro
+    metodo de METODOS_SOLUCION.
     """
 
+    # Metodo de resolucion de los sistemas tridiagonales (ver metodo_tomas_lote)
+    metodo_tridiagonal = 'tomas'
+    # Aceleración de los ciclos de temperatura y flujo de vapor del metodo del punto de
+    # burbuja (ver AceleradorPuntoFijo.metodos). 'sustitucion' reproduce la sustitución
+    # sucesiva sin aceleración
+    aceleracion = 'anderson'
+    # Perfil de partida del metodo del punto de burbuja sin estado inicial: 'estimado' usa
+    # perfil_estimado (ver inicializacion) y 'simple' flujo molar constante y temperaturas
+    # lineales fijas
+    inicializacion = 'estimado'
+
     def __init__(self, numero_platos=10, destilado=50, reflujo=1.5, alimentaciones=[],
-                 salidas_laterales=[], paquete_termodinamico=None, presion=101325):
+                 salidas_laterales=[], paquete_termodinamico=None, presion=101325,
+                 metodo='punto_burbuja', estado_inicial=None, especificacion=None):
         """
         :param numero_platos: numero de platos de la torre
         :param destilado: flujo de destilado de la torre (kmol/h)
@@ -22,6 +163,13 @@ class DestilacionSemiRigurosa:
         :param salidas_laterales: lista de flujos (kmol/h) de salida lateral [plato, flujo]
         :param paquete_termodinamico: instancia del un paquete termodinamico
         :param presion:
+        :param metodo: nombre del metodo de solución (ver METODOS_SOLUCION)
+        :param estado_inicial: resultado de una simulación anterior (diccionario de simular)
+        usado como punto de partida (ver perfil_inicial)
+        :param especificacion: especificación de diseño, un diccionario con variable
+        ('reflujo' o 'destilado'), producto ('destilado' o 'fondo'), compuesto (nombre o
+        indice) y fraccion, y opcionalmente los demas argumentos de resolver_especificacion.
+        Si se provee, simular ajusta la variable para cumplirla
         """
         self.numero_platos = numero_platos  # Numero de platos de la torre
         self.reflujo = reflujo  # Relación de reflujo
@@ -31,16 +179,150 @@ class DestilacionSemiRigurosa:
         self.presion = presion
         self.propiedades = paquete_termodinamico
         self.condensador = "Parcial"
+        self.metodo = metodo
+        self.estado_inicial = estado_inicial
+        self.especificacion = especificacion
 
         # Logging
         self.logger = logging.getLogger(__name__)
 
     def simular(self):
         """
-        Determina las composciciones, flujos y temperaturas plato a plato en la torre
+        Determina las composciciones, flujos y temperaturas plato a plato en la torre con el
+        metodo de solución seleccionado. Con una especificación de diseño la torre se
+        resuelve varias veces (ver resolver_especificacion)
+        :return: diccionario con vapor, liquido, temperatura, fraccion_liquido,
+        fraccion_vapor, calor, contador_ciclo_vapor y contador_ciclo_temperatura, y
+        contador_especificacion si hay una especificación de diseño
+        """
+        if self.especificacion is not None:
+            return resolver_especificacion(self, **self.especificacion)
+        return self.resolver()
+
+    def resolver(self):
+        """Resuelve la torre con el reflujo y el destilado especificados (ver simular)"""
+        if self.metodo not in METODOS_SOLUCION:
+            raise ValueError(f'Metodo de solución {self.metodo} no disponible. '
+                             f'Opciones: {sorted(METODOS_SOLUCION)}')
+        return METODOS_SOLUCION[self.metodo](self)
+
+    def alimentacion(self):
+        """
+        Retorna el flujo, la composición y la entalpia especifica de la alimentación de cada
+        plato. Los platos sin alimentación tienen flujo cero
+        :return: una tupla (F, zF, hF) de formas (N,), (N, NC) y (N,)
+        """
+        N, NC = self.numero_platos, len(self.propiedades.compuestos)
+        F = np.zeros(N)
+        zF = np.zeros((N, NC))
+        hF = np.zeros(N)
+        for plato, corriente in self.alimentaciones:
+            indice = plato - 1  # Los inidices de los array comienzan en 0. Los platos en 1
+            F[indice] = corriente.flujo
+            hF[indice] = corriente.entalpia_especifica
+            zF[indice] = corriente.composicion
+        return F, zF, hF
+
+    def perfil_inicial(self):
+        """
+        Perfil de partida tomado de estado_inicial e interpolado al numero de platos actual.
+        Los flujos de vapor se escalan para cumplir el reflujo especificado. Con condensador
+        parcial el vapor del tope es el destilado y con condensador total es D·(R + 1)
+        :return: una tupla (V, T, x, y) o None si no hay un estado inicial compatible con los
+        compuestos de la torre
+        """
+        estado = self.estado_inicial
+        if estado is None:
+            return None
+        NC = len(self.propiedades.compuestos)
+        if np.shape(estado['fraccion_liquido'])[1] != NC:
+            self.logger.warning('El estado inicial no corresponde a los compuestos de la torre')
+            return None
+
+        N, D = self.numero_platos, self.destilado
+        V = interpolar_platos(estado['vapor'], N)
+        if self.condensador == 'Parcial':
+            V *= D * (self.reflujo + 1) / V[1]
+            V[0] = D
+        else:
+            V *= D * (self.reflujo + 1) / V[0]
+            V[0] = D * (self.reflujo + 1)
+        T = interpolar_platos(estado['temperatura'], N)
+        x, y = (interpolar_platos(estado[fraccion], N)
+                for fraccion in ('fraccion_liquido', 'fraccion_vapor'))
+        return V, T, x / x.sum(axis=1, keepdims=True), y / y.sum(axis=1, keepdims=True)
+
+    def balance_materia(self, V, K, F, zF, SL=0, SV=0):
+        """
+        Fracciones molares del liquido (N, NC) sin normalizar con el destilado y el metodo
+        tridiagonal de la torre (ver la función balance_materia)
+        """
+        return balance_materia(V, K, F, zF, self.destilado, SL, SV, self.metodo_tridiagonal)
+
+    def resultado(self, V, L, T, x, y, contador, contador_temperatura=0, SL=0, SV=0):
+        """
+        Arma el diccionario de resultados de simular a partir de un perfil convergido. Los
+        calores del condensador y del rehervidor se calculan con los balances de energia de
+        esos platos (ver la función calores)
+        :param contador: numero de iteraciones del metodo de solución
+        :param contador_temperatura: numero total de iteraciones de los ciclos interiores,
+        cero para los metodos sin ciclo interior
+        :param SL: retiros de liquido (N,)
+        :param SV: retiros de vapor (N,)
+        """
+        F, _, hF = self.alimentacion()
+        hL = self.propiedades.entalpia_liquido(composicion=x, temperatura=T)
+        hV = self.propiedades.entalpia_vapor(composicion=y, temperatura=T)
+        Q = calores(V, L, hV, hL, F, hF, SL, SV)
+
+        return {
+            'vapor': V,
+            'liquido': L,
+            'temperatura': T,
+            'fraccion_liquido': x,
+            'fraccion_vapor': y,
+            'calor': Q,
+            'contador_ciclo_vapor': contador,
+            'contador_ciclo_temperatura': contador_temperatura,
+        }
+
+    def valores_iniciales(self):
+        """
+        Flujos de vapor y temperaturas de partida del metodo del punto de burbuja. Se toman
+        del estado inicial si lo hay y si no segun el atributo inicializacion
+        :return: una tupla (V, T, con_perfil) donde con_perfil indica si las temperaturas
+        provienen de un perfil y pueden usarse como punto de partida de los puntos de burbuja
         """
-        # Se crean referencias de atajo para los parametros de la torre
         N, R, D = self.numero_platos, self.reflujo, self.destilado
+        condensador_parcial = self.condensador == 'Parcial'
+
+        perfil = self.perfil_inicial()
+        if perfil is not None:
+            return perfil[0], perfil[1], True
+        if self.inicializacion == 'estimado' and condensador_parcial:
+            perfil = perfil_estimado(self)
+            return perfil[0], perfil[2], True
+
+        V = np.zeros(N)
+        if condensador_parcial:
+            V[0] = D  # El flujo de vapor de salida por el tope (etapa 0) es igual al destilado
+            V[1] = D * (R + 1)  # Flujo de vapor
+            V[2:] = V[1]  # Se toma como valores iniciales para el flujo de vapor V1
+        else:
+            V[0] = D * (R + 1)
+            V[1:] = V[0]  # TODO: Esto puede ser mejorado
+        # TODO: La temperatura inicial deberia ser en funcion de las temperaturas de entrada
+        T = np.linspace(300, N * 10, N)  # Temperatura plato a plato con valores iniciales
+        return V, T, False
+
+    def simular_punto_burbuja(self):
+        """
+        Metodo del punto de burbuja. El ciclo interior corrige la temperatura con los puntos
+        de burbuja y el exterior los flujos de vapor con los balances de energia. Ambos
+        ciclos se aceleran con el metodo del atributo aceleracion
+        """
+        # Se crean referencias de atajo para los parametros de la torre
+        N, D = self.numero_platos, self.destilado
         NC = len(self.propiedades.compuestos)
 
         # Tipo de condensador
@@ -51,39 +333,17 @@ class DestilacionSemiRigurosa:
         P = np.array([self.presion] * N)
 
         # Se inicializan los array que contendran las variables de calculo plato plato
-        Q = np.zeros(N)  # Flujo de calor
         SL = np.zeros(N)  # Retiro de liquido  #TODO: Esto debe llenarse con corrientes salida
         SV = np.zeros(N)  # Retiro de vapor
-        F = np.zeros(N)  # Flujo de materia de entrada
-        zF = np.zeros((N, NC))  # Composicion de las corrientes de entrada
-        hF = np.zeros(N)  # Entalpia de la alimentacion
-        V = np.zeros(N)  # Flujo vapor
-        V_nuevo = np.zeros(N)  # Valores nuevos de flujo de vapor. Para calculo de error
         x = np.zeros((N, NC))  # Composicion de los componentes plato a plato
 
-        # Se toman los parametros necesarios de las corrientes de entrada
+        # Flujo, composicion y entalpia de las corrientes de entrada en cada plato
         self.logger.debug('Tomando los datos de las alimentaciones')
-        for plato, corriente in self.alimentaciones:
-            indice = plato - 1  # Los inidices de los array comienzan en 0. Los platos en 1
-            print(corriente.estado)
-            F[indice] = corriente.flujo
-            hF[indice] = corriente.entalpia_especifica
-            zF[indice] = corriente.composicion
+        F, zF, hF = self.alimentacion()
 
         # Valores iniciales de calculo
-        if condensador_parcial:
-            V[0] = D  # El flujo de vapor de salida por el tope (etapa 0) es igual al destilado
-            V[1] = D * (R + 1)  # Flujo de vapor
-            V[2:] = V[1]  # Se toma como valores iniciales para el flujo de vapor V1
-        else:
-            V[0] = D * (R + 1)
-            V[1:] = V[0]  # TODO: Esto puede ser mejorado
-
-        # TODO: La temperatura inicial deberia ser en funcion de las temperaturas de entrada
-        T = np.linspace(300, N * 10, N)  # Temperatura plato a plato con valores iniciales
+        V, T, con_perfil = self.valores_iniciales()
 
-        # Se inicializan arrays para las variables de espacio de estado del modelo
-        A = np.zeros(N)
         sum_materia = np.zeros(N)
 
         # Sumatoria de materia alimentada y extraida en cada etapa
@@ -97,47 +357,49 @@ class DestilacionSemiRigurosa:
         # Contadores de iteraciones
         contador_T = 0
         contador_V = 0
+        contador_T_total = 0
+
+        # Las temperaturas y los flujos de vapor deben ser positivos
+        acelerador_T = AceleradorPuntoFijo(self.aceleracion, inferior=0)
+        acelerador_V = AceleradorPuntoFijo(self.aceleracion, inferior=0)
         self.logger.debug('Iniciando Iteración de la destilación')
         # La iteración se realiza con 2 ciclos. El ciclo interior corrige la temperatura de los
-        # y el exterior el flujo de vapor por los platos
+        # y el exterior el flujo de vapor por los platos. En ambos la ultima iteración no se
+        # acelera: el perfil retornado es una sustitución sucesiva y no una extrapolación
         while errorV >= 0.0001:
             while errorT >= 0.0001:
                 # Se inicia calculando el coeficiente de reparto
                 K = self.propiedades.coeficiente_reparto(temperatura=T,
                                                          presion=self.presion)
-                # Se calculan los parametros A, B, C y D.
-                A[1:] = V[1:] + sum_materia[:-1] - D  # A[0] siempre es cero
-
-                for i in range(NC):
-                    B = -(np.append(V, 0)[1:] + sum_materia - D + SL + (V + SV) * K[:, i])
-                    C = np.append(V[1:] * K[1:, i], 0)  # Se agrega un cero al final del array
-                    E = -F * zF[:, i]
-
-                    # Se utilizan las variables de estado calculadas para el calculo de
-                    # composicion plato a plato usando el metodo de tomas para resolucion de
-                    # matrices tridiagonales
-                    x[:, i] = metodo_tomas(A, B, C, E)
+                # Se calcula la composicion plato a plato usando el metodo de tomas para
+                # resolucion de matrices tridiagonales, todos los compuestos a la vez
+                x = self.balance_materia(V, K, F, zF, SL, SV)
 
                 # Se normalizan las composiciones.
-                for n in range(N):
-                    x[n, :] = x[n, :] / sum(x[n, :])
+                x = x / x.sum(axis=1, keepdims=True)
 
-                # Se determina la temperatura de burbuja de cada plato
-                # TODO: A partir de la segunda iteración se deberia utilizar la temperatura
-                # Calculada enteriormente
+                # Se determina la temperatura de burbuja de todos los platos a la vez. A partir
+                # de la segunda iteración, o con un perfil inicial, se parte de la temperatura
+                # calculada anteriormente
+                temperatura_inicial = T if contador_T or contador_V or con_perfil else None
                 try:
-                    temp_burbuja = self.propiedades.temperatura_burbuja(composicion_liquido=x,
-                                                                        presion=P)
-                except RuntimeError as e:
-                    print(contador_T)
-                    print(contador_V)
-                    raise e
+                    temp_burbuja = self.propiedades.temperatura_burbuja(
+                        composicion_liquido=x, presion=P, temperatura_inicial=temperatura_inicial)
+                except RuntimeError:
+                    self.logger.debug(f'El punto de burbuja no converge en la iteración '
+                                      f'{contador_T} del ciclo de temperatura y {contador_V} '
+                                      f'del ciclo de vapor')
+                    raise
 
                 # Calculo de error para determinar paro de iteracion de ciclo interno
                 errorT = np.sum((temp_burbuja - T) ** 2)
-                T = temp_burbuja
+                if errorT >= 0.0001:
+                    T = acelerador_T.siguiente(T, temp_burbuja)
+                else:
+                    T = temp_burbuja
 
                 contador_T += 1
+                contador_T_total += 1
                 if contador_T >= 200:
                     raise RuntimeError('Contador de ciclo de temperatura over 200')
 
@@ -153,43 +415,31 @@ class DestilacionSemiRigurosa:
             hL = self.propiedades.entalpia_liquido(composicion=x,
                                                    temperatura=T)
             # Calculo de calor en condensador y rehervidor
-            Q[0] = (-D * hV[0] - L[0] * hL[0] + V[1] * hV[1])  # Calor condensador
+            Q = calores(V, L, hV, hL, F, hF, SL, SV)
 
-            # Calor rehervidor
-            Q[-1] = Q[0] + D * hV[0] + L[-1] * hL[-1] - np.sum(F * hF - SV * hV - SL * hL)
-
-            print(Q[0], Q[-1])
+            self.logger.debug(f'Calores de condensador y rehervidor: {Q[0]}, {Q[-1]}')
 
             # Calculo del flujo de vapor en la torre
-            for n in range(N - 1, 0, -1):
-                if n == N - 1:
-                    V_nuevo[n] = ((L[n - 1] * hL[n - 1] - (L[n] + SL[n]) * hL[n] + F[n] * hF[n]
-                                   + Q[n]) / hV[n] - SV[n])
-                else:
-                    V_nuevo[n] = ((L[n - 1] * hL[n - 1] - (L[n] + SL[n]) * hL[n] +
-                                   V[n + 1] * hV[n + 1] + F[n] * hF[n] + Q[n]) / hV[n] - SV[n])
+            V_nuevo = balance_energia(V, L, hV, hL, F, hF, Q, SL, SV)
 
             # Criterio de error en el flujo de vapor
-            if condensador_parcial:
-                errorV = np.sum((V_nuevo[2:] - V[2:]) ** 2)
-                V[2:] = V_nuevo[2:]
-
+            inicio = 2 if condensador_parcial else 1
+            errorV = np.sum((V_nuevo[inicio:] - V[inicio:]) ** 2)
+            if errorV >= 0.0001:
+                V[inicio:] = acelerador_V.siguiente(V[inicio:], V_nuevo[inicio:])
             else:
-                errorV = np.sum((V_nuevo[1:] - V[1:]) ** 2)
-                V[1:] = V_nuevo[1:]
+                V[inicio:] = V_nuevo[inicio:]
 
             # Reseteando el error en la temperatura
+            # La función del ciclo interior cambia con los flujos de vapor
             errorT = 100
             contador_V += 1
             contador_T = 0
+            acelerador_T.reiniciar()
             if contador_V >= 100:
                 raise RuntimeError('Contador de ciclo de vapor over 200')
 
-        return {
-            'vapor': V,
-            'liquido': L,
-            'temperatura': T,
-            'fraccion_liquido': x,
-            'fraccion_vapor': y,
-            'contador_ciclo_vapor': contador_V,
-        }
\ No newline at end of file
+        return self.resultado(V, L, T, x, y, contador_V, contador_T_total, SL, SV)
+
+
+METODOS_SOLUCION['punto_burbuja'] = DestilacionSemiRigurosa.simular_punto_burbuja
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""
+Especificaciones de diseño de la torre de destilación. En lugar del reflujo o el destilado se
+especifica la fracción molar de un compuesto en un producto (por ejemplo 99.5 % de benceno en
+el destilado) y la variable libre se ajusta con el metodo de la secante. Cada simulación
+parte del ultimo perfil convergido (ver DestilacionSemiRigurosa.estado_inicial), por lo que
+cada iteración de la secante cuesta pocas iteraciones de la torre.
+"""
+
+import numpy as np
+
+# Variables de la torre que pueden ajustarse para cumplir una especificación
+VARIABLES_DISENO = ('reflujo', 'destilado')
+
+
+def resolver_especificacion(torre, variable, producto, compuesto, fraccion, limites=None,
+                            tolerancia=1e-5, tolerancia_variable=1e-8, max_evaluaciones=30):
+    """
+    Ajusta el reflujo o el destilado de la torre para que la fracción molar del compuesto en
+    el producto sea la especificada. Se usa la secante entre las dos ultimas simulaciones.
+    Si el paso sale del intervalo conocido que contiene la solución se usa la bisección, y
+    si una simulación no converge se retrocede a la mitad del camino desde el ultimo valor
+    convergido. Si la secante se estanca se toma la simulación con menor error. Al terminar
+    la variable de la torre queda con el valor encontrado
+    :param torre: instancia de DestilacionSemiRigurosa. Su valor actual de la variable es el
+    punto de partida
+    :param variable: 'reflujo' o 'destilado'
+    :param producto: 'destilado' o 'fondo'
+    :param compuesto: nombre o indice del compuesto
+    :param fraccion: fracción molar especificada
+    :param limites: valores minimo y maximo de la variable. Por defecto (1e-3, 1e3) para el
+    reflujo y el flujo total alimentado para el destilado
+    :param tolerancia: error absoluto admitido en la fracción molar. No debe ser menor a la
+    precisión con la que converge la torre, cercana a 1e-6 con el metodo del punto de burbuja
+    :param tolerancia_variable: cambio relativo de la variable por debajo del cual se
+    detiene la secante
+    :param max_evaluaciones: numero maximo de simulaciones de la torre
+    :return: el diccionario de resultados de la ultima simulación (ver
+    DestilacionSemiRigurosa.simular). Los contadores de iteraciones suman los de todas las
+    simulaciones y contador_especificacion es el numero de simulaciones
+    """
+    if variable not in VARIABLES_DISENO:
+        raise ValueError(f'Variable de diseño {variable} no disponible. '
+                         f'Opciones: {VARIABLES_DISENO}')
+    if producto not in ('destilado', 'fondo'):
+        raise ValueError(f'Producto {producto} no disponible. Opciones: destilado, fondo')
+    if isinstance(compuesto, str):
+        compuesto = list(torre.propiedades.compuestos).index(compuesto)
+    if limites is None:
+        alimentado = torre.alimentacion()[0].sum()
+        limites = (1e-3, 1e3) if variable == 'reflujo' else (1e-6 * alimentado,
+                                                              (1 - 1e-6) * alimentado)
+    inferior, superior = limites
+
+    valor_original, estado_original = getattr(torre, variable), torre.estado_inicial
+    contadores = {'contador_ciclo_vapor': 0, 'contador_ciclo_temperatura': 0}
+    convergidos = []  # (valor, error, resultado) de las simulaciones convergidas
+    negativo = positivo = None  # Valores con error negativo y positivo mas recientes
+    ultimo = None  # Ultimo resultado convergido
+
+    def fallar(mensaje):
+        setattr(torre, variable, valor_original)
+        torre.estado_inicial = estado_original
+        raise RuntimeError(f'La especificación de {producto} no se alcanza ajustando '
+                           f'{variable}: {mensaje}')
+
+    valor = float(np.clip(valor_original, inferior, superior))
+    for evaluacion in range(1, max_evaluaciones + 1):
+        setattr(torre, variable, valor)
+        torre.estado_inicial = ultimo if ultimo is not None else estado_original
+        try:
+            resultado = torre.resolver()
+        except RuntimeError as error:
+            if not convergidos:
+                fallar(f'la torre no converge con {variable} = {valor}: {error}')
+            torre.logger.debug(f'La torre no converge con {variable} = {valor}')
+            valor = (valor + convergidos[-1][0]) / 2
+            continue
+        for contador in contadores:
+            contadores[contador] += resultado[contador]
+
+        composicion = (resultado['fraccion_vapor'][0] if producto == 'destilado'
+                       else resultado['fraccion_liquido'][-1])
+        error = composicion[compuesto] - fraccion
+        ultimo = resultado
+        if abs(error) <= tolerancia:
+            break
+        if error < 0:
+            negativo = valor
+        else:
+            positivo = valor
+
+        if convergidos and error != convergidos[-1][1]:
+            valor_anterior, error_anterior, _ = convergidos[-1]
+            nuevo = valor - error * (valor - valor_anterior) / (error - error_anterior)
+        else:
+            # Segundo punto de la secante
+            nuevo = valor * 1.05 if valor * 1.05 <= superior else valor * 0.95
+        convergidos.append((valor, error, resultado))
+
+        # Salvaguardas: el paso no sale del intervalo que contiene la solución ni de los
+        # limites y la variable cambia a lo sumo en un factor de 2
+        if negativo is not None and positivo is not None:
+            extremos = sorted((negativo, positivo))
+            if not extremos[0] < nuevo < extremos[1]:
+                nuevo = sum(extremos) / 2
+        nuevo = float(np.clip(nuevo, max(valor / 2, inferior), min(valor * 2, superior)))
+        if abs(nuevo - valor) <= tolerancia_variable * abs(valor):
+            if valor in limites:
+                fallar(f'{variable} llego al limite {valor}')
+            # El error restante se debe a la precisión de la torre
+            valor, _, ultimo = min(convergidos, key=lambda punto: abs(punto[1]))
+            setattr(torre, variable, valor)
+            break
+        valor = nuevo
+    else:
+        fallar(f'no converge luego de {max_evaluaciones} simulaciones')
+
+    torre.estado_inicial = estado_original
+    return {**ultimo, **contadores, 'contador_especificacion': evaluacion}
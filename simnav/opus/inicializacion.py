@@ -0,0 +1,139 @@
+"""
+Perfiles iniciales de la torre de destilación a partir de la alimentación y las
+especificaciones, sin resolver la torre.
+
+    Reparto:      los compuestos se reparten entre destilado y fondo con la ecuación de
+                  Fenske, d/b = C·alfa^Nm, donde C se ajusta para que el destilado sea D
+    Temperaturas: lineales por tramos entre el punto de rocio del destilado (tope), la
+                  temperatura de la alimentación principal en su plato y el punto de burbuja
+                  del fondo (rehervidor)
+    Flujos:       flujo molar constante en cada sección. Cada alimentación aporta q·F al
+                  liquido y (1 - q)·F al vapor, donde q se obtiene de su entalpia y de las de
+                  sus puntos de burbuja y rocio
+"""
+
+import numpy as np
+
+from simnav.metodos_matematicos import newton_acotado_vectorizado
+
+
+def calidad_alimentaciones(propiedades, zF, hF, presion):
+    """
+    Puntos de burbuja y rocio y fracción liquida q de cada alimentación. q es 1 para un
+    liquido saturado, 0 para un vapor saturado, mayor a 1 para un liquido subenfriado y
+    menor a 0 para un vapor sobrecalentado
+    :param zF: composiciones de las alimentaciones (M, NC)
+    :param hF: entalpias especificas de las alimentaciones (M,)
+    :return: una tupla (T_burbuja, T_rocio, q) de arrays de forma (M,)
+    """
+    T_burbuja = propiedades.temperatura_burbuja(zF, presion)
+    T_rocio = propiedades.temperatura_rocio(zF, presion)
+    hL = propiedades.entalpia_liquido(zF, T_burbuja)
+    hV = propiedades.entalpia_vapor(zF, T_rocio)
+    return T_burbuja, T_rocio, (hV - hF) / (hV - hL)
+
+
+def reparto_fenske_destilado(volatilidad_relativa, alimentado, destilado, etapas_minimas):
+    """
+    Flujo de cada compuesto en el destilado segun la ecuación de Fenske,
+    d/b = C·alfa^Nm, con la constante C que hace que el destilado total sea el especificado.
+    A diferencia de metodo_corto.reparto_fenske no se especifican compuestos clave: se parte
+    del destilado total y de Nm
+    :param volatilidad_relativa: volatilidad relativa de cada compuesto respecto a cualquier
+    referencia (NC,)
+    :param alimentado: flujo alimentado de cada compuesto (NC,)
+    :param destilado: flujo de destilado, entre 0 y el flujo total alimentado
+    :param etapas_minimas: numero de etapas a reflujo total Nm
+    :return: flujo de cada compuesto en el destilado (NC,)
+    """
+    alimentado = np.asarray(alimentado, dtype=float)
+    exponente = etapas_minimas * np.log(volatilidad_relativa)
+
+    def funcion(log_C, activos):
+        # Fracción de cada compuesto que sale por el destilado
+        fraccion = 1 / (1 + np.exp(-(log_C[:, np.newaxis] + exponente)))
+        return ((alimentado * fraccion).sum(axis=1) - destilado,
+                (alimentado * fraccion * (1 - fraccion)).sum(axis=1))
+
+    limite = np.abs(exponente).max() + 50
+    log_C, _ = newton_acotado_vectorizado(funcion, [-limite], [limite])
+    return alimentado / (1 + np.exp(-(log_C[0] + exponente)))
+
+
+def perfil_estimado(torre):
+    """
+    Perfil inicial de una torre con condensador parcial (ver el docstring del modulo). El
+    numero de etapas a reflujo total se toma como la mitad de los platos de la torre,
+    proporción tipica de las torres que operan cerca de 1.3 veces el reflujo minimo
+    :param torre: instancia de DestilacionSemiRigurosa
+    :return: una tupla (V, L, T, x, y) de formas (N,), (N,), (N,), (N, NC) y (N, NC)
+    """
+    propiedades, presion = torre.propiedades, torre.presion
+    N, R, D = torre.numero_platos, torre.reflujo, torre.destilado
+    F, zF, hF = torre.alimentacion()
+    platos = np.flatnonzero(F)
+    T_burbuja, T_rocio, q = calidad_alimentaciones(propiedades, zF[platos], hF[platos],
+                                                   presion)
+
+    # Flujo molar constante por sección. El vapor del plato j + 1 es el del plato j menos la
+    # parte vaporizada de la alimentación del plato j
+    V = np.full(N, D * (R + 1), dtype=float)
+    V[0] = D
+    vapor_alimentado = np.zeros(N)
+    vapor_alimentado[platos] = (1 - q) * F[platos]
+    V[2:] -= np.cumsum(vapor_alimentado[1:-1])
+    V[1:] = np.maximum(V[1:], 0.01 * V[1])
+    L = np.append(V, 0)[1:] + np.cumsum(F) - D
+
+    # Reparto de Fenske con las volatilidades a la temperatura media de la alimentación
+    alimentado = F @ zF
+    T_media = np.average((T_burbuja + T_rocio) / 2, weights=F[platos])
+    log_K = np.log(propiedades.coeficiente_reparto(T_media, presion))
+    destilado = reparto_fenske_destilado(np.exp(log_K - log_K.mean()), alimentado, D, N / 2)
+    # Se evitan fracciones nulas, que anulan los flujos de los metodos de Newton
+    zD = np.maximum(destilado, 1e-10 * alimentado) / D
+    xB = np.maximum(alimentado - destilado, 1e-10 * alimentado) / (F.sum() - D)
+    zD, xB = zD / zD.sum(), xB / xB.sum()
+
+    # Perfiles lineales entre el tope, el plato de la alimentación principal y el fondo
+    T_tope = propiedades.temperatura_rocio(zD, presion)
+    T_fondo = propiedades.temperatura_burbuja(xB, presion)
+    x_tope = zD / propiedades.coeficiente_reparto(T_tope, presion)
+    principal = np.argmax(F[platos])
+    plato_alimentacion = platos[principal]
+    fraccion_vapor = np.clip(1 - q[principal], 0, 1)
+    T_alimentacion = np.clip(T_burbuja[principal] + fraccion_vapor
+                             * (T_rocio[principal] - T_burbuja[principal]),
+                             min(T_tope, T_fondo), max(T_tope, T_fondo))
+    K_alimentacion = propiedades.coeficiente_reparto(T_alimentacion, presion)
+    x_alimentacion = zF[plato_alimentacion] / (1 + fraccion_vapor * (K_alimentacion - 1))
+
+    if 0 < plato_alimentacion < N - 1:
+        posiciones = [0, plato_alimentacion, N - 1]
+        puntos_T = [T_tope, T_alimentacion, T_fondo]
+        puntos_x = [x_tope, x_alimentacion, xB]
+    else:
+        posiciones, puntos_T, puntos_x = [0, N - 1], [T_tope, T_fondo], [x_tope, xB]
+    platos_torre = np.arange(N)
+    T = np.interp(platos_torre, posiciones, puntos_T)
+    x = np.column_stack([np.interp(platos_torre, posiciones, columna)
+                         for columna in np.transpose(puntos_x)])
+    x = x / x.sum(axis=1, keepdims=True)
+    y = propiedades.coeficiente_reparto(T, presion) * x
+    return V, L, T, x, y / y.sum(axis=1, keepdims=True)
+
+
+def estimacion_inicial(torre):
+    """
+    Flujos por compuesto y temperaturas iniciales para los metodos que corrigen todas las
+    variables de la torre. Se parte del estado inicial de la torre si lo tiene (ver
+    DestilacionSemiRigurosa.perfil_inicial) y si no de perfil_estimado
+    :return: una tupla (v, l, T) de formas (N, NC), (N, NC) y (N,)
+    """
+    perfil = torre.perfil_inicial()
+    if perfil is not None:
+        V, T, x, y = perfil
+        L = np.append(V, 0)[1:] + np.cumsum(torre.alimentacion()[0]) - torre.destilado
+    else:
+        V, L, T, x, y = perfil_estimado(torre)
+    return V[:, np.newaxis] * y, L[:, np.newaxis] * x, T
@@ -0,0 +1,147 @@
+"""
+Metodo Inside-Out (Boston) para torres de destilación.
+
+El ciclo interior resuelve la torre con modelos aproximados de cada plato que no requieren
+el paquete termodinamico:
+
+    K[j, i] = alfa[j, i]·Kb[j],  ln Kb[j] = A[j] + B[j]/T[j]
+    hL[j] = cL[j] + dL[j]·(T[j] - T*[j]),  hV[j] = cV[j] + dV[j]·(T[j] - T*[j])
+
+Con estos modelos el punto de burbuja es explicito, T = B/(ln Kb - A) con
+Kb = 1/Σ alfa·x, y los flujos de vapor se obtienen de los balances de energia plato a plato
+partiendo del reflujo especificado. El ciclo exterior evalua las propiedades rigurosas en el
+perfil del ciclo interior y actualiza los parametros de los modelos hasta que estos dejan de
+cambiar.
+"""
+
+import numpy as np
+
+from .destilacion import registrar_metodo
+from .inicializacion import estimacion_inicial
+
+
+class ModeloAproximado:
+    """
+    Modelos de coeficiente de reparto y entalpia de cada plato ajustados a las propiedades
+    rigurosas en un perfil de temperatura y composiciones
+    """
+
+    def __init__(self, propiedades, temperatura, fraccion_liquido, fraccion_vapor, presion):
+        """
+        :param propiedades: paquete termodinamico
+        :param temperatura: temperatura de cada plato (N,)
+        :param fraccion_liquido: composición del liquido de cada plato (N, NC)
+        :param fraccion_vapor: composición del vapor de cada plato (N, NC)
+        :param presion: presion de la torre
+        """
+        T = self.temperatura_referencia = temperatura
+        K = propiedades.coeficiente_reparto(T, presion)
+        derivada_log_K = propiedades.derivada_coeficiente_reparto(T, presion) / K
+
+        # Componente de referencia ponderado por su contribución a la fase vapor
+        peso = fraccion_vapor * derivada_log_K
+        peso = peso / peso.sum(axis=1, keepdims=True)
+        log_Kb = (peso * np.log(K)).sum(axis=1)
+        self.B = -T ** 2 * (peso * derivada_log_K).sum(axis=1)
+        self.A = log_Kb - self.B / T
+        self.volatilidad_relativa = K / np.exp(log_Kb)[:, np.newaxis]
+
+        self.entalpia_liquido_ref = propiedades.entalpia_liquido(fraccion_liquido, T)
+        self.entalpia_vapor_ref = propiedades.entalpia_vapor(fraccion_vapor, T)
+        self.cp_liquido = propiedades.derivada_entalpia_liquido(fraccion_liquido, T)
+        self.cp_vapor = propiedades.derivada_entalpia_vapor(fraccion_vapor, T)
+
+    def coeficiente_reparto(self, temperatura):
+        """Coeficientes de reparto (N, NC) de cada plato"""
+        Kb = np.exp(self.A + self.B / temperatura)
+        return self.volatilidad_relativa * Kb[:, np.newaxis]
+
+    def temperatura_burbuja(self, fraccion_liquido):
+        """Temperatura de burbuja de cada plato"""
+        Kb = 1 / (self.volatilidad_relativa * fraccion_liquido).sum(axis=1)
+        return self.B / (np.log(Kb) - self.A)
+
+    def entalpias(self, temperatura):
+        """Entalpias del liquido y del vapor de cada plato"""
+        delta_T = temperatura - self.temperatura_referencia
+        return (self.entalpia_liquido_ref + self.cp_liquido * delta_T,
+                self.entalpia_vapor_ref + self.cp_vapor * delta_T)
+
+
+def flujos_vapor(torre, hL, hV, F, hF):
+    """
+    Calcula los flujos de vapor con los balances de energia de los platos 1 a N-2 partiendo
+    del destilado (V[0]) y el vapor del plato 1 fijado por el reflujo. El flujo de liquido
+    de cada plato es L[n] = V[n+1] + ΣF[:n+1] - D, por lo que el balance del plato n da
+    V[n+1] a partir de V[n]
+    """
+    N, D = torre.numero_platos, torre.destilado
+    sum_materia = np.cumsum(F) - D
+    V = np.zeros(N)
+    V[0] = D
+    V[1] = D * (torre.reflujo + 1)
+    for n in range(1, N - 1):
+        V[n + 1] = (V[n] * (hV[n] - hL[n - 1]) - sum_materia[n - 1] * hL[n - 1]
+                    + sum_materia[n] * hL[n] - F[n] * hF[n]) / (hV[n + 1] - hL[n])
+    return V
+
+
+@registrar_metodo('inside_out')
+def simular_inside_out(torre, tolerancia=1e-6, max_iteraciones=30,
+                       max_iteraciones_interiores=200):
+    """
+    Resuelve la torre con el metodo Inside-Out
+    :param torre: instancia de DestilacionSemiRigurosa
+    :param tolerancia: cambio maximo de temperatura (K) y cambio relativo maximo de los
+    flujos de vapor entre iteraciones para la convergencia
+    :param max_iteraciones: numero maximo de iteraciones del ciclo exterior
+    :param max_iteraciones_interiores: numero maximo de iteraciones de cada ciclo interior
+    :return: el mismo diccionario de DestilacionSemiRigurosa.simular. contador_ciclo_vapor
+    contiene el numero de iteraciones del ciclo exterior, cada una con una sola evaluación
+    de las propiedades rigurosas y contador_ciclo_temperatura el total de iteraciones de los
+    ciclos interiores
+    """
+    if torre.condensador != 'Parcial':
+        raise ValueError('El metodo Inside-Out solo admite condensador parcial')
+
+    propiedades, presion = torre.propiedades, torre.presion
+    F, zF, hF = torre.alimentacion()
+    v, l, T = estimacion_inicial(torre)
+    V = v.sum(axis=1)
+    x, y = l / l.sum(axis=1, keepdims=True), v / V[:, np.newaxis]
+
+    contador_exterior = contador_interior_total = 0
+    while True:
+        modelo = ModeloAproximado(propiedades, T, x, y, presion)
+        T_exterior, V_exterior = T, V
+
+        # Ciclo interior con los modelos aproximados
+        contador_interior = 0
+        while True:
+            x = torre.balance_materia(V, modelo.coeficiente_reparto(T), F, zF)
+            x = x / x.sum(axis=1, keepdims=True)
+            T_nueva = modelo.temperatura_burbuja(x)
+            V_nuevo = flujos_vapor(torre, *modelo.entalpias(T_nueva), F, hF)
+            error = max(np.abs(T_nueva - T).max(), np.abs(V_nuevo / V - 1).max())
+            T, V = T_nueva, V_nuevo
+            contador_interior += 1
+            if error < tolerancia:
+                break
+            if contador_interior >= max_iteraciones_interiores:
+                raise RuntimeError(f'El ciclo interior no convergio en '
+                                   f'{max_iteraciones_interiores} iteraciones')
+
+        y = modelo.coeficiente_reparto(T) * x
+        contador_exterior += 1
+        contador_interior_total += contador_interior
+        # Si el ciclo interior no movio el perfil los modelos ya coinciden con las
+        # propiedades rigurosas
+        if max(np.abs(T - T_exterior).max(), np.abs(V / V_exterior - 1).max()) < tolerancia:
+            break
+        if contador_exterior >= max_iteraciones:
+            raise RuntimeError(f'Inside-Out no convergio en {max_iteraciones} iteraciones')
+
+    y = propiedades.coeficiente_reparto(T, presion) * x
+    y = y / y.sum(axis=1, keepdims=True)
+    L = np.append(V, 0)[1:] + np.cumsum(F) - torre.destilado
+    return torre.resultado(V, L, T, x, y, contador_exterior, contador_interior_total)
@@ -0,0 +1,180 @@
+"""
+Metodo corto de Fenske-Underwood-Gilliland para el diseño preliminar de torres de
+destilación con condensador parcial:
+
+    Fenske:     Nm = ln[(d_LK/b_LK)·(b_HK/d_HK)] / ln alfa_LK, con alfa relativa a la clave
+                pesada. Los demas compuestos se reparten con d/b = (d_HK/b_HK)·alfa^Nm
+    Underwood:  Σ alfa·z/(alfa - theta) = 1 - q con 1 < theta < alfa_LK y
+                Rmin + 1 = Σ alfa·xD/(alfa - theta)
+    Gilliland:  correlación de Eduljee, (N - Nm)/(N + 1) = 0.75·[1 - X^0.5668] con
+                X = (R - Rmin)/(R + 1)
+    Kirkbride:  NR/NS = [(z_HK/z_LK)·(xB_LK/xD_HK)^2·B/D]^0.206
+
+Las volatilidades son la media geometrica de las del tope (punto de rocio del destilado) y
+del fondo (punto de burbuja del producto de fondo). Todas las especificaciones pueden ser
+arrays, cada fila es una alternativa de diseño y todas se calculan a la vez. Las etapas
+incluyen el condensador parcial y el rehervidor, igual que los platos de
+DestilacionSemiRigurosa.
+"""
+
+import numpy as np
+
+from simnav.metodos_matematicos import newton_acotado_vectorizado
+from .destilacion import DestilacionSemiRigurosa
+
+
+def volatilidades(propiedades, temperatura, presion, clave_pesada):
+    """Volatilidades relativas a la clave pesada de cada fila (M, NC)"""
+    K = propiedades.coeficiente_reparto(temperatura, presion)
+    return K / K[:, clave_pesada, np.newaxis]
+
+
+def reparto_fenske(alfa, alimentado, clave_ligera, clave_pesada, recuperacion_ligera,
+                   recuperacion_pesada):
+    """
+    Etapas minimas y flujo de cada compuesto en el destilado
+    :param alfa: volatilidades relativas a la clave pesada (M, NC)
+    :param alimentado: flujo alimentado de cada compuesto (M, NC)
+    :param recuperacion_ligera: fracción de la clave ligera que sale por el destilado (M,)
+    :param recuperacion_pesada: fracción de la clave pesada que sale por el fondo (M,)
+    :return: una tupla (Nm, d) de formas (M,) y (M, NC)
+    """
+    log_relacion_pesada = np.log((1 - recuperacion_pesada) / recuperacion_pesada)
+    log_relacion_ligera = np.log(recuperacion_ligera / (1 - recuperacion_ligera))
+    etapas_minimas = ((log_relacion_ligera - log_relacion_pesada)
+                      / np.log(alfa[:, clave_ligera]))
+    log_relacion = (log_relacion_pesada[:, np.newaxis]
+                    + etapas_minimas[:, np.newaxis] * np.log(alfa))
+    return etapas_minimas, alimentado / (1 + np.exp(-log_relacion))
+
+
+def raiz_underwood(alfa, composicion, calidad, clave_ligera):
+    """
+    Raiz theta de la ecuación de Underwood entre las volatilidades de las claves de cada
+    fila
+    :param alfa: volatilidades relativas a la clave pesada (M, NC)
+    :param composicion: composición de la alimentación (M, NC)
+    :param calidad: fracción liquida q de la alimentación (M,)
+    :return: theta (M,)
+    """
+    alfa_ligera = alfa[:, clave_ligera]
+
+    def funcion(theta, activos):
+        diferencia = alfa[activos] - theta[:, np.newaxis]
+        terminos = alfa[activos] * composicion[activos] / diferencia
+        return (terminos.sum(axis=1) - (1 - calidad[activos]),
+                (terminos / diferencia).sum(axis=1))
+
+    margen = 1e-9 * (alfa_ligera - 1)
+    theta, _ = newton_acotado_vectorizado(funcion, 1 + margen, alfa_ligera - margen)
+    return theta
+
+
+def metodo_corto(propiedades, composicion, clave_ligera, clave_pesada, recuperacion_ligera,
+                 recuperacion_pesada, factor_reflujo=1.3, calidad=1.0, presion=101325,
+                 flujo=1.0):
+    """
+    Diseño de una o varias torres con el metodo de Fenske-Underwood-Gilliland. Todos los
+    argumentos numericos pueden ser arrays de M alternativas (la composición de forma
+    (M, NC)) y se combinan con las reglas de broadcasting de numpy
+    :param propiedades: paquete termodinamico preparado
+    :param composicion: composición de la alimentación (NC,) o (M, NC)
+    :param clave_ligera: indice del compuesto clave ligero
+    :param clave_pesada: indice del compuesto clave pesado
+    :param recuperacion_ligera: fracción de la clave ligera que sale por el destilado
+    :param recuperacion_pesada: fracción de la clave pesada que sale por el fondo
+    :param factor_reflujo: relación entre el reflujo de operación y el minimo
+    :param calidad: fracción liquida q de la alimentación
+    :param presion: presion de la torre
+    :param flujo: flujo de la alimentación
+    :return: diccionario con arrays de forma (M,): etapas_minimas, reflujo_minimo, reflujo,
+    etapas, numero_platos (entero), plato_alimentacion (contando desde el condensador, que
+    es el plato 1), destilado, fondo, temperatura_tope, temperatura_fondo y theta; y de
+    forma (M, NC): fraccion_destilado y fraccion_fondo
+    """
+    composicion = np.atleast_2d(np.asarray(composicion, dtype=float))
+    especificaciones = [np.atleast_1d(np.asarray(valor, dtype=float)) for valor in
+                        (recuperacion_ligera, recuperacion_pesada, factor_reflujo, calidad,
+                         presion, flujo)]
+    M = np.broadcast_shapes(composicion.shape[:1],
+                            *(valor.shape for valor in especificaciones))[0]
+    composicion = np.broadcast_to(composicion, (M, composicion.shape[1]))
+    (recuperacion_ligera, recuperacion_pesada, factor_reflujo, calidad, presion,
+     flujo) = (np.broadcast_to(valor, (M,)) for valor in especificaciones)
+    alimentado = flujo[:, np.newaxis] * composicion
+
+    # Las volatilidades se calculan primero en el punto de burbuja de la alimentación y
+    # luego con las temperaturas del tope y del fondo del reparto obtenido
+    T_alimentacion = propiedades.temperatura_burbuja(composicion, presion)
+    alfa = volatilidades(propiedades, T_alimentacion, presion, clave_pesada)
+    for _ in range(2):
+        etapas_minimas, d = reparto_fenske(alfa, alimentado, clave_ligera, clave_pesada,
+                                           recuperacion_ligera, recuperacion_pesada)
+        b = alimentado - d
+        destilado, fondo = d.sum(axis=1), b.sum(axis=1)
+        fraccion_destilado = d / destilado[:, np.newaxis]
+        fraccion_fondo = b / fondo[:, np.newaxis]
+        T_tope = propiedades.temperatura_rocio(fraccion_destilado, presion)
+        T_fondo = propiedades.temperatura_burbuja(fraccion_fondo, presion)
+        alfa = np.sqrt(volatilidades(propiedades, T_tope, presion, clave_pesada)
+                       * volatilidades(propiedades, T_fondo, presion, clave_pesada))
+
+    alfa_ligera = alfa[:, clave_ligera, np.newaxis]
+    if ((alfa > 1) & (alfa < alfa_ligera)).any():
+        raise ValueError('Las claves ligera y pesada deben tener volatilidades adyacentes')
+
+    theta = raiz_underwood(alfa, composicion, calidad, clave_ligera)
+    reflujo_minimo = (alfa * fraccion_destilado / (alfa - theta[:, np.newaxis])).sum(
+        axis=1) - 1
+    reflujo = factor_reflujo * reflujo_minimo
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        X = (reflujo - reflujo_minimo) / (reflujo + 1)
+        Y = 0.75 * (1 - X ** 0.5668)
+        etapas = (etapas_minimas + Y) / (1 - Y)
+
+        # Etapas por encima del plato de alimentación segun Kirkbride
+        relacion = ((composicion[:, clave_pesada] / composicion[:, clave_ligera])
+                    * (fraccion_fondo[:, clave_ligera]
+                       / fraccion_destilado[:, clave_pesada]) ** 2
+                    * fondo / destilado) ** 0.206
+        etapas_rectificacion = etapas * relacion / (1 + relacion)
+
+    numero_platos = np.ceil(etapas).astype(int)
+    plato_alimentacion = np.clip(np.round(etapas_rectificacion).astype(int) + 1, 2,
+                                 numero_platos - 1)
+    return {
+        'etapas_minimas': etapas_minimas,
+        'reflujo_minimo': reflujo_minimo,
+        'reflujo': reflujo,
+        'etapas': etapas,
+        'numero_platos': numero_platos,
+        'plato_alimentacion': plato_alimentacion,
+        'destilado': destilado,
+        'fondo': fondo,
+        'fraccion_destilado': fraccion_destilado,
+        'fraccion_fondo': fraccion_fondo,
+        'temperatura_tope': T_tope,
+        'temperatura_fondo': T_fondo,
+        'theta': theta,
+    }
+
+
+def torre_rigurosa(resultado, alimentacion, paquete_termodinamico, indice=0, **parametros):
+    """
+    Crea la torre rigurosa correspondiente a una alternativa del metodo corto, con su numero
+    de platos, reflujo, plato de alimentación y destilado (escalado al flujo de la
+    alimentación). El perfil de partida de la torre se estima con sus especificaciones
+    :param resultado: diccionario retornado por metodo_corto
+    :param alimentacion: corriente de alimentación
+    :param indice: fila de la alternativa
+    :param parametros: otros argumentos de DestilacionSemiRigurosa (presion, metodo, ...)
+    :return: instancia de DestilacionSemiRigurosa
+    """
+    destilado, fondo = resultado['destilado'][indice], resultado['fondo'][indice]
+    return DestilacionSemiRigurosa(
+        numero_platos=int(resultado['numero_platos'][indice]),
+        destilado=float(alimentacion.flujo * destilado / (destilado + fondo)),
+        reflujo=float(resultado['reflujo'][indice]),
+        alimentaciones=[[int(resultado['plato_alimentacion'][indice]), alimentacion]],
+        paquete_termodinamico=paquete_termodinamico, **parametros)
@@ -0,0 +1,170 @@
+"""
+Metodo de Naphtali-Sandholm para torres de destilación. Las ecuaciones MESH de todos los
+platos se resuelven de forma simultanea con el metodo de Newton.
+
+Las variables de cada plato j son los flujos de vapor por compuesto v[j], los flujos de
+liquido por compuesto l[j] y la temperatura T[j]. Las ecuaciones de cada plato son:
+
+    Materia:    l[j] + v[j] - l[j-1] - v[j+1] - F[j]·zF[j] = 0
+    Equilibrio: K[j]·l[j]·V[j]/L[j] - v[j] = 0
+    Energia:    Σ l[j]·hL[j] + Σ v[j]·hV[j] - Σ l[j-1]·hL[j-1] - Σ v[j+1]·hV[j+1]
+                - F[j]·hF[j] = 0
+
+En el condensador (plato 0) la ecuación de energia se reemplaza por la especificación del
+reflujo, L[0] = R·D, y en el rehervidor (ultimo plato) por la del producto de fondo,
+L[N-1] = ΣF - D. Los calores del condensador y rehervidor se calculan al final con los
+balances de energia de esos platos. Cada ecuación de un plato solo depende de las
+variables del mismo plato y de los platos vecinos, por lo que el jacobiano (analitico) es
+tridiagonal por bloques y se resuelve con metodo_tomas_bloques.
+"""
+
+import numpy as np
+
+from simnav.metodos_matematicos import metodo_tomas_bloques
+from .destilacion import registrar_metodo
+from .inicializacion import estimacion_inicial
+
+# Cambio maximo de temperatura por iteración (K)
+PASO_MAXIMO_TEMPERATURA = 20
+
+
+class SistemaMESH:
+    """Residuos y jacobiano de las ecuaciones MESH de una torre con condensador parcial"""
+
+    def __init__(self, torre):
+        self.propiedades = torre.propiedades
+        self.presion = torre.presion
+        self.N, self.NC = torre.numero_platos, len(torre.propiedades.compuestos)
+        self.F, self.zF, self.hF = torre.alimentacion()
+        self.reflujo = torre.reflujo * torre.destilado
+        self.fondo = self.F.sum() - torre.destilado
+
+        # Escalas de las ecuaciones. Los balances de materia y el equilibrio se escalan con
+        # el flujo alimentado y el balance de energia ademas con la entalpia de vaporización
+        self.escala_flujo = self.F.sum()
+        self.escala_energia = self.escala_flujo * np.mean(
+            self.propiedades.entalpia_vaporizacion())
+
+    def propiedades_platos(self, T):
+        """Coeficientes de reparto, entalpias de compuesto puro y sus derivadas en cada
+        plato"""
+        p = self.propiedades
+        return (p.coeficiente_reparto(T, self.presion),
+                p.derivada_coeficiente_reparto(T, self.presion),
+                p.entalpia_liquido_puro(T), p.derivada_entalpia_liquido_puro(T),
+                p.entalpia_vapor_puro(T), p.derivada_entalpia_vapor_puro(T))
+
+    def residuos(self, v, l, T, props=None):
+        """
+        Retorna los residuos escalados de las ecuaciones de cada plato, forma (N, 2·NC + 1):
+        balances de materia, equilibrio y energia (o especificación)
+        """
+        K, _, hL, _, hV, _ = props or self.propiedades_platos(T)
+        V, L = v.sum(axis=1), l.sum(axis=1)
+
+        # Corrientes que entran a cada plato desde los platos vecinos
+        l_entrada = np.vstack((np.zeros(self.NC), l[:-1]))
+        v_entrada = np.vstack((v[1:], np.zeros(self.NC)))
+        materia = l + v - l_entrada - v_entrada - self.F[:, np.newaxis] * self.zF
+        equilibrio = K * l * (V / L)[:, np.newaxis] - v
+
+        energia_liquido = (l * hL).sum(axis=1)
+        energia_vapor = (v * hV).sum(axis=1)
+        energia = (energia_liquido + energia_vapor - self.F * self.hF
+                   - np.append(0, energia_liquido[:-1]) - np.append(energia_vapor[1:], 0))
+        energia /= self.escala_energia / self.escala_flujo
+        energia[0] = L[0] - self.reflujo
+        energia[-1] = L[-1] - self.fondo
+        return np.column_stack((materia, equilibrio, energia)) / self.escala_flujo
+
+    def jacobiano(self, v, l, T, props=None):
+        """
+        Retorna los bloques del jacobiano de los residuos respecto a las variables
+        (v, l, T) de cada plato: inferior (plato anterior), diagonal y superior (plato
+        siguiente), cada uno de forma (N, 2·NC + 1, 2·NC + 1)
+        """
+        N, NC = self.N, self.NC
+        K, dK, hL, dhL, hV, dhV = props or self.propiedades_platos(T)
+        V, L = v.sum(axis=1), l.sum(axis=1)
+        n = 2 * NC + 1
+        inferior, diagonal, superior = (np.zeros((N, n, n)) for _ in range(3))
+        identidad = np.eye(NC)
+        materia, equilibrio, energia = slice(0, NC), slice(NC, 2 * NC), 2 * NC
+        flujo_v, flujo_l, temperatura = slice(0, NC), slice(NC, 2 * NC), 2 * NC
+
+        # Balances de materia
+        diagonal[:, materia, flujo_v] = identidad
+        diagonal[:, materia, flujo_l] = identidad
+        inferior[1:, materia, flujo_l] = -identidad
+        superior[:-1, materia, flujo_v] = -identidad
+
+        # Equilibrio: K·l·V/L - v
+        Kl = K * l
+        diagonal[:, equilibrio, flujo_v] = (Kl / L[:, np.newaxis])[:, :, np.newaxis] - identidad
+        diagonal[:, equilibrio, flujo_l] = (
+            (K * (V / L)[:, np.newaxis])[:, :, np.newaxis] * identidad
+            - (Kl * (V / L ** 2)[:, np.newaxis])[:, :, np.newaxis])
+        diagonal[:, equilibrio, temperatura] = dK * l * (V / L)[:, np.newaxis]
+
+        # Balances de energia
+        escala = self.escala_flujo / self.escala_energia
+        diagonal[:, energia, flujo_v] = hV * escala
+        diagonal[:, energia, flujo_l] = hL * escala
+        diagonal[:, energia, temperatura] = ((l * dhL).sum(axis=1)
+                                             + (v * dhV).sum(axis=1)) * escala
+        inferior[1:, energia, flujo_l] = -hL[:-1] * escala
+        inferior[1:, energia, temperatura] = -(l[:-1] * dhL[:-1]).sum(axis=1) * escala
+        superior[:-1, energia, flujo_v] = -hV[1:] * escala
+        superior[:-1, energia, temperatura] = -(v[1:] * dhV[1:]).sum(axis=1) * escala
+
+        # Especificaciones de reflujo y producto de fondo
+        for plato in (0, -1):
+            inferior[plato, energia] = 0
+            superior[plato, energia] = 0
+            diagonal[plato, energia] = 0
+            diagonal[plato, energia, flujo_l] = 1
+
+        return inferior / self.escala_flujo, diagonal / self.escala_flujo, \
+            superior / self.escala_flujo
+
+
+@registrar_metodo('naphtali_sandholm')
+def simular_naphtali_sandholm(torre, tolerancia=1e-9, max_iteraciones=50):
+    """
+    Resuelve la torre con el metodo de Naphtali-Sandholm
+    :param torre: instancia de DestilacionSemiRigurosa
+    :param tolerancia: valor maximo de los residuos escalados para la convergencia
+    :param max_iteraciones: numero maximo de iteraciones de Newton
+    :return: el mismo diccionario de DestilacionSemiRigurosa.simular. contador_ciclo_vapor
+    contiene el numero de iteraciones de Newton
+    """
+    if torre.condensador != 'Parcial':
+        raise ValueError('El metodo de Naphtali-Sandholm solo admite condensador parcial')
+
+    sistema = SistemaMESH(torre)
+    NC = sistema.NC
+    v, l, T = estimacion_inicial(torre)
+
+    iteraciones = 0
+    while True:
+        props = sistema.propiedades_platos(T)
+        residuos = sistema.residuos(v, l, T, props)
+        if np.abs(residuos).max() < tolerancia:
+            break
+        if iteraciones >= max_iteraciones:
+            raise RuntimeError(f'Naphtali-Sandholm no convergio en {max_iteraciones} '
+                               f'iteraciones')
+
+        paso = metodo_tomas_bloques(*sistema.jacobiano(v, l, T, props), -residuos)
+        delta_v, delta_l, delta_T = paso[:, :NC], paso[:, NC:2 * NC], paso[:, -1]
+
+        # Los flujos que se harian negativos se reducen de forma exponencial y el cambio de
+        # temperatura se limita
+        with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+            v = np.where(v + delta_v > 0, v + delta_v, v * np.exp(delta_v / v))
+            l = np.where(l + delta_l > 0, l + delta_l, l * np.exp(delta_l / l))
+        T = T + np.clip(delta_T, -PASO_MAXIMO_TEMPERATURA, PASO_MAXIMO_TEMPERATURA)
+        iteraciones += 1
+
+    V, L = v.sum(axis=1), l.sum(axis=1)
+    return torre.resultado(V, L, T, l / L[:, np.newaxis], v / V[:, np.newaxis], iteraciones)
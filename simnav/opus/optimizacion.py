@@ -0,0 +1,264 @@
+"""
+Optimización del plato de alimentación, el reflujo y el destilado de una torre de
+destilación con condensador parcial. Se busca el diseño de menor calor del rehervidor que
+cumple las especificaciones de pureza de los productos:
+
+    Reflujo:     para un plato de alimentación y un destilado dados el calor del rehervidor
+                 crece con el reflujo, por lo que el optimo es el reflujo minimo que cumple las
+                 especificaciones. Se acota y se obtiene con el metodo de Brent sobre el margen
+                 de las especificaciones (ver margen_especificaciones)
+    Destilado:   opcionalmente, para cada plato se minimiza el calor del reflujo minimo en un
+                 intervalo de destilados con la busqueda acotada de Brent
+    Alimentación: cada plato candidato se evalua por separado, en paralelo en un
+                 ProcessPoolExecutor, y se escoge el de menor calor
+
+Cada simulación parte del resultado convergido mas cercano (ver EvaluadorTorre) y todas se
+registran en el historial. Las especificaciones son tuplas (producto, compuesto, fraccion)
+donde producto es 'destilado' o 'fondo', compuesto el indice del compuesto y fraccion la
+fracción molar minima en ese producto.
+"""
+
+import os
+
+import numpy as np
+
+from simnav.barrido import plantilla_torre, crear_torre
+
+# Margen de las simulaciones que no convergen. Ninguna fracción molar puede alcanzarlo
+MARGEN_NO_CONVERGIDO = -1.0
+
+
+def margen_especificaciones(resultado, especificaciones):
+    """
+    Menor diferencia entre la fracción molar obtenida y la especificada. Es positiva o cero
+    si se cumplen todas las especificaciones
+    :param resultado: diccionario de DestilacionSemiRigurosa.simular
+    :param especificaciones: lista de tuplas (producto, compuesto, fraccion)
+    """
+    productos = {'destilado': resultado['fraccion_vapor'][0],
+                 'fondo': resultado['fraccion_liquido'][-1]}
+    return min(productos[producto][compuesto] - fraccion
+               for producto, compuesto, fraccion in especificaciones)
+
+
+class EvaluadorTorre:
+    """
+    Simula una torre para distintos valores del plato de alimentación principal, el reflujo
+    y el destilado. Cada simulación parte del resultado convergido mas cercano y se registra
+    en el historial. Las simulaciones con los mismos valores no se repiten.
+    """
+
+    def __init__(self, torre, especificaciones):
+        """
+        :param torre: instancia de DestilacionSemiRigurosa. Su plato de alimentación, reflujo,
+        destilado y estado inicial se modifican en cada evaluación
+        :param especificaciones: lista de tuplas (producto, compuesto, fraccion)
+        """
+        self.torre = torre
+        self.especificaciones = especificaciones
+        self.historial = []  # Un diccionario por simulación
+        self._resultados = {}  # (plato, reflujo, destilado): resultado o None
+
+    def evaluar(self, plato_alimentacion, reflujo, destilado):
+        """
+        :return: una tupla (resultado, registro). resultado es None si la simulación no
+        converge. registro es el diccionario agregado al historial con plato_alimentacion,
+        reflujo, destilado, convergido, calor_rehervidor, margen, contador_ciclo_vapor,
+        contador_ciclo_temperatura y error
+        """
+        llave = (int(plato_alimentacion), float(reflujo), float(destilado))
+        if llave in self._resultados:
+            return self._resultados[llave], self._registro(llave)
+
+        torre = self.torre
+        torre.alimentaciones[0][0], torre.reflujo, torre.destilado = llave
+        torre.estado_inicial = self._estado_cercano(llave)
+        error = ''
+        try:
+            resultado = torre.simular()
+        except (RuntimeError, ValueError, ArithmeticError, np.linalg.LinAlgError) as excepcion:
+            resultado, error = None, f'{type(excepcion).__name__}: {excepcion}'
+
+        registro = dict(zip(('plato_alimentacion', 'reflujo', 'destilado'), llave))
+        registro.update(convergido=resultado is not None, error=error)
+        if resultado is not None:
+            registro.update(calor_rehervidor=resultado['calor'][-1],
+                            margen=margen_especificaciones(resultado, self.especificaciones),
+                            contador_ciclo_vapor=resultado['contador_ciclo_vapor'],
+                            contador_ciclo_temperatura=resultado['contador_ciclo_temperatura'])
+        else:
+            registro.update(calor_rehervidor=np.nan, margen=MARGEN_NO_CONVERGIDO,
+                            contador_ciclo_vapor=0, contador_ciclo_temperatura=0)
+        self._resultados[llave] = resultado
+        self.historial.append(registro)
+        return resultado, registro
+
+    def _registro(self, llave):
+        for registro in reversed(self.historial):
+            if (registro['plato_alimentacion'], registro['reflujo'],
+                    registro['destilado']) == llave:
+                return registro
+
+    def _estado_cercano(self, llave):
+        """Resultado convergido con los valores relativos mas cercanos a los de la llave"""
+        convergidos = [(otra, resultado) for otra, resultado in self._resultados.items()
+                       if resultado is not None]
+        if not convergidos:
+            return self.torre.estado_inicial
+
+        def distancia(elemento):
+            otra = elemento[0]
+            return (abs(otra[0] - llave[0]) + abs(np.log(otra[1] / llave[1]))
+                    + abs(np.log(otra[2] / llave[2])))
+
+        return min(convergidos, key=distancia)[1]
+
+
+def buscar_reflujo_minimo(evaluador, plato_alimentacion, destilado, reflujo_inicial,
+                          limites_reflujo=(0.05, 50), tolerancia=1e-4):
+    """
+    Reflujo minimo que cumple las especificaciones del evaluador para el plato de
+    alimentación y el destilado dados. El margen de las especificaciones se supone creciente
+    con el reflujo: se acota partiendo de reflujo_inicial, duplicando o dividiendo a la mitad,
+    y la raiz se obtiene con el metodo de Brent
+    :param limites_reflujo: reflujos minimo y maximo considerados
+    :param tolerancia: tolerancia relativa del reflujo
+    :return: una tupla (reflujo, resultado), o (None, None) si las especificaciones no se
+    cumplen con el reflujo maximo
+    """
+    from scipy.optimize import brentq
+
+    def margen(reflujo):
+        return evaluador.evaluar(plato_alimentacion, reflujo, destilado)[1]['margen']
+
+    inferior, superior = limites_reflujo
+    reflujo = float(np.clip(reflujo_inicial, inferior, superior))
+    if margen(reflujo) >= 0:
+        factible = reflujo
+        while factible > inferior:
+            reflujo = max(factible / 2, inferior)
+            if margen(reflujo) < 0:
+                break
+            factible = reflujo
+        else:
+            return factible, evaluador.evaluar(plato_alimentacion, factible, destilado)[0]
+        infactible = reflujo
+    else:
+        infactible = reflujo
+        while True:
+            if infactible >= superior:
+                return None, None
+            reflujo = min(2 * infactible, superior)
+            if margen(reflujo) >= 0:
+                break
+            infactible = reflujo
+        factible = reflujo
+
+    brentq(margen, infactible, factible, xtol=tolerancia * factible,
+           rtol=max(tolerancia, 4 * np.finfo(float).eps))
+    # La raiz puede quedar del lado infactible. Se toma el menor reflujo factible evaluado,
+    # que esta a menos de la tolerancia de la raiz
+    reflujo = min(registro['reflujo'] for registro in evaluador.historial
+                  if registro['plato_alimentacion'] == plato_alimentacion
+                  and registro['destilado'] == destilado and registro['margen'] >= 0)
+    return reflujo, evaluador.evaluar(plato_alimentacion, reflujo, destilado)[0]
+
+
+def optimizar_plato(plantilla, plato_alimentacion, especificaciones, limites_reflujo,
+                    limites_destilado=None, tolerancia=1e-4, estado_inicial=None):
+    """
+    Diseño de menor calor del rehervidor para un plato de alimentación
+    :param plantilla: plantilla de la torre (ver simnav.barrido.plantilla_torre)
+    :param limites_destilado: intervalo de destilados a explorar. Si es None se usa el
+    destilado de la plantilla
+    :param estado_inicial: resultado convergido desde el que parte la primera simulación
+    :return: una tupla (mejor, historial). mejor es un diccionario con plato_alimentacion,
+    reflujo, destilado, calor_rehervidor y resultado, o None si ningun diseño cumple las
+    especificaciones
+    """
+    torre = crear_torre(plantilla, {'plato_alimentacion': plato_alimentacion})
+    # El reflujo y el destilado son las variables de la optimización
+    torre.especificacion = None
+    torre.estado_inicial = estado_inicial
+    evaluador = EvaluadorTorre(torre, especificaciones)
+    reflujo_inicial = plantilla['destilacion']['reflujo']
+    disenos = {}
+
+    def calor(destilado):
+        nonlocal reflujo_inicial
+        destilado = float(destilado)
+        reflujo, resultado = buscar_reflujo_minimo(evaluador, plato_alimentacion, destilado,
+                                                   reflujo_inicial, limites_reflujo,
+                                                   tolerancia)
+        if resultado is None:
+            return np.inf
+        # El reflujo minimo del destilado siguiente suele estar cerca
+        reflujo_inicial = reflujo
+        disenos[destilado] = dict(plato_alimentacion=plato_alimentacion, reflujo=reflujo,
+                                  destilado=destilado, calor_rehervidor=resultado['calor'][-1],
+                                  resultado=resultado)
+        return resultado['calor'][-1]
+
+    if limites_destilado is None:
+        calor(float(plantilla['destilacion']['destilado']))
+    else:
+        from scipy.optimize import minimize_scalar
+        minimize_scalar(calor, bounds=limites_destilado, method='bounded',
+                        options=dict(xatol=tolerancia * max(limites_destilado)))
+    mejor = min(disenos.values(), key=lambda diseno: diseno['calor_rehervidor'],
+                default=None)
+    return mejor, evaluador.historial
+
+
+def optimizar_torre(torre, especificaciones, platos=None, limites_reflujo=(0.05, 50),
+                    limites_destilado=None, procesos=None, tolerancia=1e-4):
+    """
+    Plato de alimentación, reflujo y, opcionalmente, destilado de menor calor del rehervidor
+    que cumplen las especificaciones (ver el docstring del modulo). Solo se mueve la primera
+    alimentación de la torre
+    :param torre: instancia de DestilacionSemiRigurosa con el caso base. No se modifica. Su
+    reflujo es el punto de partida de la busqueda
+    :param especificaciones: lista de tuplas (producto, compuesto, fraccion)
+    :param platos: platos de alimentación candidatos. Por defecto todos entre el segundo y
+    el penultimo
+    :param limites_reflujo: reflujos minimo y maximo considerados
+    :param limites_destilado: intervalo (minimo, maximo) de destilados a explorar. Si es None
+    el destilado de la torre queda fijo
+    :param procesos: numero de procesos para evaluar los platos candidatos. Con 1 se evaluan
+    en orden en el proceso actual y cada plato parte del optimo del anterior
+    :param tolerancia: tolerancia relativa del reflujo y del destilado
+    :return: diccionario con plato_alimentacion, reflujo, destilado, calor_rehervidor y
+    resultado del mejor diseño (None si ninguno cumple las especificaciones), candidatos (el
+    mejor diseño de cada plato, None si no tiene) e historial (todas las simulaciones en el
+    orden de los platos)
+    """
+    if platos is None:
+        platos = range(2, torre.numero_platos)
+    platos = [int(plato) for plato in platos]
+    plantilla = plantilla_torre(torre)
+    argumentos = (especificaciones, limites_reflujo, limites_destilado, tolerancia)
+
+    if procesos == 1:
+        salidas = []
+        estado = torre.estado_inicial
+        for plato in platos:
+            salidas.append(optimizar_plato(plantilla, plato, *argumentos, estado))
+            if salidas[-1][0] is not None:
+                estado = salidas[-1][0]['resultado']
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(min(procesos or os.cpu_count() or 1, len(platos))) as ejecutor:
+            futuros = [ejecutor.submit(optimizar_plato, plantilla, plato, *argumentos,
+                                       torre.estado_inicial) for plato in platos]
+            salidas = [futuro.result() for futuro in futuros]
+
+    candidatos = [mejor for mejor, _ in salidas]
+    factibles = [mejor for mejor in candidatos if mejor is not None]
+    mejor = min(factibles, key=lambda diseno: diseno['calor_rehervidor'], default=None)
+    optimo = dict.fromkeys(('plato_alimentacion', 'reflujo', 'destilado', 'calor_rehervidor',
+                            'resultado'))
+    if mejor is not None:
+        optimo.update(mejor)
+    optimo['candidatos'] = candidatos
+    optimo['historial'] = [registro for _, historial in salidas for registro in historial]
+    return optimo
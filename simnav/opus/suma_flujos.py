@@ -0,0 +1,160 @@
+"""
+Metodo de suma de flujos (sum-rates, Burningham-Otto) para torres de destilación con
+compuestos de volatilidades muy distintas.
+
+Las variables de corte son las temperaturas y los flujos de liquido de los platos. Para
+unos valores de estas variables los flujos de vapor salen del balance global de materia y
+los flujos de liquido de cada compuesto de los balances de materia por compuesto de la
+torre (DestilacionSemiRigurosa.balance_materia, un sistema tridiagonal por compuesto). Las
+ecuaciones que deben cumplirse son:
+
+    Suma de flujos: Σ l[j] - L[j] = 0 en los platos interiores
+    Energia:        L[j-1]·hL[j-1] + V[j+1]·hV[j+1] + F[j]·hF[j] - L[j]·hL[j]
+                    - V[j]·hV[j] = 0 en los platos interiores
+    Burbuja:        ln Σ K[j]·x[j] = 0 en el condensador y el rehervidor, cuyos calores no
+                    estan especificados
+
+La sustitución sucesiva de Burningham-Otto (flujos por suma de flujos y temperaturas con
+los balances de energia por separado) diverge en torres con condensador y rehervidor, por
+lo que las variables de corte se corrigen de forma simultanea con el metodo de Newton y un
+jacobiano de diferencias finitas. El sistema tiene solo 2·N - 2 variables sin importar el
+numero de compuestos.
+"""
+
+import numpy as np
+
+from .destilacion import registrar_metodo
+from .inicializacion import estimacion_inicial
+
+# Cambio maximo de temperatura por iteración (K)
+PASO_MAXIMO_TEMPERATURA = 20
+
+
+class SistemaSumaFlujos:
+    """Ecuaciones del metodo de suma de flujos en función de las variables de corte"""
+
+    def __init__(self, torre):
+        self.torre = torre
+        self.propiedades, self.presion = torre.propiedades, torre.presion
+        self.N, D = torre.numero_platos, torre.destilado
+        self.F, self.zF, self.hF = torre.alimentacion()
+        self.sum_materia = np.cumsum(self.F) - D
+        self.reflujo = torre.reflujo * D
+
+        self.escala_flujo = self.F.sum()
+        self.escala_energia = self.escala_flujo * np.mean(
+            self.propiedades.entalpia_vaporizacion())
+
+    def flujos(self, L_interior):
+        """Flujos de liquido y vapor de todos los platos a partir de los flujos de liquido
+        de los platos interiores"""
+        L = np.concatenate(([self.reflujo], L_interior, [self.sum_materia[-1]]))
+        V = np.append(self.torre.destilado, L[:-1] - self.sum_materia[:-1])
+        return L, V
+
+    def perfil(self, T, L_interior):
+        """Flujos totales, flujos de liquido por compuesto y coeficientes de reparto"""
+        L, V = self.flujos(L_interior)
+        K = self.propiedades.coeficiente_reparto(T, self.presion)
+        # Balances de materia por compuesto de la torre. Como V sale del balance global de
+        # materia, el flujo de liquido de cada plato es L y l = L·x
+        l = self.torre.balance_materia(V, K, self.F, self.zF) * L[:, np.newaxis]
+        return L, V, l, K
+
+    def residuos(self, variables):
+        """
+        Retorna los residuos escalados de las ecuaciones de energia o burbuja (N) y de suma
+        de flujos (N - 2)
+        :param variables: temperaturas de todos los platos seguidas de los flujos de
+        liquido de los platos interiores
+        """
+        N = self.N
+        T, L_interior = variables[:N], variables[N:]
+        L, V, l, K = self.perfil(T, L_interior)
+        x = l / l.sum(axis=1, keepdims=True)
+        y = K * x
+        suma_y = y.sum(axis=1)
+        y = y / suma_y[:, np.newaxis]
+
+        hL = self.propiedades.entalpia_liquido(composicion=x, temperatura=T)
+        hV = self.propiedades.entalpia_vapor(composicion=y, temperatura=T)
+        energia = (np.append(0, L[:-1] * hL[:-1]) + np.append(V[1:] * hV[1:], 0)
+                   + self.F * self.hF - L * hL - V * hV) / self.escala_energia
+        energia[[0, -1]] = np.log(suma_y[[0, -1]])
+        suma_flujos = (l[1:-1].sum(axis=1) - L_interior) / self.escala_flujo
+        return np.concatenate((energia, suma_flujos))
+
+    def factible(self, variables):
+        """Indica si todos los flujos de liquido y vapor son positivos"""
+        L, V = self.flujos(variables[self.N:])
+        return (L > 0).all() and (V > 0).all()
+
+    def avanzar(self, variables, paso, norma, reducciones=10):
+        """
+        Aplica el paso de Newton. El paso se reduce a la mitad hasta que todos los flujos
+        sean positivos y los residuos disminuyan
+        :raises RuntimeError: si ninguna de las reducciones es aceptada
+        """
+        fraccion = 1
+        for _ in range(reducciones):
+            nuevas = variables + fraccion * paso
+            if self.factible(nuevas):
+                with np.errstate(all='ignore'):
+                    nueva_norma = np.linalg.norm(self.residuos(nuevas))
+                if nueva_norma < norma:
+                    return nuevas
+            fraccion /= 2
+        raise RuntimeError(f'Suma de flujos: el paso de Newton no reduce los residuos con '
+                           f'flujos positivos luego de {reducciones} reducciones')
+
+    def jacobiano(self, variables, residuos):
+        """Jacobiano de los residuos por diferencias finitas hacia adelante"""
+        jacobiano = np.empty((residuos.size, variables.size))
+        for k in range(variables.size):
+            paso = 1e-7 * max(abs(variables[k]), 1)
+            perturbadas = variables.copy()
+            perturbadas[k] += paso
+            jacobiano[:, k] = (self.residuos(perturbadas) - residuos) / paso
+        return jacobiano
+
+
+@registrar_metodo('suma_flujos')
+def simular_suma_flujos(torre, tolerancia=1e-9, max_iteraciones=50):
+    """
+    Resuelve la torre con el metodo de suma de flujos
+    :param torre: instancia de DestilacionSemiRigurosa
+    :param tolerancia: valor maximo de los residuos escalados para la convergencia
+    :param max_iteraciones: numero maximo de iteraciones de Newton
+    :return: el mismo diccionario de DestilacionSemiRigurosa.simular. contador_ciclo_vapor
+    contiene el numero de iteraciones de Newton
+    """
+    if torre.condensador != 'Parcial':
+        raise ValueError('El metodo de suma de flujos solo admite condensador parcial')
+
+    sistema = SistemaSumaFlujos(torre)
+    N = sistema.N
+    _, l, T = estimacion_inicial(torre)
+    variables = np.concatenate((T, l[1:-1].sum(axis=1)))
+
+    iteraciones = 0
+    while True:
+        residuos = sistema.residuos(variables)
+        if np.abs(residuos).max() < tolerancia:
+            break
+        if iteraciones >= max_iteraciones:
+            raise RuntimeError(f'Suma de flujos no convergio en {max_iteraciones} '
+                               f'iteraciones')
+
+        paso = np.linalg.solve(sistema.jacobiano(variables, residuos), -residuos)
+        # El paso completo se escala para no cambiar su dirección
+        paso *= min(1, PASO_MAXIMO_TEMPERATURA / np.abs(paso[:N]).max())
+
+        variables = sistema.avanzar(variables, paso, np.linalg.norm(residuos))
+        iteraciones += 1
+
+    T = variables[:N]
+    L, V, l, K = sistema.perfil(T, variables[N:])
+    x = l / l.sum(axis=1, keepdims=True)
+    y = K * x
+    y = y / y.sum(axis=1, keepdims=True)
+    return torre.resultado(V, L, T, x, y, iteraciones)
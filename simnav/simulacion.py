@@ -1,12 +1,11 @@
 """Interfaz de alto nivel con el simulador"""
 import logging
 
-import yaml
 import csv
 
 from simnav.corrientes import CorrienteMateria
 from simnav.termodinamica import GestorPaquetes
-from simnav.datos.db import Componentes, session
+from simnav.datos import compuestos_disponibles
 from simnav.opus.destilacion import DestilacionSemiRigurosa
 
 
@@ -20,6 +19,7 @@ class Simulacion:
         self.compuestos = []
         self.corrientes = []
         self.resultados = None
+        self._compuestos_resultados = None  # Compuestos con los que se obtuvo resultados
         self._paquete_propiedades = GestorPaquetes(self.compuestos)
         self.destilacion = DestilacionSemiRigurosa(
             paquete_termodinamico=self.paquete_propiedades)
@@ -33,8 +33,9 @@ class Simulacion:
         :return:
         """
         self.logger.info("cargando datos de simulación")
+        import yaml
         with open(direccion_archivo_simulacion, 'r') as datos_yaml:
-            datos = yaml.load(datos_yaml)
+            datos = yaml.safe_load(datos_yaml)
 
         # Cargando compuestos
         for compuesto in datos['compuestos']:
@@ -74,7 +75,7 @@ class Simulacion:
     def lista_compuestos(self):
         """Retorna la lista de compuestos disponibles en la base de datos"""
         self.logger.debug('Lista de compuestos a sido requerida')
-        return [compuesto for compuesto in session.query(Componentes).all()]
+        return list(compuestos_disponibles())
 
     def crear_corriente(self, nombre, flujo=None, temperatura=None, composicion=None,
                         presion=None):
@@ -85,14 +86,27 @@ class Simulacion:
             CorrienteMateria(nombre, self.compuestos, self.paquete_propiedades, flujo,
                              temperatura, composicion, presion))
 
-    def simular(self):
-        """Corre la simulación de la columna de destilacion"""
+    def simular(self, arranque_en_caliente=False, exportar=True):
+        """
+        Corre la simulación de la columna de destilacion
+        :param arranque_en_caliente: si es verdadero y hay resultados anteriores con los
+        mismos compuestos, la torre parte de ese perfil. Por defecto cada simulación parte de
+        los valores iniciales de la torre, por lo que el resultado no depende de las
+        simulaciones anteriores
+        :param exportar: si es verdadero los resultados se escriben en resultados.csv
+        """
         for corriente in self.corrientes:
             corriente.actualizar()
 
         self.paquete_propiedades.preparar()
+        if arranque_en_caliente and self._compuestos_resultados == self.compuestos:
+            self.destilacion.estado_inicial = self.resultados
+        else:
+            self.destilacion.estado_inicial = None
         self.resultados = self.destilacion.simular()
-        self.exportar()
+        self._compuestos_resultados = list(self.compuestos)
+        if exportar:
+            self.exportar()
 
     def exportar(self):
         """Exporta los resultados de la simulación"""
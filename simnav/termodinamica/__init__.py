@@ -1,3 +1,4 @@
-from . import ideal
+from . import ideal, flash
 from .paquetes import PaqueteIdeal
+from .nucleo import NucleoIdeal
 from .gestor import GestorPaquetes
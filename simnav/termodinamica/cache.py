@@ -0,0 +1,117 @@
+"""Cache de propiedades termodinamicas con desalojo LRU"""
+
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+
+
+class CacheTermodinamico:
+    """
+    Guarda resultados de propiedades termodinamicas indexados por el nombre de la propiedad y
+    sus argumentos cuantizados (redondeados a un numero fijo de decimales). Cuando se alcanza
+    el tamaño maximo se desaloja la entrada usada hace mas tiempo. Puede compartirse entre
+    hilos: los datos y los contadores se modifican bajo un candado.
+    """
+
+    def __init__(self, tamano_maximo=256, decimales=10):
+        """
+        :param tamano_maximo: numero maximo de resultados guardados
+        :param decimales: decimales a los que se redondean los argumentos para formar la llave
+        """
+        self.tamano_maximo = tamano_maximo
+        self.decimales = decimales
+        self.firma = None  # Identifica el estado del paquete para el que los datos son validos
+        self._datos = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self._candado = threading.Lock()
+
+    def llave(self, nombre, args, kwargs):
+        """Retorna la llave correspondiente a la propiedad y argumentos dados"""
+        return (nombre,
+                tuple(self._cuantizar(arg) for arg in args),
+                tuple((llave, self._cuantizar(valor)) for llave, valor in sorted(kwargs.items())))
+
+    def _cuantizar(self, valor):
+        if valor is None or isinstance(valor, (str, bool)):
+            return valor
+        # Se suma 0.0 para que -0.0 y 0.0 generen la misma llave
+        array = np.round(np.asarray(valor, dtype=float), self.decimales) + 0.0
+        return array.shape, array.tobytes()
+
+    def obtener(self, llave):
+        """Retorna una copia del valor guardado o None si la llave no existe"""
+        with self._candado:
+            try:
+                valor = self._datos[llave]
+            except KeyError:
+                self.fallos += 1
+                return None
+            self._datos.move_to_end(llave)
+            self.aciertos += 1
+        return valor.copy() if isinstance(valor, np.ndarray) else valor
+
+    def guardar(self, llave, valor):
+        """Guarda una copia del valor desalojando la entrada mas antigua si es necesario"""
+        valor = valor.copy() if isinstance(valor, np.ndarray) else valor
+        with self._candado:
+            self._datos[llave] = valor
+            self._datos.move_to_end(llave)
+            while len(self._datos) > self.tamano_maximo:
+                self._datos.popitem(last=False)
+                self.desalojos += 1
+
+    def validar(self, firma):
+        """Vacia el cache si la firma del paquete ha cambiado desde el ultimo uso"""
+        with self._candado:
+            if firma != self.firma:
+                self._datos.clear()
+                self.firma = firma
+
+    def limpiar(self):
+        """Elimina todos los resultados guardados"""
+        with self._candado:
+            self._datos.clear()
+            self.firma = None
+
+    def estadisticas(self):
+        """Retorna un diccionario con las estadisticas de uso del cache"""
+        with self._candado:
+            aciertos, fallos = self.aciertos, self.fallos
+            desalojos, entradas = self.desalojos, len(self._datos)
+        consultas = aciertos + fallos
+        return {
+            'aciertos': aciertos,
+            'fallos': fallos,
+            'tasa_aciertos': aciertos / consultas if consultas else 0.0,
+            'desalojos': desalojos,
+            'entradas': entradas,
+            'tamano_maximo': self.tamano_maximo,
+        }
+
+    def __len__(self):
+        return len(self._datos)
+
+
+def memorizar(metodo):
+    """Guarda los resultados del metodo del paquete en su cache. El paquete debe proveer los
+    atributos cache (CacheTermodinamico o None para desactivarlo) y firma_cache"""
+
+    @wraps(metodo)
+    def envoltura(paquete, *args, **kwargs):
+        cache = paquete.cache
+        if cache is None:
+            return metodo(paquete, *args, **kwargs)
+
+        cache.validar(paquete.firma_cache)
+        llave = cache.llave(metodo.__name__, args, kwargs)
+        resultado = cache.obtener(llave)
+        if resultado is None:
+            resultado = metodo(paquete, *args, **kwargs)
+            cache.guardar(llave, resultado)
+        return resultado
+
+    return envoltura
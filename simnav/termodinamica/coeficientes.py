@@ -0,0 +1,113 @@
+"""Coeficientes de las correlaciones de propiedades empaquetados como arrays de numpy"""
+
+import numpy as np
+
+COLUMNAS_C5 = ('C1', 'C2', 'C3', 'C4', 'C5')
+COLUMNAS_RANGO = ('TminK', 'TmaxK')
+
+
+def empaquetar(registros, columnas, relleno=np.nan):
+    """
+    Convierte las filas de una tabla de la base de datos en un array (compuestos × columnas)
+    :param registros: array estructurado con los parametros de cada compuesto
+    (GestorParametros), el campo disponible indica si el compuesto posee parametros
+    :param columnas: nombre de los campos a tomar de cada fila
+    :param relleno: valor a usar cuando el compuesto no posee parametros en la tabla
+    :return: array de numpy contiguo de tipo float
+    """
+    matriz = np.column_stack([registros[columna] for columna in columnas]).astype(float)
+    matriz[~registros['disponible']] = relleno
+    return matriz
+
+
+class CoeficientesIdeal:
+    """Coeficientes utilizados por el paquete ideal. Cada atributo es un array cuya primera
+    dimension corresponde al orden de los compuestos de la simulacion, lo que permite
+    evaluar las correlaciones para todos los compuestos con una sola operación de numpy"""
+
+    # Atributos en el orden en que se guardan en un buffer contiguo (ver a_buffer) y su numero
+    # de columnas. None para los arrays de una dimension
+    campos = (('temperaturas_criticas', None),
+              ('antoine', 5),
+              ('calor_vaporizacion', 4),
+              ('cp_liquido', 5),
+              ('ecuacion_cp_liquido', None),
+              ('cp_gas_polinomial', 5),
+              ('temperaturas_cambio_cp_gas', None),
+              ('cp_gas_hiperbolico', 5),
+              ('rango_antoine', 2),
+              ('rango_cp_liquido', 2),
+              ('rango_cp_gas_hiperbolico', 2))
+
+    def __init__(self, parametros):
+        """
+        :param parametros: gestor de parametros (GestorParametros) de los compuestos
+        """
+        self.temperaturas_criticas = np.array(parametros.temperaturas_criticas(), dtype=float)
+
+        # Presion de vapor (ecuación de antoine extendida) y calor de vaporización
+        antoine = parametros.antoine()
+        self.antoine = empaquetar(antoine, COLUMNAS_C5)
+        self.calor_vaporizacion = empaquetar(parametros.calor_vaporizacion(), COLUMNAS_C5[:4])
+
+        # Capacidad calorifica del liquido. Ecuacion 1 (polinomial) o 2 (funcion de Tr)
+        cp_liquido = parametros.cp_liquido()
+        self.cp_liquido = empaquetar(cp_liquido, COLUMNAS_C5)
+        self.ecuacion_cp_liquido = np.array([int(ecuacion or 0)
+                                             for ecuacion in cp_liquido['Ecuacion']])
+
+        # Capacidad calorifica del gas. Solo algunos compuestos poseen la ecuación polinomial,
+        # para el resto se usan coeficientes nulos y temperatura de cambio cero, de forma que
+        # siempre se use la ecuación hiperbolica.
+        cp_gas_polinomial = parametros.cp_gas_polinomial()
+        self.cp_gas_polinomial = empaquetar(cp_gas_polinomial, COLUMNAS_C5, relleno=0)
+        self.temperaturas_cambio_cp_gas = empaquetar(cp_gas_polinomial, ('TmaxK',),
+                                                     relleno=0)[:, 0]
+        cp_gas_hiperbolico = parametros.cp_gas_hiperbolico()
+        self.cp_gas_hiperbolico = empaquetar(cp_gas_hiperbolico, COLUMNAS_C5)
+
+        # Rangos de validez de las correlaciones [Tmin, Tmax] (K)
+        self.rango_antoine = empaquetar(antoine, COLUMNAS_RANGO)
+        self.rango_cp_liquido = empaquetar(cp_liquido, COLUMNAS_RANGO)
+        self.rango_cp_gas_hiperbolico = empaquetar(cp_gas_hiperbolico, COLUMNAS_RANGO)
+
+    @classmethod
+    def tamano_buffer(cls, numero_compuestos):
+        """Numero de elementos del buffer con los coeficientes de los compuestos"""
+        return numero_compuestos * sum(columnas or 1 for _, columnas in cls.campos)
+
+    @classmethod
+    def _formas(cls, numero_compuestos):
+        """Genera el nombre, la forma y la posicion en el buffer de cada atributo"""
+        inicio = 0
+        for nombre, columnas in cls.campos:
+            forma = (numero_compuestos,) if columnas is None else (numero_compuestos, columnas)
+            fin = inicio + numero_compuestos * (columnas or 1)
+            yield nombre, forma, slice(inicio, fin)
+            inicio = fin
+
+    def a_buffer(self, buffer=None):
+        """
+        Copia todos los coeficientes en un buffer float contiguo de una dimension
+        :param buffer: array donde se copian los coeficientes, si no se provee se crea uno
+        :return: el buffer
+        """
+        numero_compuestos = self.temperaturas_criticas.size
+        if buffer is None:
+            buffer = np.empty(self.tamano_buffer(numero_compuestos))
+        for nombre, forma, posicion in self._formas(numero_compuestos):
+            buffer[posicion] = np.ravel(getattr(self, nombre))
+        return buffer
+
+    @classmethod
+    def desde_buffer(cls, buffer, numero_compuestos):
+        """
+        Crea los coeficientes a partir de un buffer creado con a_buffer. Los atributos son
+        vistas de solo lectura del buffer, por lo que los datos no se copian
+        """
+        coeficientes = cls.__new__(cls)
+        for nombre, forma, posicion in cls._formas(numero_compuestos):
+            vista = buffer[posicion].reshape(forma)
+            vista.flags.writeable = False
+            setattr(coeficientes, nombre, vista)
+        return coeficientes
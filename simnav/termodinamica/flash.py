@@ -0,0 +1,231 @@
+"""Calculos de equilibrio liquido-vapor (flash) vectorizados. Cada fila de composición es
+una alimentación independiente, por lo que miles de corrientes se resuelven en una sola
+llamada"""
+
+import numpy as np
+
+from simnav.metodos_matematicos import newton_vectorizado, newton_acotado_vectorizado
+
+
+def rachford_rice(composicion, K, retornar_iteraciones=False):
+    """
+    Resuelve la ecuación de Rachford-Rice Σ z(K-1)/(1+β(K-1)) = 0 para la calidad del vapor β
+    de cada fila. Las filas que no son bifasicas se identifican antes de iterar (Σ z·K <= 1
+    liquido, Σ z/K <= 1 vapor) y reciben β = 0 o β = 1. Para las filas bifasicas la función es
+    monotona decreciente en [0, 1] y cambia de signo en el intervalo, por lo que el hibrido
+    Newton-bisección converge siempre.
+
+    :param composicion: composición global de cada alimentación (filas)
+    :param K: coeficientes de reparto de cada alimentación
+    :param retornar_iteraciones: si es verdadero se retornan tambien las iteraciones por fila
+    :return: la calidad del vapor (fracción vaporizada) de cada fila
+    """
+    composicion = np.asarray(composicion, dtype=float)
+    K = np.asarray(K, dtype=float)
+    es_1d = composicion.ndim == 1 and K.ndim == 1
+    composicion, K = np.broadcast_arrays(np.atleast_2d(composicion), np.atleast_2d(K))
+
+    calidad = np.zeros(composicion.shape[0])
+    iteraciones = np.zeros(composicion.shape[0], dtype=int)
+    calidad[np.sum(composicion / K, axis=1) <= 1] = 1
+    bifasicos = np.flatnonzero((np.sum(composicion * K, axis=1) > 1)
+                               & (np.sum(composicion / K, axis=1) > 1))
+
+    if bifasicos.size:
+        z, K_menos_1 = composicion[bifasicos], K[bifasicos] - 1
+
+        def funcion(beta, activos):
+            denominador = 1 + beta[:, np.newaxis] * K_menos_1[activos]
+            terminos = z[activos] * K_menos_1[activos] / denominador
+            return (np.sum(terminos, axis=1),
+                    -np.sum(terminos * K_menos_1[activos] / denominador, axis=1))
+
+        calidad[bifasicos], iteraciones[bifasicos] = newton_acotado_vectorizado(
+            funcion, np.zeros(bifasicos.size), np.ones(bifasicos.size))
+
+    if es_1d:
+        calidad, iteraciones = calidad[0], iteraciones[0]
+    if retornar_iteraciones:
+        return calidad, iteraciones
+    return calidad
+
+
+def composiciones_fases(composicion, K, calidad_vapor):
+    """
+    Retorna la composición de la fase liquida y de la fase vapor a partir de la composición
+    global y la calidad del vapor. Para filas de una sola fase se retorna la composición de la
+    fase incipiente.
+    """
+    calidad_vapor = np.asarray(calidad_vapor, dtype=float)
+    if calidad_vapor.ndim == 1:
+        calidad_vapor = calidad_vapor[:, np.newaxis]
+    x = composicion / (1 + calidad_vapor * (K - 1))
+    y = K * x
+    return (x / np.sum(x, axis=-1, keepdims=True),
+            y / np.sum(y, axis=-1, keepdims=True))
+
+
+def _preparar(composicion, variable, presion):
+    """Da a la composición, la variable especificada y la presión el mismo numero de filas"""
+    composicion = np.asarray(composicion, dtype=float)
+    variable = np.asarray(variable, dtype=float)
+    es_1d = composicion.ndim == 1 and variable.ndim == 0
+    filas = max(np.atleast_2d(composicion).shape[0], variable.size)
+    composicion = np.broadcast_to(np.atleast_2d(composicion),
+                                  (filas, composicion.shape[-1]))
+    variable = np.broadcast_to(np.ravel(variable), (filas,)).copy()
+    presion = np.broadcast_to(np.ravel(np.asarray(presion, dtype=float)), (filas,))
+    return composicion, variable, presion, es_1d
+
+
+def _resultado(paquete, composicion, temperatura, presion, es_1d, calidad_vapor=None):
+    """Arma el diccionario de resultados de un flash a T y P conocidas"""
+    K = paquete.coeficiente_reparto(temperatura, presion)
+    if calidad_vapor is None:
+        calidad_vapor = rachford_rice(composicion, K)
+    x, y = composiciones_fases(composicion, K, calidad_vapor)
+    entalpia = (calidad_vapor * paquete.entalpia_vapor(y, temperatura)
+                + (1 - calidad_vapor) * paquete.entalpia_liquido(x, temperatura))
+
+    resultado = {
+        'temperatura': temperatura,
+        'presion': presion,
+        'calidad_vapor': calidad_vapor,
+        'fraccion_liquido': x,
+        'fraccion_vapor': y,
+        'entalpia': entalpia,
+    }
+    if es_1d:
+        resultado = {llave: valor[0] for llave, valor in resultado.items()}
+    return resultado
+
+
+def flash_pt(paquete, composicion, temperatura, presion):
+    """
+    Flash isotermico. Determina la calidad del vapor, la composición de cada fase y la
+    entalpia de cada alimentación a la temperatura y presión dadas.
+    :param paquete: paquete termodinamico preparado
+    :param composicion: composición global (1d o una fila por alimentación)
+    :param temperatura: temperatura de cada alimentación (K)
+    :param presion: presión de cada alimentación (Pa)
+    :return: diccionario con temperatura, presion, calidad_vapor, fraccion_liquido,
+    fraccion_vapor y entalpia
+    """
+    composicion, temperatura, presion, es_1d = _preparar(composicion, temperatura, presion)
+    return _resultado(paquete, composicion, temperatura, presion, es_1d)
+
+
+def entalpia_equilibrio(paquete, composicion, temperatura, presion):
+    """
+    Entalpia de cada alimentación en equilibrio a T y P y su derivada respecto a la
+    temperatura. Escribiendo φ_i = βK_i/(1+β(K_i-1)) como la fracción del compuesto i que se
+    encuentra en el vapor, H = Σ z_i (h_L,i + φ_i (h_V,i - h_L,i)). La derivada incluye la
+    variación de β con la temperatura obtenida al derivar implicitamente Rachford-Rice.
+    :return: una tupla (entalpia, derivada, calidad_vapor)
+    """
+    K = paquete.coeficiente_reparto(temperatura, presion)
+    dK = paquete.derivada_coeficiente_reparto(temperatura, presion)
+    beta = rachford_rice(composicion, K)[:, np.newaxis]
+
+    h_liquido = paquete.entalpia_liquido_puro(temperatura)
+    h_vapor = paquete.entalpia_vapor_puro(temperatura)
+    cp_liquido = paquete.derivada_entalpia_liquido_puro(temperatura)
+    cp_vapor = paquete.derivada_entalpia_vapor_puro(temperatura)
+
+    denominador = 1 + beta * (K - 1)
+    phi = beta * K / denominador
+
+    # dβ/dT = -(∂g/∂T)/(∂g/∂β). Es cero fuera de la región bifasica
+    bifasico = (beta > 0) & (beta < 1)
+    dg_dbeta = -np.sum(composicion * (K - 1) ** 2 / denominador ** 2, axis=1, keepdims=True)
+    dg_dT = np.sum(composicion * dK / denominador ** 2, axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dbeta = np.where(bifasico, -dg_dT / dg_dbeta, 0)
+    dphi = (K * dbeta + beta * (1 - beta) * dK) / denominador ** 2
+
+    entalpia = np.sum(composicion * (h_liquido + phi * (h_vapor - h_liquido)), axis=1)
+    derivada = np.sum(composicion * (cp_liquido + phi * (cp_vapor - cp_liquido)
+                                     + dphi * (h_vapor - h_liquido)), axis=1)
+    return entalpia, derivada, beta[:, 0]
+
+
+def flash_ph(paquete, composicion, entalpia, presion):
+    """
+    Flash adiabatico. Determina la temperatura a la que cada alimentación tiene la entalpia
+    especificada. La temperatura de burbuja y de rocio dividen el problema en tres regiones;
+    en la región bifasica la raiz queda acotada por ambas temperaturas.
+    :param entalpia: entalpia especifica de cada alimentación (J/mol)
+    :return: diccionario de resultados igual al de flash_pt
+    """
+    composicion, entalpia, presion, es_1d = _preparar(composicion, entalpia, presion)
+    temperatura_burbuja = paquete.temperatura_burbuja(composicion, presion)
+    temperatura_rocio = paquete.temperatura_rocio(composicion, presion)
+    temperatura = np.empty_like(entalpia)
+
+    liquido = entalpia <= paquete.entalpia_liquido(composicion, temperatura_burbuja)
+    vapor = entalpia >= paquete.entalpia_vapor(composicion, temperatura_rocio)
+    bifasico = ~(liquido | vapor)
+
+    for region, entalpia_fase, derivada_fase, temperatura_inicial in (
+            (liquido, paquete.entalpia_liquido, paquete.derivada_entalpia_liquido,
+             temperatura_burbuja),
+            (vapor, paquete.entalpia_vapor, paquete.derivada_entalpia_vapor,
+             temperatura_rocio)):
+        indices = np.flatnonzero(region)
+        if indices.size:
+            def funcion(T, activos, indices=indices, entalpia_fase=entalpia_fase,
+                        derivada_fase=derivada_fase):
+                z = composicion[indices[activos]]
+                return (entalpia_fase(z, T) - entalpia[indices[activos]],
+                        derivada_fase(z, T))
+
+            temperatura[indices] = newton_vectorizado(funcion, temperatura_inicial[indices],
+                                                      paso_maximo=50)[0]
+
+    indices = np.flatnonzero(bifasico)
+    if indices.size:
+        def funcion(T, activos):
+            filas = indices[activos]
+            h, dh, _ = entalpia_equilibrio(paquete, composicion[filas], T, presion[filas])
+            return h - entalpia[filas], dh
+
+        temperatura[indices] = newton_acotado_vectorizado(funcion,
+                                                          temperatura_burbuja[indices],
+                                                          temperatura_rocio[indices])[0]
+
+    return _resultado(paquete, composicion, temperatura, presion, es_1d)
+
+
+def flash_pq(paquete, composicion, calidad_vapor, presion):
+    """
+    Flash a calidad de vapor especificada. Determina la temperatura a la que cada alimentación
+    tiene la fracción vaporizada dada (0 punto de burbuja, 1 punto de rocio).
+    :param calidad_vapor: calidad del vapor de cada alimentación entre 0 y 1
+    :return: diccionario de resultados igual al de flash_pt
+    """
+    composicion, calidad_vapor, presion, es_1d = _preparar(composicion, calidad_vapor, presion)
+    if np.any((calidad_vapor < 0) | (calidad_vapor > 1)):
+        raise ValueError('La calidad del vapor debe estar entre 0 y 1')
+
+    temperatura_burbuja = paquete.temperatura_burbuja(composicion, presion)
+    temperatura_rocio = paquete.temperatura_rocio(composicion, presion)
+    temperatura = np.where(calidad_vapor == 1, temperatura_rocio, temperatura_burbuja)
+
+    # Con β fija, Σ z(K-1)/(1+β(K-1)) es creciente con la temperatura y cambia de signo
+    # entre el punto de burbuja y el de rocio
+    indices = np.flatnonzero((calidad_vapor > 0) & (calidad_vapor < 1))
+    if indices.size:
+        def funcion(T, activos):
+            filas = indices[activos]
+            z, beta = composicion[filas], calidad_vapor[filas, np.newaxis]
+            K = paquete.coeficiente_reparto(T, presion[filas])
+            dK = paquete.derivada_coeficiente_reparto(T, presion[filas])
+            denominador = 1 + beta * (K - 1)
+            return (np.sum(z * (K - 1) / denominador, axis=1),
+                    np.sum(z * dK / denominador ** 2, axis=1))
+
+        temperatura[indices] = newton_acotado_vectorizado(funcion,
+                                                          temperatura_burbuja[indices],
+                                                          temperatura_rocio[indices])[0]
+
+    return _resultado(paquete, composicion, temperatura, presion, es_1d, calidad_vapor)
@@ -12,6 +12,7 @@ class GestorPaquetes:
     def __init__(self, compuestos):
         self.paquete = PaqueteIdeal(compuestos)
         self.compuestos = compuestos
+        self._configuracion_cache = None  # Se conserva al cambiar de paquete
 
     def seleccionar_paquete(self, nombre_paquete):
         """
@@ -25,6 +26,14 @@ class GestorPaquetes:
 
         if nombre_paquete in self.paquetes_disponibles:
             self.paquete = self.paquetes_disponibles[nombre_paquete](self.compuestos)
+            if self._configuracion_cache is not None:
+                self.paquete.configurar_cache(*self._configuracion_cache)
+
+    def configurar_cache(self, tamano_maximo=256, decimales=10):
+        """Configura el cache de propiedades del paquete actual y de los que se seleccionen
+        luego. Ver PaqueteIdeal.configurar_cache"""
+        self._configuracion_cache = (tamano_maximo, decimales)
+        self.paquete.configurar_cache(tamano_maximo, decimales)
 
     def __getattr__(self, item):
         """Realiza el puente entre el gestor de paquetes y el paquete seleccionado"""
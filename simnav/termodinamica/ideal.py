@@ -1,9 +1,6 @@
 """Ecuaciones termodinamicas ideales para el calculo de propiedades termodinamicas
 del Manual del ingeniero quimico Perry"""
 
-from math import sinh, cosh
-from scipy import integrate
-
 import numpy as np
 
 
@@ -12,6 +9,12 @@ def antoine(T, C1, C2, C3, C4, C5):
     return np.exp(C1 + C2/T + C3*np.log(T) + C4*T**C5)
 
 
+def derivada_log_antoine(T, C1, C2, C3, C4, C5):
+    """Derivada del logaritmo de la presión de vapor respecto a la temperatura
+    d(ln Psat)/dT [1/K]"""
+    return -C2/T**2 + C3/T + C4*C5*T**(C5 - 1)
+
+
 def calor_vaporizacion(T, Tc, C1, C2, C3, C4):
     """Calor de vaporización de liquidos organicos e inorganicos [J/(mol.K)]"""
     Tr = T / Tc
@@ -27,7 +30,7 @@ def cp_polinomial(T, C1, C2, C3, C4, C5):
 def cp_hiperbolico(T, C1, C2, C3, C4, C5):
     """Capacidad calorifica a presión constante para compuestos organicos e inorganicos
     en el estado ideal como una ecuación hiperbolica [J/(mol.K)]"""
-    return (C1 + C2*((C3/T) / sinh(C3/T))**2 + C4*((C5/T) / cosh(C5/T))**2) / 1000
+    return (C1 + C2*((C3/T) / np.sinh(C3/T))**2 + C4*((C5/T) / np.cosh(C5/T))**2) / 1000
 
 
 def cp_liquido1(T, C1, C2, C3, C4, C5):
@@ -44,6 +47,52 @@ def cp_liquido2(T, Tc, C1, C2, C3, C4):
             - (C4**2*t**5)/5) / 1000)
 
 
+def entalpia_cp_polinomial(T1, T2, C1, C2, C3, C4, C5):
+    """Integral analitica de cp_polinomial entre T1 y T2 [J/mol]"""
+    def primitiva(T):
+        return C1*T + C2*T**2/2 + C3*T**3/3 + C4*T**4/4 + C5*T**5/5
+    return (primitiva(T2) - primitiva(T1)) / 1000
+
+
+def entalpia_cp_hiperbolico(T1, T2, C1, C2, C3, C4, C5):
+    """Integral analitica de cp_hiperbolico entre T1 y T2 [J/mol].
+    ∫(x/sinh(x))² dT = C3·coth(C3/T) y ∫(x/cosh(x))² dT = -C5·tanh(C5/T)"""
+    def primitiva(T):
+        return C1*T + C2*C3/np.tanh(C3/T) - C4*C5*np.tanh(C5/T)
+    return (primitiva(T2) - primitiva(T1)) / 1000
+
+
+def entalpia_cp_liquido1(T1, T2, C1, C2, C3, C4, C5):
+    """Integral analitica de cp_liquido1 entre T1 y T2 [J/mol]"""
+    def primitiva(T):
+        return C1*T + C2*T**2/2 + C3*T**3/3 + C4*T**4/4 + C5*T**5/5
+    return (primitiva(T2) - primitiva(T1)) / 1000
+
+
+def entalpia_cp_liquido2(T1, T2, Tc, C1, C2, C3, C4):
+    """Integral analitica de cp_liquido2 entre T1 y T2 [J/mol]. Se integra en t = 1 - Tr
+    (dT = -Tc dt)"""
+    def primitiva(T):
+        t = 1 - T/Tc
+        return -Tc*(C1**2*np.log(t) + C2*t - C1*C3*t**2 - C1*C4*t**3/3 - C3**2*t**4/12
+                    - C3*C4*t**5/10 - C4**2*t**6/30)
+    return (primitiva(T2) - primitiva(T1)) / 1000
+
+
+def entalpia_cp_gas(T1, T2, T_cambio, polinomial, hiperbolico):
+    """Integral de la capacidad calorifica del gas ideal entre T1 y T2 [J/mol]. Por debajo de
+    T_cambio se usa la ecuación polinomial y por encima la hiperbolica. Para compuestos sin
+    parametros polinomiales basta con T_cambio = 0 y coeficientes polinomiales nulos.
+
+    :param polinomial: secuencia con los coeficientes C1..C5 de la ecuación polinomial
+    :param hiperbolico: secuencia con los coeficientes C1..C5 de la ecuación hiperbolica
+    """
+    return (entalpia_cp_polinomial(np.minimum(T1, T_cambio), np.minimum(T2, T_cambio),
+                                   *polinomial)
+            + entalpia_cp_hiperbolico(np.maximum(T1, T_cambio), np.maximum(T2, T_cambio),
+                                      *hiperbolico))
+
+
 def entalpia_cp(T1, T2, ecuacion_cp):
     """Calcula la entalpia para una sustancia pura usando la capacidad calorifica a presión
     constante con la siguiente ecuación: dH = ∫cp dT
@@ -52,7 +101,11 @@ def entalpia_cp(T1, T2, ecuacion_cp):
     :param T2: temperatura final para la integración
     :param ecuacion_cp: ecuación para calculo de cp en función de solo la temperatura
     :return: delta de entalpia entre las temperaturas provistas
+
+    Se usa como referencia para verificar las integrales analiticas (entalpia_cp_*)
     """
+    # scipy.integrate es costoso de importar y solo se necesita en el modo de cuadratura
+    from scipy import integrate
     return integrate.quad(ecuacion_cp, T1, T2)[0]
 
 
@@ -0,0 +1,189 @@
+"""Nucleo compilado del paquete ideal para su uso en varios procesos"""
+
+import os
+
+import numpy as np
+
+from .coeficientes import CoeficientesIdeal
+from .paquetes import PaqueteIdeal
+
+# Bloques de memoria compartida creados o abiertos por este proceso, por nombre:
+# (SharedMemory, buffer). Cada proceso abre cada bloque una sola vez y los cierra al
+# terminar (ver _cerrar_bloques)
+_bloques_abiertos = {}
+_pid_finalizador = None
+
+
+def _identificador_rastreador():
+    """
+    Identifica el resource_tracker de multiprocessing de este proceso por el inodo de su
+    tuberia. Los procesos creados con multiprocessing comparten el del proceso que los crea
+    """
+    from multiprocessing import resource_tracker
+    estado = os.fstat(resource_tracker.getfd())
+    return estado.st_dev, estado.st_ino
+
+
+def _abrir_bloque(nombre, rastreador):
+    """
+    Abre un bloque de memoria compartida existente sin que el resource_tracker de este
+    proceso lo elimine al terminar
+    :param rastreador: identificador del resource_tracker del proceso que creo el bloque
+    """
+    from multiprocessing import resource_tracker, shared_memory
+    try:
+        return shared_memory.SharedMemory(name=nombre, track=False)
+    except TypeError:  # Python < 3.13
+        memoria = shared_memory.SharedMemory(name=nombre)
+    # Antes de Python 3.13 abrir el bloque lo registra para su eliminación. Si el rastreador
+    # es el del creador el registro es el suyo y no debe quitarse
+    if os.name == 'posix' and _identificador_rastreador() != rastreador:
+        resource_tracker.unregister(memoria._name, 'shared_memory')
+    return memoria
+
+
+def _guardar_bloque(memoria, buffer):
+    """Agrega un bloque a _bloques_abiertos y programa su cierre al terminar el proceso"""
+    global _pid_finalizador
+    _bloques_abiertos[memoria.name] = memoria, buffer
+    if _pid_finalizador != os.getpid():
+        # Los procesos de multiprocessing no ejecutan atexit, pero si sus Finalize
+        from multiprocessing import util
+        util.Finalize(None, _cerrar_bloques, exitpriority=0)
+        _pid_finalizador = os.getpid()
+
+
+def _cerrar_bloques():
+    """Cierra los bloques abiertos por este proceso. Se llama al terminar el proceso"""
+    for memoria, _ in _bloques_abiertos.values():
+        try:
+            memoria.close()
+        except BufferError:
+            # Aun existen arrays que usan el bloque, el sistema lo libera al terminar
+            pass
+    _bloques_abiertos.clear()
+
+
+class NucleoIdeal(PaqueteIdeal):
+    """
+    Paquete ideal compilado (ver PaqueteIdeal.compilar). Todos sus datos son vistas de solo
+    lectura de un unico buffer float: los coeficientes empaquetados, las temperaturas de
+    referencia y las entalpias de vaporizacion. No posee gestor de parametros, cache, tablas
+    ni logger, por lo que serializarlo solo copia el buffer, o solo el nombre del bloque si
+    el buffer esta en memoria compartida (ver compartir). Las propiedades se evaluan siempre
+    en modo analitico.
+    """
+
+    modo_calculo = 'analitico'
+    cache = None
+    coeficientes = None
+    _memoria_compartida = None
+    _rastreador = None
+
+    def __init__(self, compuestos, buffer, memoria_compartida=None, rastreador=None):
+        """
+        :param compuestos: lista de compuestos
+        :param buffer: array de una dimension creado por desde_paquete
+        :param memoria_compartida: bloque de memoria compartida que contiene el buffer
+        :param rastreador: identificador del resource_tracker del proceso que creo el bloque
+        """
+        numero_compuestos = len(compuestos)
+        if np.size(buffer) != self.tamano_buffer(numero_compuestos):
+            raise ValueError('El tamaño del buffer no corresponde al numero de compuestos')
+        buffer = np.asarray(buffer, dtype=float)
+        buffer.flags.writeable = False
+        tamano_coeficientes = CoeficientesIdeal.tamano_buffer(numero_compuestos)
+
+        atributos = {
+            'compuestos': tuple(compuestos),
+            'numero_compuestos': numero_compuestos,
+            'buffer': buffer,
+            'coeficientes': CoeficientesIdeal.desde_buffer(buffer[:tamano_coeficientes],
+                                                           numero_compuestos),
+            'temperaturas_ref': buffer[tamano_coeficientes:-numero_compuestos],
+            '_entalpias_vaporizacion': buffer[-numero_compuestos:],
+            '_memoria_compartida': memoria_compartida,
+            '_rastreador': rastreador,
+        }
+        for nombre, valor in atributos.items():
+            object.__setattr__(self, nombre, valor)
+
+    @staticmethod
+    def tamano_buffer(numero_compuestos):
+        """Numero de elementos del buffer de un nucleo con el numero de compuestos dado"""
+        return CoeficientesIdeal.tamano_buffer(numero_compuestos) + 2 * numero_compuestos
+
+    @classmethod
+    def desde_paquete(cls, paquete):
+        """Compila un paquete ideal preparado"""
+        numero_compuestos = len(paquete.compuestos)
+        buffer = np.empty(cls.tamano_buffer(numero_compuestos))
+        tamano_coeficientes = CoeficientesIdeal.tamano_buffer(numero_compuestos)
+        paquete.coeficientes.a_buffer(buffer[:tamano_coeficientes])
+        buffer[tamano_coeficientes:-numero_compuestos] = paquete.temperaturas_ref
+        buffer[-numero_compuestos:] = paquete.entalpia_vaporizacion()
+        return cls(paquete.compuestos, buffer)
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError(f'{type(self).__name__} es inmutable')
+
+    def __reduce__(self):
+        if self._memoria_compartida is not None:
+            return type(self).desde_memoria_compartida, (self._memoria_compartida.name,
+                                                         self.compuestos, self._rastreador)
+        return type(self), (self.compuestos, self.buffer)
+
+    def preparar(self):
+        """El nucleo ya esta preparado"""
+
+    def actualizar(self):
+        raise AttributeError(f'{type(self).__name__} es inmutable')
+
+    def configurar_cache(self, tamano_maximo=256, decimales=10):
+        raise AttributeError(f'{type(self).__name__} no posee cache')
+
+    def seleccionar_modo(self, modo_calculo):
+        raise AttributeError(f'{type(self).__name__} solo admite el modo analitico')
+
+    def tablas(self):
+        raise AttributeError(f'{type(self).__name__} solo admite el modo analitico')
+
+    def compilar(self):
+        return self
+
+    def compartir(self):
+        """
+        Copia el buffer a un bloque de multiprocessing.shared_memory y retorna un nucleo que
+        lo usa. Al serializarse ese nucleo solo se envia el nombre del bloque y cada proceso
+        lo abre sin copiar los datos. El bloque debe liberarse con liberar() cuando ya no se
+        necesite.
+        """
+        from multiprocessing import shared_memory
+        memoria = shared_memory.SharedMemory(create=True, size=self.buffer.nbytes)
+        buffer = np.ndarray(self.buffer.shape, dtype=float, buffer=memoria.buf)
+        buffer[:] = self.buffer
+        _guardar_bloque(memoria, buffer)
+        rastreador = _identificador_rastreador() if os.name == 'posix' else None
+        return type(self)(self.compuestos, buffer, memoria, rastreador)
+
+    @classmethod
+    def desde_memoria_compartida(cls, nombre, compuestos, rastreador=None):
+        """
+        Crea un nucleo a partir del bloque de memoria compartida con el nombre dado. Solo el
+        proceso que crea el bloque lo registra para su eliminación. Cada proceso abre el
+        bloque una sola vez y lo cierra al terminar
+        :param rastreador: identificador del resource_tracker del proceso que creo el bloque
+        """
+        tamano = cls.tamano_buffer(len(compuestos))
+        if nombre not in _bloques_abiertos or _bloques_abiertos[nombre][1].size != tamano:
+            memoria = _abrir_bloque(nombre, rastreador)
+            _guardar_bloque(memoria, np.ndarray((tamano,), dtype=float, buffer=memoria.buf))
+        memoria, buffer = _bloques_abiertos[nombre]
+        return cls(compuestos, buffer, memoria, rastreador)
+
+    def liberar(self):
+        """Elimina el bloque de memoria compartida. Los procesos que ya lo abrieron pueden
+        seguir usandolo hasta terminar"""
+        if self._memoria_compartida is not None:
+            _bloques_abiertos.pop(self._memoria_compartida.name, None)
+            self._memoria_compartida.unlink()
@@ -4,12 +4,15 @@ import logging
 from functools import partial
 
 import numpy as np
-from scipy.optimize import newton
 
-from simnav.termodinamica import ideal
+from simnav.termodinamica import ideal, flash
 from simnav.datos import GestorParametros
+from simnav.metodos_matematicos import newton_vectorizado
 
-from .utilidades import sumar_filas, soporte_numpy_2d, soporte_scalar
+from .cache import CacheTermodinamico, memorizar
+from .coeficientes import CoeficientesIdeal
+from .tablas import TablasIdeal
+from .utilidades import sumar_filas, soporte_scalar
 
 
 class PaqueteIdeal:
@@ -17,6 +20,19 @@ class PaqueteIdeal:
 
     nombre = "Ideal"
 
+    # Modos de calculo de las propiedades de compuestos puros. 'analitico' evalua las
+    # integrales de cp de forma cerrada para todos los compuestos a la vez. 'cuadratura'
+    # integra numericamente con scipy y se conserva como referencia para verificación.
+    # 'tabulado' solo cambia la función temperatura_saturacion(P), que se evalua con series de
+    # Chebyshev ajustadas en preparar(). Los puntos de burbuja y rocio, los flash, las torres
+    # y los barridos usan las correlaciones analiticas en todos los modos y no se aceleran
+    # con las tablas (ver simnav.termodinamica.tablas)
+    modos_calculo = ('analitico', 'cuadratura', 'tabulado')
+    tolerancia_tablas = 1e-8  # Error maximo de las tablas del modo tabulado
+
+    # Nombres de los estados termodinamicos segun su numero
+    estados = ('Liquido', 'Vapor', 'Mezcla liquido-vapor')
+
     # Variables para guardar valores de propiedades constantes. Como lo es la entalpia de
     # vaporizacion a T de referencia
     _entalpias_vaporizacion = None
@@ -26,13 +42,21 @@ class PaqueteIdeal:
     parametros = None  # Gestor de parametros
     temperaturas_ref = None  # Array de temperaturas de referencia
 
-    def __init__(self, compuestos):
+    def __init__(self, compuestos, modo_calculo='analitico', tamano_cache=256):
         """
         Inicializa el paquete termodinamico con una referencia a los compuestos de la
         simulación
         :param compuestos: Lista de compuestos
+        :param modo_calculo: modo de calculo de propiedades puras (ver modos_calculo)
+        :param tamano_cache: numero maximo de resultados en el cache de propiedades. None o 0
+        desactiva el cache
         """
         self.compuestos = compuestos
+        self.modo_calculo = None
+        self.seleccionar_modo(modo_calculo)
+        self.cache = None
+        self.configurar_cache(tamano_cache)
+        self._preparaciones = 0  # Numero de veces que se ha preparado el paquete
         self.parametros = GestorParametros(self.compuestos)
 
         # Funciones vectorizadas
@@ -45,6 +69,8 @@ class PaqueteIdeal:
 
         self.numero_compuestos = 0
         self.temperaturas_ref = None  # Array de temperaturas de referencia
+        self.coeficientes = None  # Coeficientes empaquetados (CoeficientesIdeal)
+        self._tablas = None  # Tablas de Chebyshev del modo tabulado (TablasIdeal)
 
         # Logging
         self.logger = logging.getLogger(__name__)
@@ -54,55 +80,162 @@ class PaqueteIdeal:
         self.logger.debug("Preparando paquete termodinamico")
         self.numero_compuestos = len(self.compuestos)
         self.parametros = GestorParametros(self.compuestos)
+        self.coeficientes = CoeficientesIdeal(self.parametros)
+        self._preparaciones += 1
+
+        # Temperatura de referencia (h=0, s=0 para liquido saturado a 1atm) y entalpia de
+        # vaporizacion a esa temperatura, constantes para toda la simulación
+        self.temperaturas_ref = self._temperatura_saturacion_analitica(101325)
+        self._entalpias_vaporizacion = None
+        self._entalpias_vaporizacion = self.entalpia_vaporizacion()
 
-        # Temperatura de referencia (h=0, s=0 para liquido saturado a 1atm)
-        self.temperaturas_ref = np.array(self.temperatura_saturacion(101325))
+        self._tablas = None
+        if self.modo_calculo == 'tabulado':
+            self.tablas()
 
     def actualizar(self):
         """Actualiza la instancia del objeto con los nuevos compuestos.
         Se usa cuando la lista de compuestos a sido modificada"""
-        self.__init__(self.compuestos)
+        tamano_cache = self.cache.tamano_maximo if self.cache else None
+        self.__init__(self.compuestos, self.modo_calculo, tamano_cache)
+
+    def compilar(self):
+        """
+        Retorna un nucleo compilado del paquete (NucleoIdeal): una copia inmutable que solo
+        contiene los coeficientes, las temperaturas de referencia y las entalpias de
+        vaporizacion en un buffer contiguo. Se serializa rapidamente para enviarse a otros
+        procesos, puede ubicarse en memoria compartida y ofrece los mismos metodos de
+        propiedades del paquete, evaluados en modo analitico.
+        """
+        from .nucleo import NucleoIdeal
+        if self.coeficientes is None:
+            self.preparar()
+        return NucleoIdeal.desde_paquete(self)
+
+    def configurar_cache(self, tamano_maximo=256, decimales=10):
+        """
+        Configura el cache de propiedades. Los resultados se indexan con los argumentos
+        redondeados al numero de decimales indicado y se desalojan por orden de uso (LRU).
+        Solo se guardan la entalpia y el estado de mezclas. Las propiedades de compuestos
+        puros se piden en cada plato con temperaturas que casi nunca se repiten, y formar la
+        llave cuesta mas que evaluarlas
+        :param tamano_maximo: numero maximo de resultados guardados. None o 0 lo desactiva
+        :param decimales: decimales usados para cuantizar los argumentos
+        """
+        self.cache = CacheTermodinamico(tamano_maximo, decimales) if tamano_maximo else None
+
+    def estadisticas_cache(self):
+        """Retorna las estadisticas de uso del cache de propiedades o None si esta
+        desactivado"""
+        return self.cache.estadisticas() if self.cache else None
+
+    @property
+    def firma_cache(self):
+        """Identifica el estado del paquete. Si cambia, los resultados del cache dejan de
+        ser validos (nuevos compuestos, nuevo modo de calculo o nueva preparación)"""
+        return tuple(self.compuestos), self.modo_calculo, self._preparaciones
+
+    def seleccionar_modo(self, modo_calculo):
+        """
+        Selecciona el modo de calculo de las propiedades de compuestos puros
+        :param modo_calculo: uno de los modos en modos_calculo
+        """
+        if modo_calculo not in self.modos_calculo:
+            raise ValueError(f'Modo de calculo {modo_calculo} no disponible. '
+                             f'Opciones: {self.modos_calculo}')
+        self.modo_calculo = modo_calculo
+
+    def tablas(self):
+        """Retorna las tablas de Chebyshev del paquete preparado. Se ajustan la primera vez
+        que se solicitan luego de cada preparación"""
+        if self._tablas is None:
+            self.logger.debug("Ajustando tablas de propiedades")
+            self._tablas = TablasIdeal(self, self.tolerancia_tablas)
+        return self._tablas
 
     @soporte_scalar
     def presion_vapor(self, temperatura):
-        """Retorna la presion de vapor de cada compuesto para la temperatura dada"""
-        presiones_vapor = np.zeros((temperatura.size, self.numero_compuestos))
-        for indice, parametros in enumerate(self.parametros.antoine()):
-            presiones_vapor[:, indice] = ideal.antoine(temperatura,
-                                                       parametros.C1,
-                                                       parametros.C2,
-                                                       parametros.C3,
-                                                       parametros.C4,
-                                                       parametros.C5)
-        return presiones_vapor
+        """Retorna la presion de vapor de cada compuesto para la temperatura dada. Filas para
+        cada temperatura y columnas para cada compuesto"""
+        return self._presion_vapor_analitica(np.ravel(temperatura)[:, np.newaxis])
 
     def temperatura_saturacion(self, presion_saturacion):
-        """Retorna la temperatura de saturación para la presión dada"""
-        temperatura_saturacion = np.zeros(self.numero_compuestos)
-        for indice, parametros in enumerate(self.parametros.antoine()):
-            ecuacion_presion_vapor = partial(ideal.antoine,
-                                             C1=parametros.C1,
-                                             C2=parametros.C2,
-                                             C3=parametros.C3,
-                                             C4=parametros.C4,
-                                             C5=parametros.C5)
-            # Ecuacion igual a cero en funcion de la temperatura. 0 = presion
-            ec_saturacion = (lambda temp, presion_saturacion: presion_saturacion
-                                                              - ecuacion_presion_vapor(temp))
-            temperatura_saturacion[indice] = newton(ec_saturacion,
-                                                    x0=300,
-                                                    args=(presion_saturacion,))
-        return temperatura_saturacion
+        """Retorna la temperatura de saturación de cada compuesto para la presión dada. Si se
+        provee un array de presiones se retorna una fila por presión"""
+        presion_saturacion = np.asarray(presion_saturacion, dtype=float)
+        if presion_saturacion.ndim == 1:
+            presion_saturacion = presion_saturacion[:, np.newaxis]
+        if self.modo_calculo == 'tabulado':
+            return self.tablas().temperatura_saturacion(presion_saturacion)
+        return self._temperatura_saturacion_analitica(presion_saturacion)
+
+    # Correlaciones evaluadas elemento a elemento. La temperatura (o presión) debe poder
+    # combinarse con un array de (compuestos,): escalar, (puntos, 1) o (puntos, compuestos)
+    def _presion_vapor_analitica(self, temperatura):
+        return ideal.antoine(temperatura, *self.coeficientes.antoine.T)
+
+    def _derivada_log_presion_vapor_analitica(self, temperatura):
+        return ideal.derivada_log_antoine(temperatura, *self.coeficientes.antoine.T)
+
+    def _temperatura_saturacion_analitica(self, presion):
+        """Resuelve ln(Psat) - ln(P) = 0 para cada elemento a la vez usando la derivada
+        analitica de la ecuacion de antoine"""
+        antoine = self.coeficientes.antoine
+        forma = np.broadcast_shapes(np.shape(presion), (self.numero_compuestos,))
+        log_presion = np.log(np.broadcast_to(presion, forma)).ravel()
+        columnas = np.broadcast_to(np.arange(self.numero_compuestos), forma).ravel()
+
+        def ecuacion_saturacion(temperatura, activos):
+            coeficientes = antoine[columnas[activos]].T
+            return (np.log(ideal.antoine(temperatura, *coeficientes)) - log_presion[activos],
+                    ideal.derivada_log_antoine(temperatura, *coeficientes))
+
+        temperatura_inicial = np.full(log_presion.size, 300.0)
+        temperatura = newton_vectorizado(ecuacion_saturacion, temperatura_inicial,
+                                         paso_maximo=50)[0]
+        return temperatura.reshape(forma)
+
+    def _entalpia_liquido_analitica(self, temperatura):
+        c = self.coeficientes
+        # Se evaluan ambas ecuaciones para todos los compuestos y se escoge la que
+        # corresponde a cada uno. La ecuacion 2 no esta definida por encima de Tc.
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ecuacion_1 = ideal.entalpia_cp_liquido1(self.temperaturas_ref, temperatura,
+                                                    *c.cp_liquido.T)
+            ecuacion_2 = ideal.entalpia_cp_liquido2(self.temperaturas_ref, temperatura,
+                                                    c.temperaturas_criticas,
+                                                    *c.cp_liquido[:, :4].T)
+        return np.where(c.ecuacion_cp_liquido == 1, ecuacion_1, ecuacion_2)
+
+    def _entalpia_vapor_analitica(self, temperatura):
+        # Entalpia de vaporizacion a T de referencia mas el calentamiento del gas ideal
+        c = self.coeficientes
+        delta_vapor = ideal.entalpia_cp_gas(self.temperaturas_ref, temperatura,
+                                            c.temperaturas_cambio_cp_gas,
+                                            c.cp_gas_polinomial.T,
+                                            c.cp_gas_hiperbolico.T)
+        return delta_vapor + self.entalpia_vaporizacion()
 
     def coeficiente_reparto(self, temperatura, presion):
         """Retorna el coeficiente de reparto para cada compuesto a la temperatura y
-        presion dada"""
+        presion dada. Si se provee un array de presiones, una por cada temperatura, se
+        aplica a la fila correspondiente"""
+        presion = np.asarray(presion, dtype=float)
+        if presion.ndim == 1:
+            presion = presion[:, np.newaxis]
         return self.presion_vapor(temperatura) / presion
 
     @soporte_scalar
     def entalpia_liquido_puro(self, temperatura):
         """Retorna la entalpia de liquido puro para la temperatura dada. Puede usarse
         con un escalar de temperatura o un array de numpy"""
+        temperatura = np.ravel(temperatura)
+        if self.modo_calculo == 'cuadratura':
+            return self._entalpia_liquido_puro_cuadratura(temperatura)
+        return self._entalpia_liquido_analitica(temperatura[:, np.newaxis])
+
+    def _entalpia_liquido_puro_cuadratura(self, temperatura):
+        """Entalpia de liquido puro integrando cp numericamente. Modo de referencia"""
         entalpia_liquido = np.zeros((temperatura.size, self.numero_compuestos))
         temperaturas_critica = self.parametros.temperaturas_criticas()
 
@@ -137,6 +270,13 @@ class PaqueteIdeal:
     def entalpia_vapor_puro(self, temperatura):
         """Retorna el cambio de entalpia desde el estado de referencia (liquido saturado a
         1 atm) hasta la temperatura provista"""
+        temperatura = np.ravel(temperatura)
+        if self.modo_calculo == 'cuadratura':
+            return self._entalpia_vapor_puro_cuadratura(temperatura)
+        return self._entalpia_vapor_analitica(temperatura[:, np.newaxis])
+
+    def _entalpia_vapor_puro_cuadratura(self, temperatura):
+        """Entalpia de vapor puro integrando cp numericamente. Modo de referencia"""
         entalpias_vapor = np.zeros((temperatura.size, self.numero_compuestos))
 
         # La entalpia del vapor desde el estado de referencia (liquido saturado a 1 atm)
@@ -186,22 +326,22 @@ class PaqueteIdeal:
         lista_parametros = [p_polinomiales,
                             p_hiperbolicos]  # Lista de parametros para facilidad de uso.
         for i in range(self.numero_compuestos):
-            if p_polinomiales[i]:  # Solo 60 componentes poseen parametros polinomiales
+            if p_polinomiales[i].disponible:  # Solo 60 componentes poseen parametros polinomiales
                 ec_Tref = 0 if self.temperaturas_ref[i] < p_polinomiales[i].TmaxK else 1
-                ec_Treal = None
             else:
                 ec_Tref = 1
-                ec_Treal = 1
             for n in range(temperatura.size):
-                if ec_Treal is None:
+                if p_polinomiales[i].disponible:
                     ec_Treal = 0 if temperatura[n] < p_polinomiales[i].TmaxK else 1
+                else:
+                    ec_Treal = 1
                 if ec_Tref == ec_Treal:
                     delta_vapor = delta_entalpia(temperatura_inicial=self.temperaturas_ref[i],
                                                  temperatura_final=temperatura[n],
                                                  ecuacion=ec_Treal,
                                                  parametros=lista_parametros[ec_Treal][i])
                 else:
-                    if temperatura[n, i] > self.temperaturas_ref[i]:
+                    if temperatura[n] > self.temperaturas_ref[i]:
                         temp_cambio_ec = p_polinomiales[i].TmaxK
                     else:
                         temp_cambio_ec = p_hiperbolicos[i].TminK
@@ -216,7 +356,7 @@ class PaqueteIdeal:
                     # desde cambio de ec hasta T_final
                     delta_vapor_2 = delta_entalpia(
                         temperatura_inicial=temp_cambio_ec,
-                        temperatura_final=temperatura[n, i],
+                        temperatura_final=temperatura[n],
                         ecuacion=ec_Treal,
                         parametros=lista_parametros[ec_Treal][i])
 
@@ -232,26 +372,13 @@ class PaqueteIdeal:
     def entalpia_vaporizacion(self):
         """Retorna la entalpia de vaporizacion para cada componente a la temperatura
         de referencia de cada uno de estos (liquido saturado a 1atm)"""
-        temperaturas_criticas = self.parametros.temperaturas_criticas()
-
         # Se retornan las entalpias de vaporización previamente calculadas si lo han sido.
         if self._entalpias_vaporizacion is not None:
             return self._entalpias_vaporizacion
 
-        entalpias = []
-        datos = zip(temperaturas_criticas,
-                    self.parametros.calor_vaporizacion(),
-                    self.temperaturas_ref)
-
-        for temperatura_critica, parametros, temperatura_referencia in datos:
-            entalpias.append(ideal.calor_vaporizacion(T=temperatura_referencia,
-                                                      Tc=temperatura_critica,
-                                                      C1=parametros.C1,
-                                                      C2=parametros.C2,
-                                                      C3=parametros.C3,
-                                                      C4=parametros.C4))
-
-        return entalpias
+        c = self.coeficientes
+        return ideal.calor_vaporizacion(self.temperaturas_ref, c.temperaturas_criticas,
+                                        *c.calor_vaporizacion.T)
 
     def fraccion_vapor(self, fracciones_liquido, temperatura, presion):
         """Retorna la fraccion de vapor ideal para las condiciones dadas"""
@@ -261,71 +388,154 @@ class PaqueteIdeal:
         """Retorna la fraccion de liquido ideal para las condiciones dadas"""
         return ideal.raoult_liquido(fracciones_vapor, self.presion_vapor(temperatura), presion)
 
-    @soporte_numpy_2d
-    def temperatura_burbuja(self, composicion_liquido, presion, temperatura_inicial=None):
+    # Derivadas analiticas. Se evaluan para todas las temperaturas (filas) y todos los
+    # compuestos (columnas) a la vez, igual que las propiedades correspondientes.
+    @soporte_scalar
+    def derivada_presion_vapor(self, temperatura):
+        """Retorna la derivada de la presion de vapor de cada compuesto respecto a la
+        temperatura dPsat/dT [Pa/K]"""
+        presion_vapor, derivada_log = self._presion_vapor_y_derivada_log(np.ravel(temperatura))
+        return presion_vapor * derivada_log
+
+    def derivada_coeficiente_reparto(self, temperatura, presion):
+        """Retorna la derivada del coeficiente de reparto de cada compuesto respecto a la
+        temperatura dK/dT [1/K]"""
+        presion = np.asarray(presion, dtype=float)
+        if presion.ndim == 1:
+            presion = presion[:, np.newaxis]
+        return self.derivada_presion_vapor(temperatura) / presion
+
+    @soporte_scalar
+    def derivada_entalpia_liquido_puro(self, temperatura):
+        """Retorna la derivada de la entalpia de liquido puro respecto a la temperatura, es
+        decir la capacidad calorifica del liquido [J/(mol.K)]"""
+        c = self.coeficientes
+        T = np.ravel(temperatura)[:, np.newaxis]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ecuacion_1 = ideal.cp_liquido1(T, *c.cp_liquido.T)
+            ecuacion_2 = ideal.cp_liquido2(T, c.temperaturas_criticas, *c.cp_liquido[:, :4].T)
+        return np.where(c.ecuacion_cp_liquido == 1, ecuacion_1, ecuacion_2)
+
+    @soporte_scalar
+    def derivada_entalpia_vapor_puro(self, temperatura):
+        """Retorna la derivada de la entalpia de vapor puro respecto a la temperatura, es
+        decir la capacidad calorifica del gas ideal [J/(mol.K)]"""
+        c = self.coeficientes
+        T = np.ravel(temperatura)[:, np.newaxis]
+        return np.where(T < c.temperaturas_cambio_cp_gas,
+                        ideal.cp_polinomial(T, *c.cp_gas_polinomial.T),
+                        ideal.cp_hiperbolico(T, *c.cp_gas_hiperbolico.T))
+
+    def derivada_entalpia_liquido(self, composicion, temperatura):
+        """Retorna la derivada de la entalpia de una mezcla liquida respecto a la
+        temperatura"""
+        return sumar_filas(self.derivada_entalpia_liquido_puro(temperatura) * composicion)
+
+    def derivada_entalpia_vapor(self, composicion, temperatura):
+        """Retorna la derivada de la entalpia de una mezcla vapor respecto a la
+        temperatura"""
+        return sumar_filas(self.derivada_entalpia_vapor_puro(temperatura) * composicion)
+
+    def derivada_entalpia_liquido_composicion(self, temperatura):
+        """Retorna la derivada de la entalpia de una mezcla liquida respecto a la fraccion
+        molar de cada compuesto dH/dx. Para la mezcla ideal es la entalpia de cada compuesto
+        puro"""
+        return self.entalpia_liquido_puro(temperatura)
+
+    def derivada_entalpia_vapor_composicion(self, temperatura):
+        """Retorna la derivada de la entalpia de una mezcla vapor respecto a la fraccion
+        molar de cada compuesto dH/dy. Para la mezcla ideal es la entalpia de cada compuesto
+        puro"""
+        return self.entalpia_vapor_puro(temperatura)
+
+    def temperatura_burbuja(self, composicion_liquido, presion, temperatura_inicial=None,
+                            retornar_iteraciones=False):
         """
         Punto de burbuja de una mezcla multicomponente ideal. Cumpliendo la condición de que la
-        sumatoria de los componentes en fase gaseosa(y) es igual a 1.
+        sumatoria de los componentes en fase gaseosa(y) es igual a 1. Si la composición es un
+        array 2d se resuelven todas las filas de forma simultanea.
         :param composicion_liquido: composicion en fraccion molar de la fase liquida
-        :param presion: presion del sistema
-        :param temperatura_inicial: temperatura inicial para la determinación del punto de burbuja
+        :param presion: presion del sistema (escalar o una por fila)
+        :param temperatura_inicial: temperatura inicial para la determinación del punto de
+        burbuja (escalar o una por fila). Util para partir de una solución previa
+        :param retornar_iteraciones: si es verdadero se retornan tambien las iteraciones
+        usadas por cada fila
         :return: punto de burbuja para la mezcla
         """
+        return self._temperatura_saturacion_mezcla(composicion_liquido, presion,
+                                                   temperatura_inicial, retornar_iteraciones,
+                                                   burbuja=True)
 
-        if temperatura_inicial is None:
-            # En caso de no proveer temperatura inicial, esta sera dada por la contribucion
-            # de la temperatura de saturacion pura de cada componente
-            temperatura_inicial = np.sum(composicion_liquido * self.temperaturas_ref)
-
-        def sumatoria_fraccion_vapor(temperatura, _composicion_liquido, _presion):
-            """Determinacion de la sumatoria de las fracciones de vapor (y). Siguiendo la ecuacion
-            ideal"""
-            fracciones_vapor = self.fraccion_vapor(_composicion_liquido, temperatura, _presion)
-            return 1 - np.sum(fracciones_vapor)
-
-        return newton(sumatoria_fraccion_vapor, temperatura_inicial,
-                      args=(composicion_liquido, presion))
-
-    @soporte_numpy_2d
-    def temperatura_rocio(self, composicion_vapor, presion, temperatura_inicial=None):
+    def temperatura_rocio(self, composicion_vapor, presion, temperatura_inicial=None,
+                          retornar_iteraciones=False):
         """
-        Punto de burbuja de una mezcla multicomponente ideal. Cumpliendo la condición de que la
-        sumatoria de los componentes en fase gaseosa(y) es igual a 1.
-        :param composicion_vapor: composicion en fraccion molar de la fase liquida
-        :param presion: presion del sistema
-        :param temperatura_inicial: temperatura para la determinación del punto de burbuja
-        :return: punto de burbuja para la mezcla
+        Punto de rocio de una mezcla multicomponente ideal. Cumpliendo la condición de que la
+        sumatoria de los componentes en fase liquida(x) es igual a 1. Si la composición es un
+        array 2d se resuelven todas las filas de forma simultanea.
+        :param composicion_vapor: composicion en fraccion molar de la fase vapor
+        :param presion: presion del sistema (escalar o una por fila)
+        :param temperatura_inicial: temperatura inicial para la determinación del punto de
+        rocio (escalar o una por fila)
+        :param retornar_iteraciones: si es verdadero se retornan tambien las iteraciones
+        usadas por cada fila
+        :return: punto de rocio para la mezcla
         """
+        return self._temperatura_saturacion_mezcla(composicion_vapor, presion,
+                                                   temperatura_inicial, retornar_iteraciones,
+                                                   burbuja=False)
+
+    def _presion_vapor_y_derivada_log(self, temperatura):
+        """Retorna la presion de vapor y su derivada logaritmica d(ln Psat)/dT para un array
+        1d de temperaturas"""
+        temperatura = temperatura[:, np.newaxis]
+        return (self._presion_vapor_analitica(temperatura),
+                self._derivada_log_presion_vapor_analitica(temperatura))
+
+    def _temperatura_saturacion_mezcla(self, composicion, presion, temperatura_inicial,
+                                       retornar_iteraciones, burbuja):
+        """
+        Resuelve el punto de burbuja (Σ K·x = 1) o de rocio (Σ y/K = 1) para cada fila de
+        composicion. Se itera con Newton sobre el logaritmo de la sumatoria, cuya derivada
+        analitica es el promedio de d(ln K)/dT ponderado por cada termino de la sumatoria.
+        """
+        composicion = np.asarray(composicion, dtype=float)
+        es_1d = composicion.ndim == 1
+        composicion = np.atleast_2d(composicion)
+        filas = composicion.shape[0]
+        presion = np.broadcast_to(np.asarray(presion, dtype=float), (filas,))
+
         if temperatura_inicial is None:
             # En caso de no proveer temperatura inicial, esta sera dada por la contribucion
             # de la temperatura de saturacion pura de cada componente
-            temperatura_inicial = np.sum(composicion_vapor * self.temperaturas_ref)
+            temperatura_inicial = composicion @ self.temperaturas_ref
+        temperatura_inicial = np.broadcast_to(np.asarray(temperatura_inicial, dtype=float),
+                                              (filas,))
+        signo = 1 if burbuja else -1
+
+        def funcion(temperatura, activos):
+            presion_vapor, derivada_log = self._presion_vapor_y_derivada_log(temperatura)
+            K = presion_vapor / presion[activos, np.newaxis]
+            terminos = composicion[activos] * K ** signo
+            sumatoria = terminos.sum(axis=1)
+            derivada = signo * (terminos * derivada_log).sum(axis=1) / sumatoria
+            return np.log(sumatoria), derivada
+
+        temperatura, iteraciones = newton_vectorizado(funcion, temperatura_inicial,
+                                                      paso_maximo=50)
+        if es_1d:
+            temperatura, iteraciones = temperatura[0], iteraciones[0]
+        if retornar_iteraciones:
+            return temperatura, iteraciones
+        return temperatura
 
-        # TODO: Derivar esto.
-        def sumatoria_fraccion_liquido(temperatura, _composicion_vapor, _presion):
-            fracciones_liquido = self.fraccion_liquido(_composicion_vapor, temperatura, _presion)
-            return 1 - np.sum(fracciones_liquido)
-
-        return newton(sumatoria_fraccion_liquido, temperatura_inicial,
-                      args=(composicion_vapor, presion))
-
-    @soporte_numpy_2d
     def calidad_vapor(self, composicion, temperatura, presion):
-        """Determina la calidad del vapor para una mezcla en equilibrio liquido-vapor"""
+        """Determina la calidad del vapor para una mezcla en equilibrio liquido-vapor. Acepta
+        una composicion por fila con su temperatura y presion. Mezclas liquidas retornan 0 y
+        mezclas en estado vapor retornan 1"""
         K = self.coeficiente_reparto(temperatura, presion)
+        return flash.rachford_rice(composicion, K)
 
-        # Valor inicial para iteracion
-        calidad_inicial = 0.5  # TODO: MEJORAR ESTO
-
-        funcion = lambda q, z, k: sumar_filas(z / (K + q * (1 - K))) - 1
-        funcion_prima = lambda q, z, k: sumar_filas(- (z * (1 - K) / (K + q * (1 - K)) ** 2))
-
-        calidad = 1 - newton(funcion, calidad_inicial, funcion_prima, args=(composicion, K))[0]
-        if calidad < 0 or calidad > 1:
-            raise RuntimeError(f"La calidad del vapor {calidad} esta fuera de rango (0, 1)")
-        else:
-            return calidad
-
+    @memorizar
     def entalpia(self, composicion, temperatura, presion, calidad_vapor=None):
         """Determina la entalpia de una mezcla multicomponentes. La funcion define el estado
         termodinamico de la mezcla usando la temperatura de burbuja y rocio. Si la mezcla
@@ -377,11 +587,16 @@ class PaqueteIdeal:
         ::return :: La composicion de la fase liquida de la mezcla
         """
         K = self.coeficiente_reparto(temperatura, presion)
-        return composicion / (K + calidad_vapor * (1 - K))
+        return flash.composiciones_fases(composicion, K, calidad_vapor)[0]
 
+    @memorizar
     def estado(self, composicion, temperatura, presion, como_numero=False):
         """
-        Identifica el estado termodinamico de una mezcla
+        Identifica el estado termodinamico de una mezcla. Acepta una composicion por fila con
+        su temperatura y presion, en cuyo caso se retorna un array con el estado de cada fila.
+        La clasificación se hace a T y P dadas sin calcular los puntos de burbuja y rocio:
+        la mezcla es liquida si Σz·K <= 1 (T <= T burbuja) y vapor si Σz/K <= 1
+        (T >= T rocio).
         :param composicion: composicion de la mezcla
         :param temperatura: temperatura de la mezcla
         :param presion: presion de la mezcla
@@ -390,25 +605,10 @@ class PaqueteIdeal:
         numero: 0 para liquido, 1 para vapor, 2 para mezcla liquido-vapor. Si como_numero es
         false retorna una palabra que identifica el estado
         """
-        print('estado', composicion, temperatura, presion)
-        temperatura_burbuja = self.temperatura_burbuja(composicion_liquido=composicion,
-                                                       presion=presion,
-                                                       temperatura_inicial=temperatura)
-
-        temperatura_rocio = self.temperatura_rocio(composicion_vapor=composicion,
-                                                   presion=presion,
-                                                   temperatura_inicial=temperatura)
-
-        if como_numero:
-            estado = [0, 1, 2]
-        else:
-            estado = ['Liquido', 'Vapor', 'Mezcla liquido-vapor']
-
-        if temperatura <= temperatura_burbuja:
-            return estado[0]
-
-        elif temperatura >= temperatura_rocio:
-            return estado[1]
+        K = self.coeficiente_reparto(temperatura, presion)
+        estado = np.where(sumar_filas(composicion * K) <= 1, 0,
+                          np.where(sumar_filas(composicion / K) <= 1, 1, 2))
 
-        if temperatura_burbuja < temperatura < temperatura_rocio:
-            return estado[2]
+        if not como_numero:
+            estado = np.array(self.estados)[estado]
+        return estado.item() if estado.ndim == 0 else estado
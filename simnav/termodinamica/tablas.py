@@ -0,0 +1,183 @@
+"""Tablas de aproximación de Chebyshev para propiedades de compuestos puros.
+
+La propiedad se aproxima, para cada compuesto, con una serie de Chebyshev en el rango de
+validez de su correlación. La serie se ajusta interpolando en los nodos de Chebyshev y el
+grado de cada compuesto se duplica hasta que el error medido en una malla de validación
+(cuatro veces mas densa que los nodos e incluyendo los extremos) es menor que la tolerancia.
+Ese error maximo queda guardado en cada tabla como cota documentada.
+
+Solo se tabula la temperatura de saturacion Tsat(P), que en el modo analitico requiere
+resolver la ecuación de antoine con Newton. La presión de vapor y las entalpias tienen forma
+cerrada y su evaluación cuesta menos que la de la serie (ver benchmarks/tablas.py), por lo
+que el modo tabulado las evalua de forma analitica. El error de Tsat es relativo a la mayor
+temperatura del intervalo.
+
+El modo tabulado es una comodidad para quien evalua PaqueteIdeal.temperatura_saturacion
+muchas veces y no acelera las torres, los flash ni los barridos. Esos calculos no usan Tsat
+de los compuestos puros, salvo las temperaturas de referencia de preparar(). Partir los
+puntos de burbuja y rocio de Σ x·Tsat(P) tabulada ahorra una o dos iteraciones de Newton
+que no compensan el costo de evaluar la serie, por lo que se conserva la estimación inicial
+del modo analitico.
+
+Fuera del intervalo, o para compuestos cuya serie no alcanza la tolerancia con el grado
+maximo, se usa la correlación original.
+"""
+
+import numpy as np
+from numpy.polynomial import chebyshev
+
+
+class TablaChebyshev:
+    """
+    Series de Chebyshev de una función para cada compuesto, cada una en su intervalo y con
+    su propio grado. Los coeficientes forman una matriz (grado maximo + 1, compuestos)
+    completada con ceros. Con pocos puntos la serie se evalua como Σ c_k·cos(k·θ), con
+    t = cos(θ), en una sola operación de numpy sobre los terminos de todos los compuestos
+    (su costo es proporcional a la suma de los grados). Con muchos puntos es mas rapida la
+    recurrencia de Clenshaw sobre la matriz, un paso por grado para todos los compuestos.
+    """
+
+    grados = (4, 6, 8, 12, 16, 24, 32, 48, 64, 96, 128)
+    terminos_coseno = 5000  # Terminos cos(k·θ) por llamada por encima de los que se usa Clenshaw
+
+    def __init__(self, funcion, inferior, superior, tolerancia=1e-8, relativa=True):
+        """
+        :param funcion: funcion(x) con x de forma (puntos, compuestos) que retorna el valor
+        de la propiedad de cada compuesto (columna) en cada punto
+        :param inferior: limite inferior del intervalo de cada compuesto
+        :param superior: limite superior del intervalo de cada compuesto
+        :param tolerancia: error maximo aceptado en la malla de validación
+        :param relativa: si es verdadero el error se divide por el mayor valor absoluto de la
+        funcion en el intervalo
+        """
+        self.inferior = np.asarray(inferior, dtype=float)
+        self.superior = np.asarray(superior, dtype=float)
+        self.tolerancia = tolerancia
+        compuestos = self.inferior.size
+
+        # Malla de validacion con los extremos del intervalo
+        t_validacion = np.linspace(-1, 1, 4 * self.grados[-1] + 1)[:, np.newaxis]
+        with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+            valores = funcion(self._desde_unitario(t_validacion))
+        escala = np.nanmax(np.abs(valores), axis=0) if relativa else 1
+
+        # Cada compuesto toma el menor grado con el que alcanza la tolerancia
+        self.coeficientes = np.zeros((self.grados[-1] + 1, compuestos))
+        self.grado = np.full(compuestos, self.grados[-1])
+        self.error_maximo = np.full(compuestos, np.inf)
+        pendientes = np.ones(compuestos, dtype=bool)
+        for grado in self.grados:
+            nodos = grado + 1
+            k = np.arange(nodos)
+            t_nodos = np.cos(np.pi * (k + 0.5) / nodos)
+            with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+                valores_nodos = funcion(self._desde_unitario(t_nodos[:, np.newaxis]))
+
+            # Coeficientes por la transformada discreta del coseno en los nodos
+            base = np.cos(np.pi * np.outer(k, k + 0.5) / nodos)
+            coeficientes = 2 / nodos * base @ valores_nodos
+            coeficientes[0] /= 2
+
+            with np.errstate(invalid='ignore'):
+                aproximacion = np.cos(np.arccos(t_validacion) * k) @ coeficientes
+                error = np.max(np.abs(aproximacion - valores), axis=0) / escala
+            aceptados = pendientes & ((error <= tolerancia) | (grado == self.grados[-1]))
+            self.coeficientes[:nodos, aceptados] = coeficientes[:, aceptados]
+            self.grado[aceptados] = grado
+            self.error_maximo[aceptados] = error[aceptados]
+            pendientes &= ~aceptados
+            if not np.any(pendientes):
+                break
+        self.validos = self.error_maximo <= tolerancia
+
+        self.coeficientes = self.coeficientes[:self.grado.max() + 1]
+        self._derivada = chebyshev.chebder(self.coeficientes, axis=0)
+        self._terminos = self._aplanar(self.coeficientes, self.grado)
+        self._terminos_derivada = self._aplanar(self._derivada, np.maximum(self.grado - 1, 0))
+
+    @staticmethod
+    def _aplanar(coeficientes, grados):
+        """Retorna los coeficientes hasta el grado de cada compuesto en un vector, junto con
+        el orden k y el compuesto de cada termino y el indice del primer termino de cada
+        compuesto"""
+        columnas = np.repeat(np.arange(grados.size), grados + 1)
+        ordenes = np.concatenate([np.arange(grado + 1) for grado in grados])
+        inicios = np.concatenate(([0], np.cumsum(grados + 1)[:-1]))
+        return coeficientes[ordenes, columnas], ordenes.astype(float), columnas, inicios
+
+    def _desde_unitario(self, t):
+        return (self.inferior + self.superior) / 2 + t * (self.superior - self.inferior) / 2
+
+    def _hacia_unitario(self, x):
+        return (2 * x - self.inferior - self.superior) / (self.superior - self.inferior)
+
+    def _sumar(self, coeficientes, terminos, t):
+        """Evalua las series en t (..., compuestos)"""
+        if t.size // self.inferior.size * terminos[0].size <= self.terminos_coseno:
+            coeficientes_planos, ordenes, columnas, inicios = terminos
+            # Fuera del intervalo se recorta, esos elementos se descartan (ver en_rango)
+            theta = np.arccos(np.clip(t, -1, 1))
+            return np.add.reduceat(np.cos(theta[..., columnas] * ordenes) * coeficientes_planos,
+                                   inicios, axis=-1)
+
+        # Recurrencia de Clenshaw
+        b_1 = b_2 = 0
+        doble_t = 2 * t
+        for c in coeficientes[:0:-1]:
+            b_1, b_2 = doble_t * b_1 - b_2 + c, b_1
+        return t * b_1 - b_2 + coeficientes[0]
+
+    def en_rango(self, x):
+        """Mascara de los elementos que pueden evaluarse con la tabla"""
+        return (x >= self.inferior) & (x <= self.superior) & self.validos
+
+    def __call__(self, x):
+        return self._sumar(self.coeficientes, self._terminos, self._hacia_unitario(x))
+
+    def derivada(self, x):
+        """Derivada de la aproximación respecto a x"""
+        escala = 2 / (self.superior - self.inferior)
+        return self._sumar(self._derivada, self._terminos_derivada,
+                           self._hacia_unitario(x)) * escala
+
+
+def _evaluar(tabla, x, funcion_original):
+    """Evalua la tabla y usa la función original para los elementos fuera de rango"""
+    x = np.broadcast_to(x, np.broadcast_shapes(np.shape(x), tabla.inferior.shape))
+    aproximacion = tabla(x)
+    dentro = tabla.en_rango(x)
+    if np.all(dentro):
+        return aproximacion
+    return np.where(dentro, aproximacion, funcion_original(x))
+
+
+class TablasIdeal:
+    """Tablas de Chebyshev de Tsat(P) de los compuestos de un paquete ideal preparado"""
+
+    def __init__(self, paquete, tolerancia=1e-8):
+        """
+        :param paquete: paquete ideal preparado (PaqueteIdeal)
+        :param tolerancia: error maximo aceptado para cada tabla
+        """
+        self.paquete = paquete
+        c = paquete.coeficientes
+
+        # Tsat en funcion de ln(P) en el rango de presiones de la ecuacion de antoine
+        rango_log_presion = np.log(paquete._presion_vapor_analitica(c.rango_antoine.T))
+        self.tabla_temperatura_saturacion = TablaChebyshev(
+            self._temperatura_saturacion_analitica, *rango_log_presion, tolerancia=tolerancia)
+
+    def _temperatura_saturacion_analitica(self, log_presion):
+        return self.paquete._temperatura_saturacion_analitica(np.exp(log_presion))
+
+    def errores_maximos(self):
+        """Retorna el error maximo medido de cada tabla para cada compuesto"""
+        return {
+            'temperatura_saturacion': self.tabla_temperatura_saturacion.error_maximo,
+        }
+
+    # Recibe arrays que se puedan combinar con (compuestos,), por ejemplo (puntos, 1) o
+    # (puntos, compuestos), y retorna (puntos, compuestos).
+    def temperatura_saturacion(self, presion):
+        return _evaluar(self.tabla_temperatura_saturacion, np.log(presion),
+                        self._temperatura_saturacion_analitica)
@@ -10,10 +10,10 @@ def soporte_scalar(func):
 
     @wraps(func)
     def wrapper(*args, **kwargs):
-        if any(isinstance(arg, (int, float, list, tuple)) for arg in args):
+        if any(isinstance(arg, (int, float, list, tuple, np.number)) for arg in args):
             new_args = []
             for arg in args:
-                if isinstance(arg, (list, tuple, int, float)):
+                if isinstance(arg, (list, tuple, int, float, np.number)):
                     arg = np.atleast_2d(arg)
                 new_args.append(arg)
             return func(*new_args, **kwargs)[0]
@@ -0,0 +1,19 @@
+"""Pruebas del costo de importar simnav"""
+
+import subprocess
+import sys
+
+
+class TestImportacionDiferida:
+    def test_modulos_diferidos(self):
+        """Importar simnav no debe reflejar la base de datos ni importar modulos pesados"""
+        programa = ('import sys, simnav.simulacion; '
+                    'print(",".join(m for m in ("sqlalchemy", "scipy.integrate", "yaml", '
+                    '"PyQt5") if m in sys.modules))')
+        salida = subprocess.run([sys.executable, '-c', programa], check=True,
+                                capture_output=True, text=True).stdout
+        assert salida.strip() == ''
+
+    def test_db_bajo_demanda(self):
+        from simnav.datos import db
+        assert db.Componentes.__table__.name == 'componentes'
@@ -0,0 +1,113 @@
+"""Pruebas para los barridos parametricos de la torre de destilación"""
+
+import os
+
+import numpy as np
+import pytest
+
+from simnav import barrido
+from simnav.barrido import expandir_malla, ejecutar_barrido, cargar_barrido
+
+ARCHIVO_EJEMPLO = os.path.join('simnav', 'ejemplo.yaml')
+
+
+@pytest.fixture
+def simulacion():
+    simulacion, _ = cargar_barrido(ARCHIVO_EJEMPLO)
+    return simulacion
+
+
+class TestExpandirMalla:
+    def test_orden(self):
+        casos = expandir_malla({'reflujo': [1, 2], 'plato_alimentacion': 5,
+                                'destilado': {'inicio': 40, 'fin': 60, 'pasos': 3}})
+        assert len(casos) == 6
+        assert casos[0] == {'reflujo': 1, 'plato_alimentacion': 5, 'destilado': 40}
+        assert [caso['destilado'] for caso in casos[:3]] == [40, 50, 60]
+        assert [caso['reflujo'] for caso in casos] == [1, 1, 1, 2, 2, 2]
+
+
+class TestEjecutarBarrido:
+    malla = {'reflujo': [1.5, 2.5], 'plato_alimentacion': [3, 5, 12]}
+
+    def test_resultados(self, simulacion):
+        resultados = ejecutar_barrido(simulacion, self.malla, procesos=1)
+        assert list(resultados['reflujo']) == [1.5, 1.5, 1.5, 2.5, 2.5, 2.5]
+        # El plato 12 esta fuera de la torre de 10 platos
+        assert list(resultados['convergido']) == [True, True, False] * 2
+        assert 'fuera de la torre' in resultados['error'][2]
+        assert np.isnan(resultados['temperatura_tope'][2])
+        assert resultados['fraccion_destilado'].shape == (6, 2)
+
+        simulacion.destilacion.reflujo = 2.5
+        simulacion.destilacion.alimentaciones[0][0] = 3
+        simulacion.simular(exportar=False)
+        np.testing.assert_allclose(resultados['fraccion_destilado'][3],
+                                   simulacion.resultados['fraccion_vapor'][0])
+
+    def test_procesos(self, simulacion):
+        """Los resultados no dependen del numero de procesos ni del tamaño de los lotes"""
+        serie = ejecutar_barrido(simulacion, self.malla, procesos=1)
+        paralelo = ejecutar_barrido(simulacion, self.malla, procesos=2, tamano_lote=2)
+        assert list(serie['error']) == list(paralelo['error'])
+        for nombre in ('temperatura_tope', 'calor_rehervidor', 'fraccion_fondo'):
+            np.testing.assert_array_equal(serie[nombre], paralelo[nombre])
+
+    def test_conjunto(self, simulacion):
+        procesos = ejecutar_barrido(simulacion, self.malla, procesos=1)
+        conjunto = ejecutar_barrido(simulacion, self.malla, conjunto=True)
+        assert list(procesos['error']) == list(conjunto['error'])
+        np.testing.assert_allclose(conjunto['temperatura_tope'],
+                                   procesos['temperatura_tope'], atol=0.01)
+        np.testing.assert_allclose(conjunto['fraccion_fondo'], procesos['fraccion_fondo'],
+                                   atol=1e-4)
+
+    def test_especificacion(self, simulacion):
+        """El reflujo necesario para la pureza especificada con cada numero de platos"""
+        simulacion.destilacion.especificacion = dict(variable='reflujo', producto='destilado',
+                                                     compuesto='Benzene', fraccion=0.95)
+        resultados = ejecutar_barrido(simulacion, {'numero_platos': [8, 10, 14]}, procesos=1)
+        assert resultados['convergido'].all()
+        np.testing.assert_allclose(resultados['fraccion_destilado'][:, 0], 0.95, atol=1e-5)
+
+    def test_sin_salida(self, simulacion, capsys):
+        """La simulación no escribe en stdout, por lo que no hace falta redirigirlo"""
+        ejecutar_barrido(simulacion, self.malla, procesos=1)
+        ejecutar_barrido(simulacion, self.malla, conjunto=True)
+        assert capsys.readouterr().out == ''
+
+    @pytest.mark.parametrize('atributo, valor', [
+        ('especificacion', dict(variable='reflujo', producto='destilado', compuesto='Benzene',
+                                fraccion=0.95)),
+        ('metodo', 'naphtali_sandholm')])
+    def test_conjunto_no_soportado(self, simulacion, atributo, valor):
+        setattr(simulacion.destilacion, atributo, valor)
+        with pytest.raises(ValueError):
+            ejecutar_barrido(simulacion, self.malla, conjunto=True)
+
+    def test_parametro_desconocido(self, simulacion):
+        with pytest.raises(ValueError):
+            ejecutar_barrido(simulacion, {'reflujos': [1, 2]}, procesos=1)
+
+
+class TestLineaComandos:
+    def test_main(self, tmp_path, capsys):
+        with open(ARCHIVO_EJEMPLO) as f:
+            contenido = f.read()
+        archivo = tmp_path / 'barrido.yaml'
+        archivo.write_text(contenido + '\nbarrido:\n    reflujo: [1.5, 2]\n')
+        salida = tmp_path / 'barrido.csv'
+        barrido.main([str(archivo), '--salida', str(salida), '--procesos', '1'])
+        lineas = salida.read_text().splitlines()
+        assert len(lineas) == 3
+        assert lineas[0].startswith('reflujo,convergido,error')
+        assert '2 de 2 casos convergieron' in capsys.readouterr().out
+
+
+class TestSimulacion:
+    def test_sin_exportar(self, simulacion, tmp_path, monkeypatch):
+        simulacion.paquete_propiedades.preparar()
+        monkeypatch.chdir(tmp_path)
+        simulacion.simular(exportar=False)
+        assert simulacion.resultados is not None
+        assert not (tmp_path / 'resultados.csv').exists()
@@ -0,0 +1,95 @@
+"""Pruebas para el cache de propiedades termodinamicas"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from pytest import approx
+
+import numpy as np
+
+from simnav.termodinamica.cache import CacheTermodinamico
+from simnav.termodinamica.paquetes import PaqueteIdeal
+
+
+class TestCacheTermodinamico:
+
+    def test_desalojo_lru(self):
+        cache = CacheTermodinamico(tamano_maximo=2)
+        llaves = [cache.llave('propiedad', (temperatura,), {}) for temperatura in (1, 2, 3)]
+        cache.guardar(llaves[0], 1)
+        cache.guardar(llaves[1], 2)
+        cache.obtener(llaves[0])  # La llave 0 pasa a ser la mas reciente
+        cache.guardar(llaves[2], 3)
+
+        assert cache.obtener(llaves[1]) is None
+        assert cache.obtener(llaves[0]) == 1
+        assert cache.estadisticas()['desalojos'] == 1
+        assert len(cache) == 2
+
+    def test_cuantizacion(self):
+        cache = CacheTermodinamico(decimales=6)
+        assert (cache.llave('h', (np.array([300.0, 0.0]),), {})
+                == cache.llave('h', (np.array([300.0 + 1e-9, -0.0]),), {}))
+        assert cache.llave('h', (300.0,), {}) != cache.llave('h', (300.1,), {})
+
+    def test_hilos(self):
+        cache = CacheTermodinamico(tamano_maximo=8)
+        llaves = [cache.llave('propiedad', (temperatura,), {}) for temperatura in range(32)]
+
+        def consultar(inicio):
+            for indice in range(2000):
+                llave = llaves[(inicio + indice) % len(llaves)]
+                if cache.obtener(llave) is None:
+                    cache.guardar(llave, indice)
+
+        with ThreadPoolExecutor(8) as ejecutor:
+            list(ejecutor.map(consultar, range(8)))
+
+        estadisticas = cache.estadisticas()
+        assert estadisticas['aciertos'] + estadisticas['fallos'] == 8 * 2000
+        assert len(cache) == 8
+
+
+class TestCachePaquete:
+    composicion = np.array([0.5, 0.5])
+
+    def test_aciertos(self):
+        paquete = PaqueteIdeal(['Benzene', 'Toluene'])
+        paquete.preparar()
+        entalpia = paquete.entalpia(self.composicion, 368, 101325)
+        assert paquete.entalpia(self.composicion, 368, 101325) == approx(entalpia)
+        assert paquete.estadisticas_cache()['aciertos'] >= 1
+
+        # Los resultados retornados son copias
+        composiciones = np.array([self.composicion, [0.3, 0.7]])
+        estados = paquete.estado(composiciones, np.array([368, 300]), 101325,
+                                 como_numero=True)
+        estados[:] = -1
+        assert list(paquete.estado(composiciones, np.array([368, 300]), 101325,
+                                   como_numero=True)) == [2, 0]
+
+    def test_propiedades_puras(self):
+        """Las propiedades de compuestos puros no pasan por el cache"""
+        paquete = PaqueteIdeal(['Benzene', 'Toluene'])
+        paquete.preparar()
+        paquete.presion_vapor(350)
+        paquete.entalpia_liquido_puro(350)
+        paquete.entalpia_vapor_puro(350)
+        assert len(paquete.cache) == 0
+
+    def test_invalidacion(self):
+        compuestos = ['Benzene', 'Toluene']
+        paquete = PaqueteIdeal(compuestos)
+        paquete.preparar()
+        paquete.estado(self.composicion, 368, 101325)
+        assert len(paquete.cache) == 1
+
+        compuestos.append('Heptane')
+        paquete.preparar()
+        assert paquete.estado(np.array([0.3, 0.3, 0.4]), 300, 101325) == 'Liquido'
+        assert len(paquete.cache) == 1
+
+    def test_desactivado(self):
+        paquete = PaqueteIdeal(['Benzene', 'Toluene'], tamano_cache=None)
+        paquete.preparar()
+        paquete.entalpia(self.composicion, 368, 101325)
+        assert paquete.estadisticas_cache() is None
@@ -0,0 +1,534 @@
+"""Pruebas para los metodos de solución de la torre de destilación"""
+
+import numpy as np
+import pytest
+from pytest import approx
+
+from simnav.corrientes import CorrienteMateria
+from simnav.metodos_matematicos import AceleradorPuntoFijo
+from simnav.opus import (DestilacionSemiRigurosa, DestilacionConjunto, METODOS_SOLUCION,
+                         continuacion)
+from simnav.opus.destilacion import balance_materia, interpolar_platos
+from simnav.opus.inicializacion import (calidad_alimentaciones, estimacion_inicial,
+                                        perfil_estimado, reparto_fenske_destilado)
+from simnav.opus.inside_out import ModeloAproximado
+from simnav.opus.metodo_corto import metodo_corto, torre_rigurosa
+from simnav.opus.naphtali_sandholm import SistemaMESH
+from simnav.opus.suma_flujos import SistemaSumaFlujos
+from simnav.opus.optimizacion import (EvaluadorTorre, buscar_reflujo_minimo,
+                                      margen_especificaciones, optimizar_torre)
+from simnav.termodinamica import GestorPaquetes
+
+COMPUESTOS = ['Benzene', 'Toluene']
+
+
+def crear_torre(metodo='punto_burbuja', **parametros):
+    paquete = GestorPaquetes(COMPUESTOS)
+    paquete.preparar()
+    alimentacion = CorrienteMateria('alimentacion', COMPUESTOS, paquete, flujo=100,
+                                    temperatura=350.15, composicion=[0.5, 0.5],
+                                    presion=101325)
+    datos = dict(numero_platos=10, destilado=50, reflujo=1.5,
+                 alimentaciones=[[5, alimentacion]], paquete_termodinamico=paquete,
+                 metodo=metodo)
+    datos.update(parametros)
+    return DestilacionSemiRigurosa(**datos)
+
+
+@pytest.fixture(scope='module')
+def punto_burbuja():
+    return crear_torre().simular()
+
+
+class TestMetodosSolucion:
+    def test_metodo_inexistente(self):
+        with pytest.raises(ValueError):
+            crear_torre('inexistente').simular()
+
+    def test_metodos_registrados(self):
+        assert {'punto_burbuja', 'naphtali_sandholm', 'inside_out',
+                'suma_flujos'} <= set(METODOS_SOLUCION)
+
+
+class TestPuntoBurbuja:
+    def test_aceleracion(self, punto_burbuja, monkeypatch):
+        monkeypatch.setattr(DestilacionSemiRigurosa, 'aceleracion', 'sustitucion')
+        sustitucion = crear_torre().simular()
+        assert punto_burbuja['contador_ciclo_vapor'] < sustitucion['contador_ciclo_vapor']
+        assert (punto_burbuja['contador_ciclo_temperatura']
+                < sustitucion['contador_ciclo_temperatura'])
+        np.testing.assert_allclose(punto_burbuja['temperatura'], sustitucion['temperatura'],
+                                   atol=0.01)
+        np.testing.assert_allclose(punto_burbuja['vapor'], sustitucion['vapor'], rtol=1e-3)
+
+    def test_perfil_sin_acelerar(self, monkeypatch):
+        """El perfil retornado es el de la ultima sustitución y no una extrapolación"""
+        def sobrerrelajar(acelerador, anterior, nuevo):
+            return nuevo + 0.1 * (nuevo - anterior)
+
+        monkeypatch.setattr(AceleradorPuntoFijo, 'siguiente', sobrerrelajar)
+        torre = crear_torre()
+        resultado = torre.simular()
+        burbuja = torre.propiedades.temperatura_burbuja(resultado['fraccion_liquido'],
+                                                        torre.presion)
+        np.testing.assert_allclose(resultado['temperatura'], burbuja, rtol=0, atol=1e-8)
+
+    def test_balance_energia_tope(self):
+        """El calor del condensador incluye la alimentación del primer plato"""
+        torre = crear_torre()
+        reflujo = CorrienteMateria('reflujo', COMPUESTOS, torre.propiedades, flujo=10,
+                                   temperatura=330, composicion=[0.9, 0.1], presion=101325)
+        torre.alimentaciones.append([1, reflujo])
+        resultado = torre.simular()
+        V, L, Q = resultado['vapor'], resultado['liquido'], resultado['calor']
+        hV = torre.propiedades.entalpia_vapor(resultado['fraccion_vapor'],
+                                              resultado['temperatura'])
+        hL = torre.propiedades.entalpia_liquido(resultado['fraccion_liquido'],
+                                                resultado['temperatura'])
+        assert Q[0] == approx(V[1] * hV[1] + 10 * reflujo.entalpia_especifica
+                              - V[0] * hV[0] - L[0] * hL[0])
+        F, _, hF = torre.alimentacion()
+        assert Q[-1] - Q[0] == approx(V[0] * hV[0] + L[-1] * hL[-1] - np.sum(F * hF))
+
+
+class TestDestilacionConjunto:
+    @staticmethod
+    def crear_torres(paquete):
+        alimentacion = CorrienteMateria('alimentacion', COMPUESTOS, paquete, flujo=100,
+                                        temperatura=350.15, composicion=[0.5, 0.5],
+                                        presion=101325)
+        reflujo = CorrienteMateria('reflujo', COMPUESTOS, paquete, flujo=10, temperatura=330,
+                                   composicion=[0.9, 0.1], presion=101325)
+        parametros = [dict(reflujo=1.5), dict(reflujo=3, destilado=40),
+                      dict(numero_platos=14, alimentaciones=[[7, alimentacion]]),
+                      dict(presion=2e5),
+                      dict(alimentaciones=[[5, alimentacion], [1, reflujo]]),
+                      dict(condensador='Total'), dict(destilado=150)]
+        torres = []
+        for datos in parametros:
+            datos = {**dict(numero_platos=10, destilado=50, reflujo=1.5,
+                            alimentaciones=[[5, alimentacion]], paquete_termodinamico=paquete),
+                     **datos}
+            condensador = datos.pop('condensador', 'Parcial')
+            torres.append(DestilacionSemiRigurosa(**datos))
+            torres[-1].condensador = condensador
+        # Con condensador total la sustitución sucesiva no converge desde el perfil simple, se
+        # parte del perfil convergido con aceleración
+        torres[-2].estado_inicial = torres[-2].simular()
+        return torres
+
+    def test_igual_a_punto_burbuja(self, paquete, monkeypatch):
+        torres = self.crear_torres(paquete)
+        resultados = DestilacionConjunto(torres).simular()
+        monkeypatch.setattr(DestilacionSemiRigurosa, 'aceleracion', 'sustitucion')
+        for torre, resultado in zip(torres[:-1], resultados):
+            esperado = torre.simular()
+            for variable in ('temperatura', 'vapor', 'liquido', 'fraccion_liquido', 'calor'):
+                np.testing.assert_allclose(resultado[variable], esperado[variable],
+                                           rtol=1e-10)
+            assert resultado['contador_ciclo_vapor'] == esperado['contador_ciclo_vapor']
+
+    def test_torre_sin_solucion(self, paquete):
+        """El destilado de la ultima torre es mayor a su alimentación. Las demas convergen"""
+        resultados = DestilacionConjunto(self.crear_torres(paquete)).simular()
+        assert [resultado is None for resultado in resultados] == [False] * 6 + [True]
+        with pytest.raises(RuntimeError):
+            self.crear_torres(paquete)[-1].simular()
+
+    def test_balance_materia_lote(self):
+        """Los balances de varias torres a la vez son los de cada torre por separado"""
+        rng = np.random.default_rng(0)
+        V, F, D = rng.uniform(50, 150, (3, 8)), np.zeros((3, 8)), np.array([40., 50., 60.])
+        F[:, 4] = 100
+        K, zF = rng.uniform(0.5, 2, (3, 8, 2)), np.full((3, 8, 2), 0.5)
+        lote = balance_materia(V, K, F, zF, D)
+        for torre in range(3):
+            np.testing.assert_array_equal(
+                lote[torre], balance_materia(V[torre], K[torre], F[torre], zF[torre], D[torre]))
+
+    def test_paquetes_distintos(self, paquete):
+        with pytest.raises(ValueError):
+            DestilacionConjunto([crear_torre(), crear_torre()])
+
+
+class TestInicializacion:
+    def test_reparto_fenske(self):
+        alimentado = np.array([20., 30., 50.])
+        destilado = reparto_fenske_destilado(np.array([4., 2., 1.]), alimentado, 40, 5)
+        assert destilado.sum() == approx(40)
+        recuperacion = destilado / alimentado
+        assert (np.diff(recuperacion) < 0).all()
+        # d/b = C·alfa^Nm
+        relacion = destilado / (alimentado - destilado)
+        assert relacion[0] / relacion[2] == approx(4 ** 5)
+
+    def test_calidad_alimentaciones(self):
+        paquete = crear_torre().propiedades
+        zF = np.array([[0.5, 0.5], [0.2, 0.8]])
+        T_burbuja = paquete.temperatura_burbuja(zF, 101325)
+        T_rocio = paquete.temperatura_rocio(zF, 101325)
+        hF = np.array([paquete.entalpia_liquido(zF[0], T_burbuja[0]),
+                       paquete.entalpia_vapor(zF[1], T_rocio[1])])
+        _, _, q = calidad_alimentaciones(paquete, zF, hF, 101325)
+        assert q == approx([1, 0])
+
+    def test_perfil_estimado(self, punto_burbuja):
+        V, L, T, x, y = perfil_estimado(crear_torre())
+        assert V[0] == 50 and L[0] == approx(75) and L[-1] == approx(50)
+        assert (np.diff(T) > 0).all()
+        np.testing.assert_allclose(x.sum(axis=1), 1)
+        np.testing.assert_allclose(y.sum(axis=1), 1)
+        # El perfil estimado esta cerca de la solución
+        assert np.abs(T - punto_burbuja['temperatura']).max() < 5
+
+
+@pytest.fixture(scope='module')
+def paquete():
+    return crear_torre().propiedades
+
+
+class TestMetodoCorto:
+    def test_underwood_binario(self, paquete):
+        """Para un binario con alimentación liquida saturada Underwood tiene solución
+        explicita"""
+        resultado = metodo_corto(paquete, [0.4, 0.6], 0, 1, 0.95, 0.9)
+        xD = resultado['fraccion_destilado'][0, 0]
+        relacion = 0.95 / 0.05 * 0.9 / 0.1
+        alfa = relacion ** (1 / resultado['etapas_minimas'][0])
+        reflujo_minimo = (xD / 0.4 - alfa * (1 - xD) / 0.6) / (alfa - 1)
+        assert resultado['reflujo_minimo'][0] == approx(reflujo_minimo)
+        assert resultado['destilado'][0] == approx(0.4 * 0.95 + 0.6 * 0.1)
+
+    def test_vectorizado(self, paquete):
+        recuperaciones = np.array([0.9, 0.95, 0.99])
+        factores = np.array([1.2, 1.5, 2.0])
+        resultado = metodo_corto(paquete, [0.5, 0.5], 0, 1, recuperaciones, 0.95,
+                                 factor_reflujo=factores)
+        for indice, (recuperacion, factor) in enumerate(zip(recuperaciones, factores)):
+            fila = metodo_corto(paquete, [0.5, 0.5], 0, 1, recuperacion, 0.95,
+                                factor_reflujo=factor)
+            for nombre, valor in fila.items():
+                np.testing.assert_allclose(resultado[nombre][indice], valor[0])
+
+    def test_gilliland(self, paquete):
+        resultado = metodo_corto(paquete, [0.5, 0.5], 0, 1, 0.95, 0.95,
+                                 factor_reflujo=[1.1, 1.5, 3, 1000])
+        assert (np.diff(resultado['etapas']) < 0).all()
+        assert resultado['etapas'][-1] == approx(resultado['etapas_minimas'][-1], rel=0.05)
+        assert (resultado['plato_alimentacion'] < resultado['numero_platos']).all()
+
+    def test_torre_rigurosa(self, paquete):
+        resultado = metodo_corto(paquete, [0.5, 0.5], 0, 1, 0.95, 0.95)
+        alimentacion = crear_torre().alimentaciones[0][1]
+        torre = torre_rigurosa(resultado, alimentacion, paquete, metodo='naphtali_sandholm')
+        assert torre.destilado == approx(50)
+        riguroso = torre.simular()
+        assert riguroso['fraccion_vapor'][0, 0] == approx(0.95, abs=0.02)
+
+    def test_claves_no_adyacentes(self):
+        compuestos = ['Benzene', 'Heptane', 'Toluene']
+        paquete = GestorPaquetes(compuestos)
+        paquete.preparar()
+        with pytest.raises(ValueError):
+            metodo_corto(paquete, [0.3, 0.3, 0.4], 0, 2, 0.95, 0.95)
+
+
+class TestOptimizacion:
+    especificaciones = [('destilado', 0, 0.95), ('fondo', 1, 0.95)]
+
+    def test_margen_especificaciones(self, punto_burbuja):
+        xD, xB = punto_burbuja['fraccion_vapor'][0], punto_burbuja['fraccion_liquido'][-1]
+        assert margen_especificaciones(punto_burbuja, [('destilado', 0, 0.9)]) == approx(
+            xD[0] - 0.9)
+        assert margen_especificaciones(punto_burbuja, [('destilado', 0, 0.5),
+                                                       ('fondo', 1, 0.99)]) == approx(
+            xB[1] - 0.99)
+
+    def test_reflujo_minimo(self):
+        evaluador = EvaluadorTorre(crear_torre(numero_platos=12), self.especificaciones)
+        reflujo, resultado = buscar_reflujo_minimo(evaluador, 6, 50, 3, tolerancia=1e-4)
+        assert margen_especificaciones(resultado, self.especificaciones) >= 0
+        _, registro = evaluador.evaluar(6, reflujo * 0.999, 50)
+        assert registro['margen'] < 0
+        assert len(evaluador.historial) == len({registro['reflujo']
+                                                for registro in evaluador.historial})
+        assert buscar_reflujo_minimo(evaluador, 6, 50, 1, limites_reflujo=(0.1, 1.2)) == (
+            None, None)
+
+    def test_optimizar_torre(self):
+        torre = crear_torre(numero_platos=12, reflujo=2)
+        optimo = optimizar_torre(torre, self.especificaciones, platos=[3, 6, 9], procesos=1)
+        assert optimo['plato_alimentacion'] == 6
+        assert optimo['calor_rehervidor'] == approx(optimo['resultado']['calor'][-1])
+        calores = [candidato['calor_rehervidor'] for candidato in optimo['candidatos']]
+        assert calores[1] == min(calores)
+        assert {registro['plato_alimentacion'] for registro in optimo['historial']} == {3, 6, 9}
+        assert all(registro['convergido'] for registro in optimo['historial'])
+        # La torre del caso base no se modifica
+        assert (torre.reflujo, torre.alimentaciones[0][0]) == (2, 5)
+
+        paralelo = optimizar_torre(torre, self.especificaciones, platos=[3, 6, 9], procesos=2)
+        assert paralelo['plato_alimentacion'] == 6
+        assert paralelo['reflujo'] == approx(optimo['reflujo'], rel=1e-3)
+
+    def test_destilado(self):
+        optimo = optimizar_torre(crear_torre(numero_platos=12), self.especificaciones,
+                                 platos=[6], limites_destilado=(40, 60), procesos=1)
+        # Las especificaciones son simetricas para una alimentación equimolar
+        assert optimo['destilado'] == approx(50, abs=0.5)
+
+    def test_especificaciones_imposibles(self):
+        optimo = optimizar_torre(crear_torre(), [('destilado', 0, 0.99999)], platos=[5],
+                                 limites_reflujo=(0.5, 4), procesos=1)
+        assert optimo['plato_alimentacion'] is None
+        assert optimo['candidatos'] == [None]
+        assert optimo['historial']
+
+
+class TestEspecificacion:
+    def test_reflujo(self):
+        especificacion = dict(variable='reflujo', producto='destilado', compuesto='Benzene',
+                              fraccion=0.97)
+        torre = crear_torre(especificacion=especificacion)
+        resultado = torre.simular()
+        assert resultado['fraccion_vapor'][0][0] == approx(0.97, abs=1e-5)
+        assert torre.reflujo != 1.5
+        assert torre.estado_inicial is None
+        assert 1 < resultado['contador_especificacion'] < 10
+
+        # La misma torre con el reflujo encontrado cumple la especificación. Partiendo sin
+        # perfil la torre converge a otro punto dentro de su tolerancia
+        torre.especificacion = None
+        np.testing.assert_allclose(torre.simular()['fraccion_vapor'][0],
+                                   resultado['fraccion_vapor'][0], atol=2e-4)
+
+    def test_destilado(self):
+        especificacion = dict(variable='destilado', producto='fondo', compuesto=0,
+                              fraccion=0.02)
+        torre = crear_torre(especificacion=especificacion)
+        resultado = torre.simular()
+        assert resultado['fraccion_liquido'][-1][0] == approx(0.02, abs=1e-5)
+        assert resultado['vapor'][0] == approx(torre.destilado)
+
+    def test_arranque_en_caliente(self, monkeypatch):
+        especificacion = dict(variable='reflujo', producto='destilado', compuesto=0,
+                              fraccion=0.97)
+        caliente = crear_torre(especificacion=especificacion).simular()
+        monkeypatch.setattr(DestilacionSemiRigurosa, 'perfil_inicial', lambda torre: None)
+        frio = crear_torre(especificacion=especificacion).simular()
+        assert caliente['contador_ciclo_temperatura'] < frio['contador_ciclo_temperatura']
+
+    def test_especificacion_imposible(self):
+        especificacion = dict(variable='reflujo', producto='destilado', compuesto=0,
+                              fraccion=0.9999, limites=(0.5, 3))
+        torre = crear_torre(especificacion=especificacion)
+        with pytest.raises(RuntimeError):
+            torre.simular()
+        assert torre.reflujo == 1.5
+
+    def test_variable_invalida(self):
+        especificacion = dict(variable='presion', producto='destilado', compuesto=0,
+                              fraccion=0.97)
+        with pytest.raises(ValueError):
+            crear_torre(especificacion=especificacion).simular()
+
+
+class TestArranqueEnCaliente:
+    def test_interpolar_platos(self):
+        perfil = np.array([[0., 1.], [1., 3.], [2., 5.]])
+        np.testing.assert_allclose(interpolar_platos(perfil, 5),
+                                   [[0, 1], [0.5, 2], [1, 3], [1.5, 4], [2, 5]])
+        copia = interpolar_platos(perfil, 3)
+        assert copia is not perfil and (copia == perfil).all()
+
+    @pytest.mark.parametrize('metodo', ['punto_burbuja', 'naphtali_sandholm'])
+    def test_cambio_reflujo(self, metodo):
+        anterior = crear_torre(metodo).simular()
+        esperado = crear_torre(metodo, reflujo=1.53).simular()
+        resultado = crear_torre(metodo, reflujo=1.53, estado_inicial=anterior).simular()
+        assert (resultado['contador_ciclo_vapor'] + resultado['contador_ciclo_temperatura']
+                < esperado['contador_ciclo_vapor'] + esperado['contador_ciclo_temperatura'])
+        np.testing.assert_allclose(resultado['temperatura'], esperado['temperatura'],
+                                   atol=0.01)
+
+    def test_condensador_total(self):
+        anterior = crear_torre()
+        anterior.condensador = 'Total'
+        esperado = crear_torre(reflujo=1.55)
+        esperado.condensador = 'Total'
+        torre = crear_torre(reflujo=1.55, estado_inicial=anterior.simular())
+        torre.condensador = 'Total'
+        resultado, esperado = torre.simular(), esperado.simular()
+        assert resultado['vapor'][0] == approx(50 * 2.55)
+        np.testing.assert_allclose(resultado['vapor'], esperado['vapor'], rtol=1e-3)
+        np.testing.assert_allclose(resultado['temperatura'], esperado['temperatura'],
+                                   atol=0.01)
+
+    def test_cambio_numero_platos(self):
+        anterior = crear_torre().simular()
+        torre = crear_torre('naphtali_sandholm', numero_platos=14, estado_inicial=anterior)
+        torre.alimentaciones[0][0] = 7
+        esperado = crear_torre('naphtali_sandholm', numero_platos=14,
+                               alimentaciones=torre.alimentaciones).simular()
+        resultado = torre.simular()
+        np.testing.assert_allclose(resultado['temperatura'], esperado['temperatura'],
+                                   atol=1e-6)
+
+    def test_compuestos_distintos(self, punto_burbuja):
+        estado = dict(punto_burbuja, fraccion_liquido=np.ones((10, 3)) / 3)
+        assert crear_torre(estado_inicial=estado).perfil_inicial() is None
+
+    def test_continuacion(self):
+        torre = crear_torre('naphtali_sandholm')
+        camino = continuacion(torre, 'reflujo', 3, pasos=3)
+        assert [valor for valor, _ in camino] == approx([1.5, 2, 2.5, 3])
+        assert torre.reflujo == 3 and torre.estado_inicial is camino[-1][1]
+        esperado = crear_torre('naphtali_sandholm', reflujo=3).simular()
+        np.testing.assert_allclose(camino[-1][1]['temperatura'], esperado['temperatura'],
+                                   atol=1e-6)
+        # Cada paso parte de la solución anterior
+        assert all(resultado['contador_ciclo_vapor'] <= 3 for _, resultado in camino[1:])
+
+    def test_continuacion_reduce_paso(self, monkeypatch):
+        torre = crear_torre('naphtali_sandholm')
+        simular = DestilacionSemiRigurosa.simular
+
+        def simular_limitado(self):
+            # Solo convergen los cambios de reflujo menores a 0.3
+            if abs(self.reflujo - self.estado_inicial['vapor'][1] / self.destilado + 1) > 0.3:
+                raise RuntimeError('No converge')
+            return simular(self)
+
+        torre.estado_inicial = torre.simular()
+        monkeypatch.setattr(DestilacionSemiRigurosa, 'simular', simular_limitado)
+        camino = continuacion(torre, 'reflujo', 2.5, pasos=2)
+        assert camino[-1][0] == approx(2.5)
+        assert len(camino) > 3
+        with pytest.raises(RuntimeError):
+            continuacion(torre, 'reflujo', 5, pasos=1, reducciones=1)
+        assert torre.reflujo == approx(2.5)
+
+
+class TestNaphtaliSandholm:
+    def test_igual_a_punto_burbuja(self, punto_burbuja):
+        resultado = crear_torre('naphtali_sandholm').simular()
+        assert resultado.keys() == punto_burbuja.keys()
+        np.testing.assert_allclose(resultado['temperatura'], punto_burbuja['temperatura'],
+                                   atol=0.01)
+        np.testing.assert_allclose(resultado['vapor'], punto_burbuja['vapor'], rtol=1e-3)
+        np.testing.assert_allclose(resultado['fraccion_liquido'],
+                                   punto_burbuja['fraccion_liquido'], atol=1e-3)
+        np.testing.assert_allclose(resultado['calor'], punto_burbuja['calor'], rtol=1e-4)
+
+    def test_residuos_mesh(self):
+        torre = crear_torre('naphtali_sandholm')
+        resultado = torre.simular()
+        v = resultado['vapor'][:, np.newaxis] * resultado['fraccion_vapor']
+        l = resultado['liquido'][:, np.newaxis] * resultado['fraccion_liquido']
+        residuos = SistemaMESH(torre).residuos(v, l, resultado['temperatura'])
+        assert np.abs(residuos).max() < 1e-9
+
+    def test_jacobiano(self):
+        """El jacobiano analitico coincide con el de diferencias finitas"""
+        torre = crear_torre('naphtali_sandholm', numero_platos=4)
+        torre.alimentaciones[0][0] = 2
+        sistema = SistemaMESH(torre)
+        rng = np.random.default_rng(0)
+        v = rng.uniform(10, 50, (4, 2))
+        l = rng.uniform(10, 50, (4, 2))
+        T = np.array([355, 360, 365, 370.])
+        inferior, diagonal, superior = sistema.jacobiano(v, l, T)
+        base = sistema.residuos(v, l, T)
+        h = 1e-6
+        for plato in range(4):
+            for variable in range(5):
+                v2, l2, T2 = v.copy(), l.copy(), T.copy()
+                if variable < 2:
+                    v2[plato, variable] += h
+                elif variable < 4:
+                    l2[plato, variable - 2] += h
+                else:
+                    T2[plato] += h
+                derivada = (sistema.residuos(v2, l2, T2) - base) / h
+                np.testing.assert_allclose(derivada[plato], diagonal[plato, :, variable],
+                                           atol=1e-6)
+                if plato > 0:
+                    np.testing.assert_allclose(derivada[plato - 1],
+                                               superior[plato - 1, :, variable], atol=1e-6)
+                if plato < 3:
+                    np.testing.assert_allclose(derivada[plato + 1],
+                                               inferior[plato + 1, :, variable], atol=1e-6)
+
+
+class TestInsideOut:
+    def test_igual_a_naphtali_sandholm(self):
+        esperado = crear_torre('naphtali_sandholm').simular()
+        resultado = crear_torre('inside_out').simular()
+        assert resultado.keys() == esperado.keys()
+        np.testing.assert_allclose(resultado['temperatura'], esperado['temperatura'],
+                                   atol=1e-4)
+        np.testing.assert_allclose(resultado['vapor'], esperado['vapor'], rtol=1e-6)
+        np.testing.assert_allclose(resultado['fraccion_liquido'],
+                                   esperado['fraccion_liquido'], atol=1e-6)
+
+    def test_modelo_aproximado(self):
+        """En el perfil de referencia los modelos reproducen las propiedades rigurosas"""
+        torre = crear_torre()
+        paquete = torre.propiedades
+        T = np.array([355, 365, 375.])
+        x = np.array([[0.8, 0.2], [0.5, 0.5], [0.2, 0.8]])
+        y = np.array([[0.9, 0.1], [0.7, 0.3], [0.4, 0.6]])
+        modelo = ModeloAproximado(paquete, T, x, y, 101325)
+        np.testing.assert_allclose(modelo.coeficiente_reparto(T),
+                                   paquete.coeficiente_reparto(T, 101325))
+        np.testing.assert_allclose(modelo.entalpias(T)[1], paquete.entalpia_vapor(y, T))
+        # Cerca del perfil de referencia el error es pequeño
+        np.testing.assert_allclose(modelo.coeficiente_reparto(T + 0.5),
+                                   paquete.coeficiente_reparto(T + 0.5, 101325), rtol=5e-3)
+
+
+def crear_torre_amplia(metodo):
+    """Torre con compuestos de volatilidades muy distintas"""
+    compuestos = ['Hexane', 'Octane', 'Dodecane']
+    paquete = GestorPaquetes(compuestos)
+    paquete.preparar()
+    alimentacion = CorrienteMateria('alimentacion', compuestos, paquete, flujo=100,
+                                    temperatura=300, composicion=[0.3, 0.3, 0.4],
+                                    presion=101325)
+    return DestilacionSemiRigurosa(numero_platos=12, destilado=30, reflujo=2,
+                                   alimentaciones=[[6, alimentacion]],
+                                   paquete_termodinamico=paquete, metodo=metodo)
+
+
+class TestSumaFlujos:
+    def test_igual_a_naphtali_sandholm(self):
+        esperado = crear_torre('naphtali_sandholm').simular()
+        resultado = crear_torre('suma_flujos').simular()
+        np.testing.assert_allclose(resultado['temperatura'], esperado['temperatura'],
+                                   atol=1e-6)
+        np.testing.assert_allclose(resultado['vapor'], esperado['vapor'], rtol=1e-6)
+        np.testing.assert_allclose(resultado['fraccion_liquido'],
+                                   esperado['fraccion_liquido'], atol=1e-6)
+
+    def test_volatilidades_amplias(self, monkeypatch):
+        """El metodo del punto de burbuja no converge en esta torre desde el perfil simple"""
+        with monkeypatch.context() as parche:
+            parche.setattr(DestilacionSemiRigurosa, 'inicializacion', 'simple')
+            with pytest.raises(RuntimeError):
+                crear_torre_amplia('punto_burbuja').simular()
+        esperado = crear_torre_amplia('naphtali_sandholm').simular()
+        resultado = crear_torre_amplia('suma_flujos').simular()
+        np.testing.assert_allclose(resultado['temperatura'], esperado['temperatura'],
+                                   atol=1e-6)
+        np.testing.assert_allclose(resultado['vapor'], esperado['vapor'], rtol=1e-6)
+        np.testing.assert_allclose(resultado['calor'], esperado['calor'], rtol=1e-6)
+
+    def test_paso_rechazado(self):
+        """Si ninguna reducción del paso es factible no se retorna un punto infactible"""
+        torre = crear_torre('suma_flujos')
+        sistema = SistemaSumaFlujos(torre)
+        _, l, T = estimacion_inicial(torre)
+        variables = np.concatenate((T, l[1:-1].sum(axis=1)))
+        paso = np.concatenate((np.zeros(sistema.N), np.full(variables.size - sistema.N, -1e6)))
+        with pytest.raises(RuntimeError):
+            sistema.avanzar(variables, paso, np.inf)
@@ -0,0 +1,70 @@
+"""Pruebas para los calculos flash vectorizados"""
+
+from pytest import approx, raises
+
+import numpy as np
+
+from simnav.termodinamica import flash
+from simnav.termodinamica.paquetes import PaqueteIdeal
+
+
+class TestRachfordRice:
+
+    def test_regiones(self):
+        composicion = np.array([0.5, 0.5])
+        K = np.array([[0.5, 0.8], [2, 0.5], [3, 2]])
+        calidad = flash.rachford_rice(composicion, K)
+        assert calidad[0] == 0  # Liquido subenfriado
+        assert calidad[2] == 1  # Vapor sobrecalentado
+        # Solucion analitica para dos compuestos
+        assert np.sum(composicion * (K[1] - 1) / (1 + calidad[1] * (K[1] - 1))) == approx(0)
+
+    def test_composiciones_fases(self):
+        composicion = np.array([0.3, 0.3, 0.4])
+        K = np.array([3.0, 1.2, 0.3])
+        calidad = flash.rachford_rice(composicion, K)
+        x, y = flash.composiciones_fases(composicion, K, calidad)
+        assert y == approx(K * x)
+        assert calidad * y + (1 - calidad) * x == approx(composicion)
+
+
+class TestFlash:
+    compuestos = ['Benzene', 'Toluene', 'Heptane']
+    composicion = np.random.RandomState(0).dirichlet(np.ones(3), 200)
+    temperaturas = np.random.RandomState(1).uniform(340, 400, 200)
+    presion = 101325
+
+    def paquete(self):
+        paquete = PaqueteIdeal(self.compuestos)
+        paquete.preparar()
+        return paquete
+
+    def test_flash_pt_escalar(self):
+        paquete = self.paquete()
+        resultado = flash.flash_pt(paquete, self.composicion[0], self.temperaturas[0],
+                                   self.presion)
+        assert resultado['calidad_vapor'] == approx(paquete.calidad_vapor(
+            self.composicion[0], self.temperaturas[0], self.presion))
+
+    def test_flash_ph(self):
+        """El flash adiabatico debe recuperar la temperatura del flash isotermico"""
+        paquete = self.paquete()
+        resultado = flash.flash_pt(paquete, self.composicion, self.temperaturas, self.presion)
+        adiabatico = flash.flash_ph(paquete, self.composicion, resultado['entalpia'],
+                                    self.presion)
+        assert adiabatico['temperatura'] == approx(self.temperaturas)
+
+    def test_flash_pq(self):
+        paquete = self.paquete()
+        resultado = flash.flash_pt(paquete, self.composicion, self.temperaturas, self.presion)
+        bifasico = (resultado['calidad_vapor'] > 0) & (resultado['calidad_vapor'] < 1)
+        calidad = flash.flash_pq(paquete, self.composicion[bifasico],
+                                 resultado['calidad_vapor'][bifasico], self.presion)
+        assert calidad['temperatura'] == approx(self.temperaturas[bifasico])
+
+        burbuja = flash.flash_pq(paquete, self.composicion[:5], 0, self.presion)
+        assert burbuja['temperatura'] == approx(
+            paquete.temperatura_burbuja(self.composicion[:5], self.presion))
+
+        with raises(ValueError):
+            flash.flash_pq(paquete, self.composicion[0], 1.5, self.presion)
@@ -0,0 +1,186 @@
+"""Pruebas para las correlaciones ideales y los modos de calculo del paquete ideal"""
+
+from pytest import approx
+
+import numpy as np
+
+from simnav.termodinamica import ideal
+from simnav.termodinamica.paquetes import PaqueteIdeal
+
+
+class TestIntegralesAnaliticas:
+    """Compara las integrales analiticas de cp contra la integración numerica"""
+
+    def test_cp_polinomial(self):
+        coeficientes = (35978.0, -101.69, 0.939, 0.0, 0.0)
+        ecuacion = lambda T: ideal.cp_polinomial(T, *coeficientes)
+        assert ideal.entalpia_cp_polinomial(60, 190, *coeficientes) == approx(
+            ideal.entalpia_cp(60, 190, ecuacion))
+
+    def test_cp_hiperbolico(self):
+        coeficientes = (44767.0, 230850.0, 1479.2, 168360.0, 677.66)
+        ecuacion = lambda T: ideal.cp_hiperbolico(T, *coeficientes)
+        assert ideal.entalpia_cp_hiperbolico(300, 900, *coeficientes) == approx(
+            ideal.entalpia_cp(300, 900, ecuacion))
+
+    def test_cp_liquido2(self):
+        coeficientes = (61.26, 314410.0, 1824.6, -2547.9)
+        ecuacion = lambda T: ideal.cp_liquido2(T, 540.2, *coeficientes)
+        assert ideal.entalpia_cp_liquido2(300, 400, 540.2, *coeficientes) == approx(
+            ideal.entalpia_cp(300, 400, ecuacion))
+
+
+class TestModosCalculo:
+    """El modo analitico debe reproducir el modo de referencia por cuadratura"""
+
+    compuestos = ['Benzene', 'Toluene', 'Heptane', 'Acetaldehyde']
+    temperaturas = np.array([150, 250, 300, 350, 420])
+
+    def paquetes(self):
+        analitico = PaqueteIdeal(self.compuestos)
+        cuadratura = PaqueteIdeal(self.compuestos, modo_calculo='cuadratura')
+        analitico.preparar()
+        cuadratura.preparar()
+        return analitico, cuadratura
+
+    def test_entalpia_liquido_puro(self):
+        analitico, cuadratura = self.paquetes()
+        assert analitico.entalpia_liquido_puro(self.temperaturas) == approx(
+            cuadratura.entalpia_liquido_puro(self.temperaturas))
+
+    def test_entalpia_vapor_puro(self):
+        analitico, cuadratura = self.paquetes()
+        assert analitico.entalpia_vapor_puro(self.temperaturas) == approx(
+            cuadratura.entalpia_vapor_puro(self.temperaturas))
+        assert analitico.entalpia_vapor_puro(400) == approx(
+            cuadratura.entalpia_vapor_puro(400))
+
+
+class TestCoeficientesEmpaquetados:
+    """Las propiedades evaluadas con los coeficientes empaquetados deben coincidir con la
+    evaluación compuesto a compuesto usando los parametros de la base de datos"""
+
+    compuestos = ['Benzene', 'Toluene', 'Heptane']
+    temperaturas = np.array([300, 350, 400])
+
+    def test_presion_vapor(self):
+        paquete = PaqueteIdeal(self.compuestos)
+        paquete.preparar()
+        presiones_vapor = paquete.presion_vapor(self.temperaturas)
+        for j, p in enumerate(paquete.parametros.antoine()):
+            assert presiones_vapor[:, j] == approx(
+                ideal.antoine(self.temperaturas, p.C1, p.C2, p.C3, p.C4, p.C5))
+
+    def test_coeficiente_reparto_perfil_presiones(self):
+        paquete = PaqueteIdeal(self.compuestos)
+        paquete.preparar()
+        presiones = np.array([101325, 150000, 200000])
+        K = paquete.coeficiente_reparto(self.temperaturas, presiones)
+        for i, presion in enumerate(presiones):
+            assert K[i] == approx(paquete.presion_vapor(self.temperaturas[i]) / presion)
+
+
+class TestPuntosSaturacionLote:
+    """Los puntos de burbuja y rocio resueltos para todas las filas a la vez deben coincidir
+    con la solución escalar fila por fila"""
+
+    compuestos = ['Benzene', 'Toluene', 'Heptane']
+    composicion = np.array([[0.5, 0.3, 0.2], [0.2, 0.3, 0.5], [0, 0, 1]])
+    presiones = np.array([101325, 200000, 500000])
+
+    def paquete(self):
+        paquete = PaqueteIdeal(self.compuestos)
+        paquete.preparar()
+        return paquete
+
+    def test_temperatura_burbuja(self):
+        paquete = self.paquete()
+        temperaturas, iteraciones = paquete.temperatura_burbuja(
+            self.composicion, self.presiones, retornar_iteraciones=True)
+        for i in range(self.presiones.size):
+            K = paquete.coeficiente_reparto(temperaturas[i], self.presiones[i])
+            assert np.sum(K * self.composicion[i]) == approx(1)
+            assert temperaturas[i] == approx(
+                paquete.temperatura_burbuja(self.composicion[i], self.presiones[i]))
+        assert iteraciones.shape == (3,)
+
+    def test_temperatura_rocio(self):
+        paquete = self.paquete()
+        temperaturas = paquete.temperatura_rocio(self.composicion, self.presiones)
+        for i in range(self.presiones.size):
+            K = paquete.coeficiente_reparto(temperaturas[i], self.presiones[i])
+            assert np.sum(self.composicion[i] / K) == approx(1)
+
+    def test_temperatura_inicial(self):
+        """Partir de una solución cercana reduce las iteraciones"""
+        paquete = self.paquete()
+        temperaturas, iteraciones = paquete.temperatura_burbuja(
+            self.composicion, self.presiones, retornar_iteraciones=True)
+        temperaturas_previas, iteraciones_previas = paquete.temperatura_burbuja(
+            self.composicion, self.presiones, temperatura_inicial=temperaturas + 0.5,
+            retornar_iteraciones=True)
+        assert temperaturas_previas == approx(temperaturas)
+        assert np.all(iteraciones_previas <= iteraciones)
+
+
+class TestDerivadas:
+    """Las derivadas analiticas deben coincidir con diferencias finitas centradas"""
+
+    compuestos = ['Benzene', 'Toluene', 'Heptane', 'Propane']
+    temperaturas = np.array([150, 300, 350, 365])  # Por debajo de Tc del propano
+    h = 1e-4
+
+    def paquete(self):
+        paquete = PaqueteIdeal(self.compuestos)
+        paquete.preparar()
+        return paquete
+
+    def diferencia_finita(self, funcion):
+        return (funcion(self.temperaturas + self.h)
+                - funcion(self.temperaturas - self.h)) / (2 * self.h)
+
+    def test_derivada_presion_vapor(self):
+        paquete = self.paquete()
+        assert paquete.derivada_presion_vapor(self.temperaturas) == approx(
+            self.diferencia_finita(paquete.presion_vapor), rel=1e-6)
+        assert paquete.derivada_coeficiente_reparto(self.temperaturas, 101325) == approx(
+            self.diferencia_finita(paquete.presion_vapor) / 101325, rel=1e-6)
+
+    def test_derivadas_entalpia(self):
+        paquete = self.paquete()
+        assert paquete.derivada_entalpia_liquido_puro(self.temperaturas) == approx(
+            self.diferencia_finita(paquete.entalpia_liquido_puro), rel=1e-6)
+        assert paquete.derivada_entalpia_vapor_puro(self.temperaturas) == approx(
+            self.diferencia_finita(paquete.entalpia_vapor_puro), rel=1e-6)
+
+    def test_temperatura_saturacion(self):
+        paquete = self.paquete()
+        temperaturas = paquete.temperatura_saturacion(200000)
+        assert np.diag(paquete.presion_vapor(temperaturas)) == approx(200000)
+
+
+class TestEstado:
+    """La clasificación de fase debe coincidir con la comparación contra los puntos de
+    burbuja y rocio"""
+
+    compuestos = ['Benzene', 'Toluene']
+    composicion = np.array([0.5, 0.5])
+
+    def test_estado(self):
+        paquete = PaqueteIdeal(self.compuestos)
+        paquete.preparar()
+        burbuja = paquete.temperatura_burbuja(self.composicion, 101325)
+        rocio = paquete.temperatura_rocio(self.composicion, 101325)
+
+        assert paquete.estado(self.composicion, burbuja - 0.01, 101325) == 'Liquido'
+        assert paquete.estado(self.composicion, (burbuja + rocio) / 2, 101325,
+                              como_numero=True) == 2
+        assert paquete.estado(self.composicion, rocio + 0.01, 101325) == 'Vapor'
+
+    def test_estado_lote(self):
+        paquete = PaqueteIdeal(self.compuestos)
+        paquete.preparar()
+        composiciones = np.array([[0.5, 0.5], [0.2, 0.8], [0.9, 0.1]])
+        temperaturas = np.array([300, 377, 420])
+        estados = paquete.estado(composiciones, temperaturas, 101325, como_numero=True)
+        assert list(estados) == [0, 2, 1]
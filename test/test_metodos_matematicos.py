@@ -0,0 +1,118 @@
+"""Pruebas para los metodos matematicos de simnav"""
+
+from pytest import approx, raises
+
+import numpy as np
+
+from simnav.metodos_matematicos import (newton_vectorizado, metodo_tomas, metodo_tomas_lote,
+                                        metodo_tomas_bloques, AceleradorPuntoFijo, punto_fijo)
+
+
+class TestNewtonVectorizado:
+
+    def test_raices(self):
+        objetivos = np.array([2, 9, 16, 100])
+
+        def funcion(x, activos):
+            return x ** 2 - objetivos[activos], 2 * x
+
+        raices, iteraciones = newton_vectorizado(funcion, np.ones(4))
+        assert raices == approx(np.sqrt(objetivos))
+        # Las filas convergen de forma independiente
+        assert iteraciones[0] < iteraciones[-1]
+
+    def test_no_converge(self):
+        with raises(RuntimeError):
+            newton_vectorizado(lambda x, activos: (x ** 2 + 1, 2 * x), np.array([0.5]))
+
+
+class TestMetodoTomasLote:
+    N, M = 12, 4
+
+    def sistema(self):
+        rng = np.random.default_rng(0)
+        a = rng.random((self.N, self.M))
+        c = rng.random((self.N, self.M))
+        b = -(a + c + 1)  # Diagonal dominante
+        d = rng.random((self.N, self.M))
+        return a, b, c, d
+
+    def test_igual_a_metodo_tomas(self):
+        a, b, c, d = self.sistema()
+        x = metodo_tomas_lote(a, b, c, d)
+        for j in range(self.M):
+            assert x[:, j] == approx(metodo_tomas(a[:, j].copy(), b[:, j].copy(),
+                                                  c[:, j].copy(), d[:, j].copy()))
+
+    def test_no_modifica_argumentos(self):
+        sistema = self.sistema()
+        copias = [array.copy() for array in sistema]
+        metodo_tomas_lote(*sistema)
+        for array, copia in zip(sistema, copias):
+            np.testing.assert_array_equal(array, copia)
+
+    def test_scipy(self):
+        a, b, c, d = self.sistema()
+        assert metodo_tomas_lote(a, b, c, d, metodo='scipy') == approx(
+            metodo_tomas_lote(a, b, c, d))
+        # Matriz compartida por todas las columnas
+        assert metodo_tomas_lote(a[:, 0], b[:, 0], c[:, 0], d, metodo='scipy') == approx(
+            metodo_tomas_lote(a[:, 0], b[:, 0], c[:, 0], d))
+
+
+class TestMetodoTomasBloques:
+    def test_sistema_completo(self):
+        rng = np.random.default_rng(0)
+        N, n = 6, 3
+        a, c = rng.normal(size=(N, n, n)), rng.normal(size=(N, n, n))
+        b = rng.normal(size=(N, n, n)) + 5 * np.eye(n)
+        d = rng.normal(size=(N, n))
+        matriz = np.zeros((N * n, N * n))
+        for i in range(N):
+            matriz[i * n:(i + 1) * n, i * n:(i + 1) * n] = b[i]
+            if i > 0:
+                matriz[i * n:(i + 1) * n, (i - 1) * n:i * n] = a[i]
+            if i < N - 1:
+                matriz[i * n:(i + 1) * n, (i + 1) * n:(i + 2) * n] = c[i]
+        x = metodo_tomas_bloques(a, b, c, d)
+        np.testing.assert_allclose(x.ravel(), np.linalg.solve(matriz, d.ravel()))
+
+
+class TestAceleradorPuntoFijo:
+    # Función lineal g(x) = A·x + b con convergencia lenta por sustitución
+    A = np.diag([0.95, 0.9, 0.5, -0.3])
+    A[0, 1] = A[1, 0] = 0.02
+    b = np.array([1., 2., 3., 4.])
+
+    def g(self, x):
+        return self.A @ x + self.b
+
+    def test_metodos(self):
+        solucion = np.linalg.solve(np.eye(4) - self.A, self.b)
+        _, iteraciones_sustitucion = punto_fijo(self.g, np.zeros(4), metodo='sustitucion',
+                                                max_iteraciones=1000)
+        for metodo in ('anderson', 'broyden', 'wegstein'):
+            x, iteraciones = punto_fijo(self.g, np.zeros(4), metodo=metodo)
+            assert x == approx(solucion)
+            assert iteraciones < iteraciones_sustitucion / 2
+
+    def test_limite_inferior(self):
+        acelerador = AceleradorPuntoFijo('anderson', inferior=0)
+        x = acelerador.siguiente(np.array([1., 1.]), np.array([2., 0.5]))
+        # Un paso acelerado con valores negativos se reemplaza por la sustitución
+        acelerador._anderson = lambda *argumentos: np.array([-1., 1.])
+        x_nuevo = acelerador.siguiente(x, np.array([2., 0.4]))
+        assert x_nuevo == approx([2., 0.4])
+        assert acelerador.reinicios == 1
+
+    def test_paso_maximo(self):
+        acelerador = AceleradorPuntoFijo('sustitucion', paso_maximo=1)
+        assert acelerador.siguiente(np.zeros(2), np.array([4., 2.])) == approx([1., 0.5])
+
+    def test_no_converge(self):
+        with raises(RuntimeError):
+            punto_fijo(lambda x: 2 * x + 1, np.zeros(2), metodo='sustitucion')
+
+    def test_metodo_inexistente(self):
+        with raises(ValueError):
+            AceleradorPuntoFijo('secante')
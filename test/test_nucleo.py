@@ -0,0 +1,107 @@
+"""Pruebas para el nucleo compilado del paquete ideal"""
+
+import multiprocessing
+import os
+import pickle
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from pytest import approx
+
+from simnav.termodinamica import PaqueteIdeal, NucleoIdeal
+
+
+def temperatura_burbuja(nucleo):
+    return nucleo.temperatura_burbuja(np.array([0.5, 0.5]), 101325)
+
+
+def ejecutar(programa, *argumentos):
+    """Ejecuta un programa en un interprete nuevo, con su propio resource_tracker"""
+    entorno = dict(os.environ, PYTHONPATH=os.getcwd())
+    return subprocess.run([sys.executable, '-c', programa, *argumentos], env=entorno,
+                          capture_output=True, text=True, timeout=120)
+
+
+class TestNucleoIdeal:
+    compuestos = ['Benzene', 'Toluene', 'Heptane']
+    temperaturas = np.array([300, 350, 400])
+    composicion = np.array([[0.5, 0.3, 0.2], [0.2, 0.3, 0.5]])
+
+    def paquete(self):
+        paquete = PaqueteIdeal(self.compuestos)
+        paquete.preparar()
+        return paquete
+
+    def test_propiedades(self):
+        paquete = self.paquete()
+        nucleo = paquete.compilar()
+        for propiedad in ('presion_vapor', 'entalpia_liquido_puro', 'entalpia_vapor_puro',
+                          'derivada_entalpia_vapor_puro'):
+            assert getattr(nucleo, propiedad)(self.temperaturas) == approx(
+                getattr(paquete, propiedad)(self.temperaturas))
+        assert nucleo.temperatura_burbuja(self.composicion, 101325) == approx(
+            paquete.temperatura_burbuja(self.composicion, 101325))
+        assert nucleo.entalpia_vaporizacion() == approx(paquete.entalpia_vaporizacion())
+
+    def test_entalpia_vaporizacion_guardada(self):
+        paquete = self.paquete()
+        assert paquete.entalpia_vaporizacion() is paquete._entalpias_vaporizacion
+
+    def test_inmutable(self):
+        nucleo = self.paquete().compilar()
+        with pytest.raises(AttributeError):
+            nucleo.compuestos = ['Benzene']
+        with pytest.raises(ValueError):
+            nucleo.coeficientes.antoine[0, 0] = 0
+
+    def test_serializacion(self):
+        nucleo = self.paquete().compilar()
+        copia = pickle.loads(pickle.dumps(nucleo))
+        assert copia.compuestos == nucleo.compuestos
+        assert copia.presion_vapor(self.temperaturas) == approx(
+            nucleo.presion_vapor(self.temperaturas))
+        assert len(pickle.dumps(nucleo)) < 4096
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='Requiere fork')
+    def test_memoria_compartida(self):
+        nucleo = PaqueteIdeal(['Benzene', 'Toluene']).compilar()
+        compartido = nucleo.compartir()
+        try:
+            # Solo se serializa el nombre del bloque de memoria
+            assert len(pickle.dumps(compartido)) < len(pickle.dumps(nucleo))
+            with multiprocessing.get_context('fork').Pool(2) as pool:
+                resultados = pool.map(temperatura_burbuja, [compartido] * 4)
+            assert resultados == approx([temperatura_burbuja(nucleo)] * 4)
+        finally:
+            compartido.liberar()
+
+    def test_proceso_independiente(self):
+        """Un proceso con otro resource_tracker no elimina el bloque al terminar"""
+        from multiprocessing import shared_memory
+        compartido = PaqueteIdeal(['Benzene', 'Toluene']).compilar().compartir()
+        try:
+            salida = ejecutar('import pickle, sys; '
+                              'print(pickle.loads(bytes.fromhex(sys.argv[1])).compuestos)',
+                              pickle.dumps(compartido).hex())
+            assert salida.returncode == 0 and salida.stderr == ''
+            shared_memory.SharedMemory(name=compartido._memoria_compartida.name).close()
+        finally:
+            compartido.liberar()
+
+    def test_procesos_sin_avisos(self):
+        """Los procesos de un pool comparten el resource_tracker del creador del bloque, que
+        lo elimina sin errores ni avisos de bloques perdidos"""
+        programa = (
+            'import multiprocessing, numpy as np\n'
+            'from simnav.termodinamica import PaqueteIdeal\n'
+            'from test.test_nucleo import temperatura_burbuja\n'
+            'if __name__ == "__main__":\n'
+            '    compartido = PaqueteIdeal(["Benzene", "Toluene"]).compilar().compartir()\n'
+            '    with multiprocessing.get_context("spawn").Pool(2) as pool:\n'
+            '        print(pool.map(temperatura_burbuja, [compartido] * 4))\n'
+            '    compartido.liberar()\n')
+        salida = ejecutar(programa)
+        assert salida.returncode == 0, salida.stderr
+        assert salida.stderr == ''
@@ -0,0 +1,157 @@
+"""Pruebas para la carga de parametros desde la base de datos"""
+
+import multiprocessing
+import os
+import shutil
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+import sqlalchemy
+
+from simnav.datos import propiedades, instantanea
+from simnav.datos.db import session, Antoine
+from simnav.datos.propiedades import GestorParametros, Parametros
+from simnav.errores import CompuestoNoEncontrado
+
+
+def origen_bloqueado():
+    raise AssertionError('Se consulto la base de datos')
+
+
+class TestGestorParametros:
+    compuestos = ['Toluene', 'Benzene', 'Heptane']
+
+    def test_orden_compuestos(self):
+        gestor = GestorParametros(self.compuestos)
+        antoine = gestor.antoine()
+        assert list(antoine.NAME) == [compuesto.upper() for compuesto in self.compuestos]
+        for fila, compuesto_id in zip(antoine, gestor.compuestos_id):
+            orm = session.query(Antoine).get(compuesto_id)
+            assert (fila.C1, fila.C2, fila.TminK) == (orm.C1, orm.C2, orm.TminK)
+
+    def test_filas_faltantes(self):
+        """El tolueno no posee parametros de cp de gas polinomial"""
+        cp_gas = GestorParametros(self.compuestos).cp_gas_polinomial()
+        assert list(cp_gas.disponible) == [False, True, False]
+        assert np.isnan(cp_gas[0].C1)
+
+    def test_cache_proceso(self, monkeypatch):
+        GestorParametros(self.compuestos).cargar()
+        monkeypatch.setattr(propiedades, 'obtener_instantanea', origen_bloqueado)
+        gestor = GestorParametros([compuesto.lower() for compuesto in self.compuestos])
+        gestor.cargar()
+        assert gestor.temperaturas_criticas().shape == (3,)
+
+    def test_compuesto_inexistente(self):
+        with pytest.raises(CompuestoNoEncontrado):
+            GestorParametros(['Benzene', 'Kryptonita'])
+
+    def test_parametros_compuesto(self):
+        parametros = Parametros('Benzene')
+        assert parametros.antoine().C1 == GestorParametros(['Benzene']).antoine()[0].C1
+
+
+class TestInstantanea:
+    compuestos = ['Benzene', 'Toluene', 'Heptane']
+
+    @pytest.fixture
+    def base_datos(self, tmp_path):
+        ruta = tmp_path / 'propiedades.sqlite'
+        shutil.copy('propiedades.sqlite', ruta)
+        return ruta
+
+    @pytest.fixture
+    def sin_instantanea(self):
+        propiedades.usar_instantanea(False)
+        yield
+        propiedades.usar_instantanea(True)
+
+    def test_mismos_datos_que_sqlalchemy(self, sin_instantanea):
+        gestor_sqlalchemy = GestorParametros(self.compuestos)
+        gestor_sqlalchemy.cargar()
+        propiedades.usar_instantanea(True)
+        gestor_instantanea = GestorParametros(self.compuestos)
+        gestor_instantanea.cargar()
+        for atributo in GestorParametros.tablas_parametros.values():
+            esperado, obtenido = (getattr(gestor_sqlalchemy, atributo),
+                                  getattr(gestor_instantanea, atributo))
+            assert esperado.dtype == obtenido.dtype
+            for nombre in esperado.dtype.names:
+                if esperado.dtype[nombre].kind == 'f':
+                    np.testing.assert_array_equal(esperado[nombre], obtenido[nombre])
+                else:
+                    assert list(esperado[nombre]) == list(obtenido[nombre])
+
+    def test_ruta_independiente_de_carpeta(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        assert instantanea.buscar_base_datos() == instantanea.RUTA_BASE_DATOS
+        assert instantanea.RUTA_BASE_DATOS.is_absolute()
+        assert instantanea.RUTA_BASE_DATOS.stat().st_size > 0
+
+    def test_mmap(self, base_datos):
+        datos = instantanea.cargar_instantanea(base_datos)
+        assert isinstance(datos.tabla('componentes'), np.memmap)
+        assert len(datos.compuestos) == datos.tabla('componentes').size
+
+    def test_ruta_con_caracteres_especiales(self, tmp_path):
+        ruta = tmp_path / 'datos #1' / 'propiedades?100%.sqlite'
+        ruta.parent.mkdir()
+        shutil.copy('propiedades.sqlite', ruta)
+        datos = instantanea.cargar_instantanea(ruta)
+        assert len(datos.compuestos) == 345
+
+    def test_regenerar_instantanea_vieja(self, base_datos):
+        datos = instantanea.cargar_instantanea(base_datos)
+        benceno = datos.compuestos['BENZENE']
+        with sqlite3.connect(base_datos) as conexion:
+            conexion.execute('UPDATE Constantes_criticas_y_factores_acentricos SET Tc = 1 '
+                             'WHERE id = ?', (benceno,))
+        conexion.close()
+
+        assert instantanea.cargar_instantanea(base_datos, regenerar=False) is None
+        datos = instantanea.cargar_instantanea(base_datos)
+        fila, = datos.filas('Constantes_criticas_y_factores_acentricos', [benceno]).values()
+        assert fila[datos.tipo('Constantes_criticas_y_factores_acentricos').names.index(
+            'Tc')] == 1
+
+
+def contar_compuestos(_):
+    from simnav.datos.db import session, Componentes
+    return session.query(Componentes).count()
+
+
+class TestAccesoBaseDatos:
+    def test_solo_lectura(self):
+        from simnav.datos import db
+        with pytest.raises(Exception, match='readonly|read-only|query_only'):
+            db.session.execute(sqlalchemy.text('DELETE FROM componentes'))
+        db.session.rollback()
+
+    def test_mmap(self):
+        from simnav.datos import db
+        assert db.session.execute(sqlalchemy.text('PRAGMA mmap_size')).scalar() > 0
+
+    def test_hilos(self):
+        with ThreadPoolExecutor(4) as ejecutor:
+            assert set(ejecutor.map(contar_compuestos, range(8))) == {345}
+
+    def test_ruta_con_caracteres_especiales(self, tmp_path):
+        from simnav.datos.base_de_datos import read_only_engine
+        ruta = tmp_path / 'datos #1' / 'propiedades?100%.sqlite'
+        ruta.parent.mkdir()
+        shutil.copy('propiedades.sqlite', ruta)
+        motor = read_only_engine(ruta)
+        with motor.connect() as conexion:
+            assert conexion.execute(
+                sqlalchemy.text('SELECT COUNT(*) FROM componentes')).scalar() == 345
+        motor.dispose()
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='Requiere fork')
+    def test_procesos(self):
+        contar_compuestos(None)  # La conexion se crea antes del fork
+        contexto = multiprocessing.get_context('fork')
+        with contexto.Pool(2) as pool:
+            assert set(pool.map(contar_compuestos, range(4))) == {345}
+        assert contar_compuestos(None) == 345
@@ -0,0 +1,77 @@
+"""Pruebas para las tablas de Chebyshev del modo tabulado"""
+
+from pytest import approx
+
+import numpy as np
+
+from simnav.termodinamica.tablas import TablaChebyshev
+from simnav.termodinamica.paquetes import PaqueteIdeal
+
+
+class TestTablaChebyshev:
+
+    def test_aproximacion(self):
+        inferior, superior = np.array([0.0, 1.0]), np.array([1.0, 5.0])
+        tabla = TablaChebyshev(np.exp, inferior, superior, tolerancia=1e-12)
+        x = np.linspace(inferior, superior, 50)
+        assert tabla(x) == approx(np.exp(x), rel=1e-11)
+        assert tabla.derivada(x) == approx(np.exp(x), rel=1e-9)
+        assert np.all(tabla.error_maximo <= 1e-12)
+
+    def test_grado_por_compuesto(self):
+        tabla = TablaChebyshev(lambda x: x * [1, 0] + np.exp(x) * [0, 1], np.array([0.0, 0.0]),
+                               np.array([1.0, 10.0]))
+        assert tabla.grado[0] == TablaChebyshev.grados[0]
+        assert tabla.grado[1] > tabla.grado[0]
+        assert tabla.coeficientes.shape == (tabla.grado[1] + 1, 2)
+
+    def test_clenshaw(self):
+        """Con muchos puntos se usa la recurrencia de Clenshaw con el mismo resultado"""
+        inferior, superior = np.array([0.0, 1.0]), np.array([1.0, 5.0])
+        tabla = TablaChebyshev(np.exp, inferior, superior, tolerancia=1e-12)
+        x = np.linspace(inferior, superior, 20)
+        coseno = tabla(x), tabla.derivada(x)
+        tabla.terminos_coseno = 0
+        assert tabla(x) == approx(coseno[0], rel=1e-13)
+        assert tabla.derivada(x) == approx(coseno[1], rel=1e-12)
+
+    def test_rango(self):
+        tabla = TablaChebyshev(np.sin, np.array([0.0]), np.array([1.0]))
+        assert list(tabla.en_rango(np.array([[-0.1], [0.5], [1.1]]))[:, 0]) == [False, True,
+                                                                                False]
+
+
+class TestModoTabulado:
+    compuestos = ['Benzene', 'Toluene', 'Heptane', 'Propane']
+
+    def paquetes(self):
+        analitico = PaqueteIdeal(self.compuestos)
+        tabulado = PaqueteIdeal(self.compuestos, modo_calculo='tabulado')
+        analitico.preparar()
+        tabulado.preparar()
+        return analitico, tabulado
+
+    def test_propiedades(self):
+        analitico, tabulado = self.paquetes()
+        temperaturas = np.linspace(250, 360, 12)
+        assert tabulado.presion_vapor(temperaturas) == approx(
+            analitico.presion_vapor(temperaturas), rel=1e-8)
+        assert tabulado.entalpia_vapor_puro(temperaturas) == approx(
+            analitico.entalpia_vapor_puro(temperaturas), rel=1e-7)
+        assert tabulado.entalpia_liquido_puro(temperaturas) == approx(
+            analitico.entalpia_liquido_puro(temperaturas), rel=1e-7, abs=1e-3)
+        assert tabulado.temperatura_saturacion(200000) == approx(
+            analitico.temperatura_saturacion(200000), rel=1e-8)
+
+    def test_fuera_de_rango(self):
+        """Fuera del rango de las correlaciones se usa la correlación original"""
+        analitico, tabulado = self.paquetes()
+        assert tabulado.presion_vapor(5000) == approx(analitico.presion_vapor(5000))
+
+    def test_temperatura_burbuja(self):
+        """Los puntos de burbuja no usan las tablas y son iguales en ambos modos"""
+        analitico, tabulado = self.paquetes()
+        composicion = np.array([[0.25, 0.25, 0.25, 0.25], [0.1, 0.2, 0.7, 0]])
+        for presion in (101325, 5e5):
+            np.testing.assert_array_equal(tabulado.temperatura_burbuja(composicion, presion),
+                                          analitico.temperatura_burbuja(composicion, presion))